@@ -0,0 +1,80 @@
+# bench_boot.py
+# Benchmark: tempo até o primeiro menu e heap livre, com importação antecipada
+# de todas as etapas (main.py antigo) vs. registro por caminho (carga sob demanda)
+#
+# Na placa:  mpremote run bench/bench_boot.py
+#
+# Cada modo é medido a frio: os módulos importados por uma rodada são removidos
+# de sys.modules antes da seguinte, de modo que cada importação volta a
+# compilar/carregar o arquivo.
+
+import sys
+import gc
+from utime import ticks_ms, ticks_diff
+
+# As mesmas etapas registradas no main.py (incluindo as comentadas no menu,
+# que o main.py antigo importava mesmo assim)
+ETAPAS = (
+    ("stages.reaction_game.ReactionGame", "Reacao"),
+    ("stages.memory_game.MemoryGame", "Memoria"),
+    ("stages.rhythm_game.RhythmGame", None),
+    ("stages.tilt_game.TiltGame", "Inclinacao"),
+    ("stages.maze_game.MazeGame", None),
+    ("stages.balance_game.BalanceGame", None),
+    ("stages.gyro_game.GyroGame", "Giroscopio"),
+    ("stages.snake_game.SnakeGame", "Cobrinha"),
+    ("stages.sensor_test.SensorTest", None),
+)
+
+def heap_livre():
+    """Heap livre após coleta (None fora do MicroPython)"""
+    gc.collect()
+    return gc.mem_free() if hasattr(gc, 'mem_free') else None
+
+def boot(antecipado):
+    """
+    Reproduz o main.py até o primeiro menu aparecer no display
+    Retorna (tempo em ms, heap livre com o menu na tela)
+    """
+    inicio = ticks_ms()
+    from stages.stage_manager import StageManager
+    manager = StageManager()
+    for caminho, nome in ETAPAS:
+        if antecipado:
+            modulo, classe = caminho.rsplit(".", 1)
+            __import__(modulo)
+            etapa = getattr(sys.modules[modulo], classe)
+        else:
+            etapa = caminho
+        if nome:
+            manager.adicionar_etapa(etapa, nome)
+    manager.limpar_hardware()
+    manager.display.mostrar_mensagem(["BitdogLab Game", "Selecione:"])
+    duracao = ticks_diff(ticks_ms(), inicio)
+    return duracao, heap_livre()
+
+def medir(nome, antecipado):
+    """Roda um boot a frio e descarrega os módulos que ele importou"""
+    modulos = set(sys.modules)
+    heap_antes = heap_livre()
+    duracao, heap_menu = boot(antecipado)
+    for modulo in list(sys.modules):
+        if modulo not in modulos:
+            del sys.modules[modulo]
+    gc.collect()
+    if heap_antes is None:
+        print(f"{nome}: {duracao} ms ate o menu")
+    else:
+        print(f"{nome}: {duracao} ms ate o menu, heap livre {heap_menu} B "
+              f"({heap_antes - heap_menu} B usados)")
+    return duracao, heap_menu
+
+def main():
+    print("=== Boot ate o primeiro menu ===")
+    t_antes, heap_antes = medir("antecipado", True)
+    t_depois, heap_depois = medir("sob demanda", False)
+    print(f"Tempo: {t_antes - t_depois} ms a menos")
+    if heap_antes is not None:
+        print(f"Heap: {heap_depois - heap_antes} B a mais livres")
+
+main()
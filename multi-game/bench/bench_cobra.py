@@ -0,0 +1,265 @@
+# bench_cobra.py
+# Benchmark: lógica do jogo da cobrinha jogada por um agente, sem hardware
+#
+# Na placa:  mpremote run bench/bench_cobra.py
+# No host:   cd multi-game && PYTHONPATH=host:. python bench/bench_cobra.py
+#
+# A etapa SnakeGame roda com periféricos nulos, sem o laço da Stage: o
+# medidor chama o passo de lógica (_passo) direto, cada um com
+# PERIODO_LOGICA_MS de tempo de jogo, sem esperar o tempo passar. As
+# decisões vêm de um agente que busca a comida por busca em largura (ou, sem
+# caminho, a direção com mais espaço livre), jogado antes, fora da medição:
+# as rodadas cronometradas repetem as decisões gravadas, então medem só o
+# motor (colisão, comida, corpo) e o desenho. A semente é fixa, então cada
+# rodada joga exatamente as mesmas partidas. Mede passos da cobra por
+# segundo, com e sem desenho na matriz, a memória alocada por passo e, à
+# parte, o custo de uma decisão do agente.
+
+import gc
+import sys
+from array import array
+from utime import ticks_us, ticks_diff
+import urandom
+from cobra import DELTAS
+from stages.snake_game import SnakeGame
+
+SEMENTE = 1
+PASSOS_TEMPO = 3000      # Passos da cobra cronometrados em cada modo
+PASSOS_ALOCACAO = 300    # Passos medidos com o coletor desligado
+
+# Nomes de Joystick.ler_direcao na ordem das direções do cobra.py
+NOMES = ('dir', 'esq', 'cima', 'baixo')
+
+# === PERIFÉRICOS NULOS ===
+class DisplayNulo:
+    def mostrar_mensagem(self, mensagens, y_inicial=0, espacamento=10):
+        pass
+
+class MatrizNula:
+    def definir_led(self, x, y, cor):
+        pass
+
+    def limpar_buffer(self):
+        pass
+
+    def mostrar(self):
+        pass
+
+    def apagar(self):
+        pass
+
+class BuzzerNulo:
+    def tocar_som(self, frequencia, duracao_ms):
+        pass
+
+class BotoesNulos:
+    def foi_pressionado_b(self):
+        return False
+
+    def limpar_eventos(self):
+        pass
+
+class Contexto:
+    """Só o que a SnakeGame pede ao contexto de hardware: o joystick"""
+    def __init__(self, joystick):
+        self.joystick = joystick
+
+# === AGENTE ===
+class Agente:
+    """
+    Faz o papel do joystick: aponta para o primeiro passo do caminho mais
+    curto até a comida ou, sem caminho, para o vizinho com mais espaço livre
+    Os buffers da busca são alocados uma vez; a decisão é refeita só quando
+    a cabeça muda de célula, e cada uma é gravada (com o seu tempo) para a
+    rodada cronometrada repetir
+    """
+    def __init__(self):
+        self.jogo = None
+        self.cabeca = -1
+        self.decisao = None
+        self.decisoes = bytearray()  # Índices de NOMES, uma por célula da cabeça
+        self.tempo_us = 0            # Tempo total gasto em _decidir
+
+    def preparar(self, cobra):
+        self.fila = array('H', bytes(2 * cobra.celulas))
+        self.pai = array('H', bytes(2 * cobra.celulas))
+        self.visitada = bytearray(cobra.celulas)
+
+    def _livre(self, cobra, x, y):
+        """
+        Célula (x, y) dentro do tabuleiro e livre (a cauda sai no próximo
+        passo; com 2 células ela é o pescoço, e voltar sobre ele é ignorado)
+        """
+        if not (0 <= x < cobra.largura and 0 <= y < cobra.altura):
+            return -1
+        celula = y * cobra.largura + x
+        if cobra.ocupada(celula) and (celula != cobra.corpo[cobra.cauda] or cobra.tamanho < 3):
+            return -1
+        return celula
+
+    def _busca(self, cobra, origem, alvo):
+        """Busca em largura a partir de origem; retorna (encontrou alvo, células alcançadas)"""
+        visitada = self.visitada
+        for i in range(cobra.celulas):
+            visitada[i] = 0
+        visitada[origem] = 1
+        fila = self.fila
+        fila[0] = origem
+        inicio, fim = 0, 1
+        while inicio < fim:
+            celula = fila[inicio]
+            inicio += 1
+            if celula == alvo:
+                return True, fim
+            x, y = cobra.xy(celula)
+            for dx, dy in DELTAS:
+                vizinha = self._livre(cobra, x + dx, y + dy)
+                if vizinha >= 0 and not visitada[vizinha]:
+                    visitada[vizinha] = 1
+                    self.pai[vizinha] = celula
+                    fila[fim] = vizinha
+                    fim += 1
+        return False, fim
+
+    def _decidir(self, cobra):
+        cabeca = cobra.cabeca()
+        if cobra.comida >= 0:
+            encontrou, _ = self._busca(cobra, cabeca, cobra.comida)
+            if encontrou:
+                # Volta pelo caminho até o passo logo após a cabeça
+                celula = cobra.comida
+                while self.pai[celula] != cabeca:
+                    celula = self.pai[celula]
+                x, y = cobra.xy(celula)
+                hx, hy = cobra.xy(cabeca)
+                return DELTAS.index((x - hx, y - hy))
+        # Sem caminho: o vizinho livre com mais espaço alcançável
+        hx, hy = cobra.xy(cabeca)
+        melhor, melhor_espaco = cobra.direcao, -1
+        for direcao in range(4):
+            dx, dy = DELTAS[direcao]
+            vizinha = self._livre(cobra, hx + dx, hy + dy)
+            if vizinha >= 0:
+                _, espaco = self._busca(cobra, vizinha, -1)
+                if espaco > melhor_espaco:
+                    melhor, melhor_espaco = direcao, espaco
+        return melhor
+
+    def ler_direcao(self):
+        cobra = self.jogo.cobra
+        cabeca = cobra.cabeca()
+        if cabeca != self.cabeca:
+            self.cabeca = cabeca
+            inicio = ticks_us()
+            direcao = self._decidir(cobra)
+            self.tempo_us += ticks_diff(ticks_us(), inicio)
+            self.decisoes.append(direcao)
+            self.decisao = NOMES[direcao]
+        return self.decisao
+
+class Roteiro:
+    """
+    Joystick das rodadas cronometradas: repete as decisões gravadas pelo
+    Agente, avançando quando a cabeça muda de célula, como ele
+    """
+    def __init__(self, decisoes):
+        self.decisoes = decisoes
+        self.jogo = None
+        self.cabeca = -1
+        self.indice = -1
+
+    def ler_direcao(self):
+        cabeca = self.jogo.cobra.cabeca()
+        if cabeca != self.cabeca:
+            self.cabeca = cabeca
+            self.indice += 1
+        return NOMES[self.decisoes[self.indice]]
+
+# === MEDIÇÃO ===
+def criar_jogo(joystick):
+    urandom.seed(SEMENTE)
+    jogo = SnakeGame(DisplayNulo(), MatrizNula(), BuzzerNulo(), BotoesNulos(), Contexto(joystick))
+    joystick.jogo = jogo
+    return jogo
+
+def gravar_agente():
+    """Joga PASSOS_TEMPO passos com o agente, fora da medição; retorna o agente"""
+    agente = Agente()
+    jogo = criar_jogo(agente)
+    agente.preparar(jogo.cobra)
+    jogar(jogo, PASSOS_TEMPO, False)
+    return agente
+
+def jogar(jogo, passos, renderizar):
+    """
+    Roda passos de lógica no relógio virtual até a cobra andar 'passos'
+    vezes, recomeçando a partida a cada fim; retorna (passos de lógica, partidas)
+    """
+    dt = jogo.PERIODO_LOGICA_MS
+    quadros = max(1, jogo.PERIODO_MATRIZ_MS // dt)  # Passos de lógica por quadro da matriz
+    ticks = 0
+    partidas = 0
+    andados = 0
+    jogo.rodando = True
+    while andados < passos:
+        acumulado = jogo.acumulado
+        jogo._passo(dt)
+        ticks += 1
+        if jogo.acumulado != acumulado + dt:
+            andados += 1
+        if renderizar and ticks % quadros == 0:
+            jogo.render()
+        if not jogo.rodando:
+            partidas += 1
+            jogo.reset()
+            jogo.rodando = True
+    return ticks, partidas
+
+def medir(nome, renderizar, decisoes):
+    """Cronometra PASSOS_TEMPO passos da cobra e imprime a taxa"""
+    jogo = criar_jogo(Roteiro(decisoes))
+    gc.collect()
+    inicio = ticks_us()
+    ticks, partidas = jogar(jogo, PASSOS_TEMPO, renderizar)
+    duracao_us = ticks_diff(ticks_us(), inicio)
+    taxa = PASSOS_TEMPO * 1000000 // max(1, duracao_us)
+    print(f"{nome}: {taxa} passos/s ({duracao_us / PASSOS_TEMPO:.1f} us/passo, "
+          f"{ticks} ticks, {partidas} partidas)")
+    return taxa
+
+def alocacoes(decisoes):
+    """Memória alocada por passo da cobra (bytes no MicroPython, blocos líquidos no CPython)"""
+    jogo = criar_jogo(Roteiro(decisoes))
+    if hasattr(gc, 'mem_alloc'):
+        # Com o coletor desligado, mem_alloc só cresce: a diferença é tudo o que foi alocado
+        gc.collect()
+        gc.disable()
+        try:
+            antes = gc.mem_alloc()
+            jogar(jogo, PASSOS_ALOCACAO, True)
+            depois = gc.mem_alloc()
+        finally:
+            gc.enable()
+        por_passo = (depois - antes) / PASSOS_ALOCACAO
+        print(f"Alocacao: {por_passo:.1f} bytes/passo")
+    elif hasattr(sys, 'getallocatedblocks'):
+        gc.collect()
+        antes = sys.getallocatedblocks()
+        jogar(jogo, PASSOS_ALOCACAO, True)
+        gc.collect()
+        por_passo = (sys.getallocatedblocks() - antes) / PASSOS_ALOCACAO
+        print(f"Alocacao: {por_passo:.2f} blocos retidos/passo (CPython)")
+    else:
+        por_passo = None
+    return por_passo
+
+def main():
+    print("=== Cobrinha (decisoes gravadas do agente) ===")
+    agente = gravar_agente()
+    medir("sem matriz", False, agente.decisoes)
+    medir("com matriz", True, agente.decisoes)
+    alocacoes(agente.decisoes)
+    n = len(agente.decisoes)
+    print(f"Agente (fora das medidas): {agente.tempo_us / n:.1f} us/decisao, {n} decisoes")
+
+main()
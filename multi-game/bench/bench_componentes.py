@@ -0,0 +1,173 @@
+# bench_componentes.py
+# Benchmark: primitivas quentes dos componentes (matriz, OLED, sensor,
+# joystick, menu e buzzer), com saída estável para comparar versões
+#
+# Na placa:  mpremote run bench/bench_componentes.py
+# No host:   cd multi-game && PYTHONPATH=host:. python bench/bench_componentes.py
+#            cd multi-game && python host/simular.py bench/bench_componentes.py --raiz . --sem-painel
+#            (o simulador conecta o MPU-6050 emulado; sem ele a medição do sensor é pulada)
+#
+# Os periféricos são os do contexto compartilhado (components/hardware.py),
+# os mesmos usados pelo menu e pelas etapas. Cada medição roda REPETICOES
+# vezes e informa o menor tempo e a mediana por operação; no MicroPython,
+# também os bytes alocados por operação (coletor desligado durante a conta).
+#
+# Saída: linhas começando com '#' são comentários; o resto é CSV com
+# cabeçalho fixo, uma linha por medição, sempre na mesma ordem:
+#
+#   versao,plataforma,bench,iteracoes,us_min,us_mediana,bytes_op
+#   1.0.0,rp2-micropython-1.22.0,matriz_pixel,200,912.4,915.0,0
+#
+# Rode antes e depois de cada otimização e compare as linhas pelo nome.
+
+import gc
+import sys
+from utime import ticks_us, ticks_diff
+import config
+from components.hardware import contexto
+from components.mpu6050 import decodificar
+from utils import MenuNavegacao
+
+REPETICOES = 5
+
+def plataforma():
+    """Ex.: rp2-micropython-1.22.0 ou linux-cpython-3.11.4"""
+    impl = sys.implementation
+    versao = ".".join(str(v) for v in impl.version[:3])
+    return f"{sys.platform}-{impl.name}-{versao}"
+
+def _tempo_us(funcao, iteracoes):
+    inicio = ticks_us()
+    for _ in range(iteracoes):
+        funcao()
+    return ticks_diff(ticks_us(), inicio)
+
+def _bytes_por_op(funcao, iteracoes):
+    """Bytes alocados por chamada (None fora do MicroPython)"""
+    if not hasattr(gc, 'mem_alloc'):
+        return None
+    gc.collect()
+    gc.disable()
+    try:
+        antes = gc.mem_alloc()
+        for _ in range(iteracoes):
+            funcao()
+        depois = gc.mem_alloc()
+    finally:
+        gc.enable()
+    return (depois - antes) // iteracoes
+
+def medir(nome, funcao, iteracoes, prefixo):
+    """Mede funcao() e imprime a linha CSV"""
+    funcao()  # Aquecimento: importações e caches fora da medição
+    tempos = []
+    for _ in range(REPETICOES):
+        gc.collect()
+        tempos.append(_tempo_us(funcao, iteracoes) / iteracoes)
+    tempos.sort()
+    alocado = _bytes_por_op(funcao, iteracoes)
+    print(f"{prefixo},{nome},{iteracoes},{tempos[0]:.1f},{tempos[len(tempos) // 2]:.1f},"
+          f"{'' if alocado is None else alocado}")
+
+# === MEDIÇÕES ===
+def bench_matriz(hw, prefixo):
+    matriz = hw.matriz
+    estado = [0]
+
+    def pixel():
+        # Um LED e uma escrita da matriz inteira (o caminho de acender_led)
+        i = estado[0] = (estado[0] + 1) % 25
+        matriz.acender_led(i % 5, i // 5, 0, 20, 0)
+
+    def quadro():
+        # Os 25 LEDs no buffer e uma única escrita
+        matriz.limpar_buffer()
+        for y in range(5):
+            for x in range(5):
+                matriz.definir_led(x, y, config.COR_AZUL)
+        matriz.mostrar()
+
+    medir("matriz_pixel", pixel, 200, prefixo)
+    medir("matriz_quadro", quadro, 200, prefixo)
+    matriz.apagar()
+
+def bench_display(hw, prefixo):
+    display = hw.display
+    oled = display.oled
+    display.mostrar_mensagem(["Benchmark", "componentes"])
+
+    def show_completo():
+        oled.show()
+
+    linhas = ["Jogo de Inclinacao", "Tempo: 30s", "Objetivos: 3", "Pontuacao: 30"]
+
+    def mensagem():
+        display.mostrar_mensagem(linhas)
+
+    medir("display_show_completo", show_completo, 20, prefixo)
+    medir("display_mostrar_mensagem", mensagem, 20, prefixo)
+
+def bench_sensor(hw, prefixo):
+    amostra = bytes(14)
+    medir("mpu_decodificar", lambda: decodificar(amostra), 1000, prefixo)
+    if not hw.sensor_presente:
+        print("# mpu_ler_raw: sensor ausente")
+        return
+    mpu = hw.mpu
+    medir("mpu_ler_raw", mpu.ler_raw, 200, prefixo)
+
+def bench_joystick(hw, prefixo):
+    joystick = hw.joystick
+    if joystick is None:
+        print("# joystick_ler_direcao: joystick ausente")
+        return
+    medir("joystick_ler_direcao", joystick.ler_direcao, 1000, prefixo)
+
+def bench_menu(hw, prefixo):
+    opcoes = ["Reacao", "Memoria", "Inclinacao", "Giroscopio", "Cobrinha", "Sair"]
+    menu = MenuNavegacao(hw.display, hw.botoes, "Menu Principal", opcoes, hw.joystick)
+    # Um passo de navegação: move a seleção e redesenha a página do menu
+    medir("menu_redesenho", lambda: menu._mover(1), 20, prefixo)
+
+def bench_buzzer(hw, prefixo):
+    buzzer = hw.buzzer
+    fila_original = buzzer.fila
+
+    def enfileirar():
+        # tocar_som() com a tarefa de som ativa: só entra na fila
+        buzzer.fila = []
+        buzzer.tocar_som(880, 50)
+
+    def despachar():
+        # O trabalho da tarefa de som por item, sem a espera: tira da fila e
+        # liga (Buzzer.despachar), depois desliga
+        buzzer.fila = [(880, 50)]
+        buzzer.despachar()
+        buzzer.silenciar()
+
+    try:
+        medir("buzzer_enfileirar", enfileirar, 1000, prefixo)
+        medir("buzzer_despachar", despachar, 200, prefixo)
+    finally:
+        buzzer.fila = fila_original
+        buzzer.silenciar()
+
+def main():
+    hw = contexto()
+    # Cria todos os periféricos antes do CSV (a inicialização imprime mensagens)
+    for nome in ('display', 'matriz', 'buzzer', 'botoes', 'joystick', 'sensor_presente'):
+        getattr(hw, nome)
+    prefixo = f"{config.VERSAO_FIRMWARE},{plataforma()}"
+    print(f"# bench_componentes versao={config.VERSAO_FIRMWARE} plataforma={plataforma()} "
+          f"repeticoes={REPETICOES}")
+    print("versao,plataforma,bench,iteracoes,us_min,us_mediana,bytes_op")
+    medir("chamada_vazia", lambda: None, 1000, prefixo)  # Custo do laço de medição
+    bench_matriz(hw, prefixo)
+    bench_display(hw, prefixo)
+    bench_sensor(hw, prefixo)
+    bench_joystick(hw, prefixo)
+    bench_menu(hw, prefixo)
+    bench_buzzer(hw, prefixo)
+    hw.reset()
+
+main()
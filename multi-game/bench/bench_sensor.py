@@ -0,0 +1,102 @@
+# bench_sensor.py
+# Benchmark: decodificação do MPU-6050 em ponto flutuante vs. inteiros
+#
+# Na placa:  mpremote run bench/bench_sensor.py
+# No host:   cd multi-game && PYTHONPATH=host:. python bench/bench_sensor.py
+#
+# Compara o caminho antigo dos jogos (conversão para g/°/s em float, limiares
+# em g e math.sqrt no desvio) com o caminho em contagens brutas (struct.unpack,
+# limiares em contagens e desvio ao quadrado).
+
+import math
+import struct
+from utime import ticks_us, ticks_diff
+from components.mpu6050 import decodificar, g_para_contagens, dps_para_contagens
+
+ITERACOES = 2000
+
+# Amostra típica: leve inclinação, gravidade em Z e alguma rotação
+AMOSTRA = struct.pack('>7h', 5200, -1800, 15900, -2000, 300, -150, 2400)
+
+def _decodificar_float(data):
+    """Decodificação original dos jogos: um eixo por vez, convertido para float"""
+    accel_x = (data[0] << 8) | data[1]
+    accel_y = (data[2] << 8) | data[3]
+    accel_z = (data[4] << 8) | data[5]
+    gyro_x = (data[8] << 8) | data[9]
+    gyro_y = (data[10] << 8) | data[11]
+    gyro_z = (data[12] << 8) | data[13]
+    if accel_x > 32767:
+        accel_x -= 65536
+    if accel_y > 32767:
+        accel_y -= 65536
+    if accel_z > 32767:
+        accel_z -= 65536
+    if gyro_x > 32767:
+        gyro_x -= 65536
+    if gyro_y > 32767:
+        gyro_y -= 65536
+    if gyro_z > 32767:
+        gyro_z -= 65536
+    return {
+        'accel': {'x': accel_x / 16384.0, 'y': accel_y / 16384.0, 'z': accel_z / 16384.0},
+        'gyro': {'x': gyro_x / 131.0, 'y': gyro_y / 131.0, 'z': gyro_z / 131.0}
+    }
+
+def caminho_float(n):
+    """Decodifica, compara limiares em g e calcula o desvio com math.sqrt"""
+    ref_x, ref_y, ref_z = 0.0, 0.0, 1.0
+    movimentos = 0
+    for _ in range(n):
+        dados = _decodificar_float(AMOSTRA)
+        ax = dados['accel']['x']
+        ay = dados['accel']['y']
+        if ax > 0.3 or ax < -0.3 or ay > 0.3 or ay < -0.3:
+            movimentos += 1
+        if abs(dados['gyro']['z']) > 10:
+            movimentos += 1
+        dx = ax - ref_x
+        dy = ay - ref_y
+        dz = dados['accel']['z'] - ref_z
+        if math.sqrt(dx*dx + dy*dy + dz*dz) < 0.5:
+            movimentos += 1
+    return movimentos
+
+def caminho_inteiro(n):
+    """Decodifica em contagens, compara limiares em contagens e o desvio ao quadrado"""
+    ref_x, ref_y, ref_z = 0, 0, 16384
+    limiar = g_para_contagens(0.3)
+    limiar_giro = dps_para_contagens(10)
+    limiar_desvio_2 = (g_para_contagens(0.5) >> 2) ** 2
+    movimentos = 0
+    for _ in range(n):
+        ax, ay, az, _, _, _, gz = decodificar(AMOSTRA)
+        if ax > limiar or ax < -limiar or ay > limiar or ay < -limiar:
+            movimentos += 1
+        if abs(gz) > limiar_giro:
+            movimentos += 1
+        dx = (ax - ref_x) >> 2
+        dy = (ay - ref_y) >> 2
+        dz = (az - ref_z) >> 2
+        if dx*dx + dy*dy + dz*dz < limiar_desvio_2:
+            movimentos += 1
+    return movimentos
+
+def medir(nome, funcao, n=ITERACOES):
+    """Executa a função e imprime amostras por segundo"""
+    inicio = ticks_us()
+    funcao(n)
+    duracao_us = ticks_diff(ticks_us(), inicio)
+    taxa = n * 1000000 // max(1, duracao_us)
+    print(f"{nome}: {taxa} amostras/s ({duracao_us / n:.1f} us/amostra)")
+    return taxa
+
+def main():
+    print("=== Decodificacao do MPU-6050 ===")
+    # Os dois caminhos precisam tomar as mesmas decisões
+    assert caminho_float(1) == caminho_inteiro(1)
+    taxa_float = medir("float", caminho_float)
+    taxa_inteiro = medir("inteiro", caminho_inteiro)
+    print(f"Ganho: {taxa_inteiro / max(1, taxa_float):.2f}x")
+
+main()
\ No newline at end of file
@@ -5,6 +5,7 @@ import gc
 # Configura o garbage collector
 gc.enable()
 gc.collect()
+print("Heap livre no boot:", gc.mem_free(), "B")
 
 # Configura comunicação serial
 uart = machine.UART(0, baudrate=115200)
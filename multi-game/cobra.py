@@ -0,0 +1,143 @@
+# cobra.py
+# Motor do jogo da cobrinha: corpo em buffer circular e mapa de ocupação de
+# 1 bit por célula, com custo constante por passo
+#
+# A célula (x, y) tem índice y * largura + x. O corpo guarda os índices da
+# cauda à cabeça em um buffer circular (andar é escrever a nova cabeça e
+# avançar a cauda, sem deslocar a lista) e o mapa de ocupação responde em
+# O(1) se uma célula é corpo. A comida é sorteada uniformemente entre as
+# células livres: sorteia-se k e procura-se a k-ésima célula livre, contando
+# os bits de byte em byte; isso só roda quando a cobra come e sempre termina,
+# mesmo com o tabuleiro quase cheio.
+
+from array import array
+import urandom
+
+# Direções: índices de DELTAS; d ^ 1 é a direção oposta. O y cresce para
+# cima, como na MatrizLED (y = 0 é a linha de baixo)
+DIREITA, ESQUERDA, CIMA, BAIXO = range(4)
+DELTAS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+# Resultados de passo()
+ANDOU, COMEU, BATEU, VENCEU = range(4)
+
+# Bits ligados em cada valor de byte
+BITS_POR_BYTE = bytes(bin(i).count('1') for i in range(256))
+
+class Cobra:
+    def __init__(self, largura=5, altura=5):
+        """Tabuleiro largura x altura (pode ser maior que a matriz, ver janela())"""
+        self.largura = largura
+        self.altura = altura
+        self.celulas = largura * altura
+        self.corpo = array('H', bytes(2 * self.celulas))
+        self.ocupadas = bytearray((self.celulas + 7) // 8)
+        self.reiniciar()
+
+    # === MAPA DE OCUPAÇÃO ===
+    def ocupada(self, celula):
+        return (self.ocupadas[celula >> 3] >> (celula & 7)) & 1
+
+    def _marcar(self, celula):
+        self.ocupadas[celula >> 3] |= 1 << (celula & 7)
+
+    def _desmarcar(self, celula):
+        self.ocupadas[celula >> 3] &= ~(1 << (celula & 7)) & 0xFF
+
+    # === ESTADO ===
+    def reiniciar(self, x=0, y=None, tamanho=2, direcao=DIREITA):
+        """Cobra de 'tamanho' células terminando em (x + tamanho - 1, y), indo na direção dada"""
+        if y is None:
+            y = self.altura - 1
+        ocupadas = self.ocupadas
+        for i in range(len(ocupadas)):
+            ocupadas[i] = 0
+        # Os bits além da última célula contam como ocupados (nunca sorteados)
+        for celula in range(self.celulas, len(ocupadas) * 8):
+            self._marcar(celula)
+        self.cauda = 0
+        self.tamanho = 0
+        for i in range(tamanho):
+            celula = y * self.largura + x + i
+            self.corpo[i] = celula
+            self._marcar(celula)
+            self.tamanho += 1
+        self.direcao = direcao
+        self.livres = self.celulas - tamanho
+        self.comida = self.sortear_comida()
+
+    def cabeca(self):
+        """Índice da célula da cabeça"""
+        return self.corpo[(self.cauda + self.tamanho - 1) % self.celulas]
+
+    def xy(self, celula):
+        return celula % self.largura, celula // self.largura
+
+    def virar(self, direcao):
+        """Muda a direção, exceto para a oposta (a cobra voltaria sobre si mesma)"""
+        if direcao is not None and (direcao ^ 1 != self.direcao or self.tamanho == 1):
+            self.direcao = direcao
+
+    def sortear_comida(self):
+        """Célula livre sorteada uniformemente, ou -1 se o tabuleiro está cheio"""
+        if not self.livres:
+            return -1
+        k = urandom.randint(0, self.livres - 1)
+        ocupadas = self.ocupadas
+        i = 0
+        livres = 8 - BITS_POR_BYTE[ocupadas[0]]
+        while k >= livres:
+            k -= livres
+            i += 1
+            livres = 8 - BITS_POR_BYTE[ocupadas[i]]
+        # A k-ésima célula livre está neste byte
+        byte = ocupadas[i]
+        bit = 0
+        while True:
+            if not (byte >> bit) & 1:
+                if not k:
+                    return i * 8 + bit
+                k -= 1
+            bit += 1
+
+    # === PASSO ===
+    def passo(self):
+        """
+        Anda uma célula na direção atual
+        Retorna ANDOU, COMEU, BATEU (parede ou o próprio corpo) ou VENCEU (sem células livres)
+        """
+        dx, dy = DELTAS[self.direcao]
+        x, y = self.xy(self.cabeca())
+        x += dx
+        y += dy
+        if not (0 <= x < self.largura and 0 <= y < self.altura):
+            return BATEU
+        nova = y * self.largura + x
+
+        # A cauda sai da célula no mesmo passo, então a cabeça pode entrar
+        # onde ela estava (a comida está sempre em célula livre)
+        if self.ocupada(nova) and nova != self.corpo[self.cauda]:
+            return BATEU
+        comeu = nova == self.comida
+        if not comeu:
+            self._desmarcar(self.corpo[self.cauda])
+            self.cauda = (self.cauda + 1) % self.celulas
+            self.tamanho -= 1
+            self.livres += 1
+
+        self.corpo[(self.cauda + self.tamanho) % self.celulas] = nova
+        self._marcar(nova)
+        self.tamanho += 1
+        self.livres -= 1
+        if not comeu:
+            return ANDOU
+        self.comida = self.sortear_comida()
+        return VENCEU if self.comida < 0 else COMEU
+
+    # === JANELA DE VISUALIZAÇÃO ===
+    def janela(self, tamanho=5):
+        """Canto superior esquerdo da janela tamanho x tamanho centrada na cabeça"""
+        x, y = self.xy(self.cabeca())
+        ox = min(max(x - tamanho // 2, 0), max(self.largura - tamanho, 0))
+        oy = min(max(y - tamanho // 2, 0), max(self.altura - tamanho, 0))
+        return ox, oy
@@ -0,0 +1,122 @@
+# bias_termico.py
+# Modelo linear do bias do giroscópio em função da temperatura do MPU-6050
+#
+# O bias de cada eixo do giroscópio é modelado como
+#     bias(t) = offset + inclinacao * (t - t_ref)
+# com t na contagem bruta do registrador de temperatura (340 contagens/°C).
+# A inclinação é guardada em ponto fixo Q12 para que a compensação, feita a
+# cada leitura, use apenas inteiros pequenos (sem alocação no MicroPython).
+
+import json
+
+Q = 12                    # Bits fracionários da inclinação
+CONTAGENS_POR_C = 340     # Contagens do registrador de temperatura por °C
+LIMITE_DT = 340 * 60      # Satura |t - t_ref| (60 °C): produto cabe em small int
+FAIXA_MINIMA = 340        # Abaixo de 1 °C de variação, só o offset é ajustado
+VERSAO = 1
+
+class ModeloBiasTermico:
+    def __init__(self, t_ref=0, offset=(0, 0, 0), inclinacao_q=(0, 0, 0)):
+        """
+        t_ref: temperatura de referência (contagens brutas)
+        offset: bias de gx, gy, gz em t_ref (contagens do giroscópio)
+        inclinacao_q: variação do bias por contagem de temperatura, em Q12
+        """
+        self.t_ref = t_ref
+        self.ox, self.oy, self.oz = offset
+        self.kx, self.ky, self.kz = inclinacao_q
+
+    def compensar(self, raw):
+        """Remove o bias térmico dos eixos do giroscópio de uma amostra bruta"""
+        ax, ay, az, temp, gx, gy, gz = raw
+        dt = temp - self.t_ref
+        if dt > LIMITE_DT:
+            dt = LIMITE_DT
+        elif dt < -LIMITE_DT:
+            dt = -LIMITE_DT
+        return (ax, ay, az, temp,
+                gx - self.ox - ((self.kx * dt) >> Q),
+                gy - self.oy - ((self.ky * dt) >> Q),
+                gz - self.oz - ((self.kz * dt) >> Q))
+
+    def bias(self, temp):
+        """Bias previsto (gx, gy, gz) para uma temperatura em contagens brutas"""
+        _, _, _, _, gx, gy, gz = self.compensar((0, 0, 0, temp, 0, 0, 0))
+        return (-gx, -gy, -gz)
+
+    def salvar(self, caminho):
+        """Grava o modelo em JSON"""
+        with open(caminho, 'w') as arquivo:
+            json.dump({
+                'versao': VERSAO,
+                't_ref': self.t_ref,
+                'offset': [self.ox, self.oy, self.oz],
+                'inclinacao_q': [self.kx, self.ky, self.kz]
+            }, arquivo)
+
+def carregar(caminho):
+    """Lê um modelo salvo; retorna None se o arquivo não existir ou for inválido"""
+    try:
+        with open(caminho) as arquivo:
+            dados = json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+    if dados.get('versao') != VERSAO:
+        return None
+    return ModeloBiasTermico(dados['t_ref'], dados['offset'], dados['inclinacao_q'])
+
+class AjusteBiasTermico:
+    """
+    Ajuste por mínimos quadrados acumulado amostra a amostra, com somas inteiras
+    A temperatura é centrada na primeira amostra para manter as somas pequenas
+    """
+    def __init__(self):
+        self.n = 0
+        self.t0 = None
+        self.t_min = self.t_max = 0
+        self.soma_t = 0
+        self.soma_tt = 0
+        self.soma_g = [0, 0, 0]
+        self.soma_tg = [0, 0, 0]
+
+    def adicionar(self, raw):
+        """Acumula uma amostra bruta (dispositivo parado)"""
+        temp = raw[3]
+        if self.t0 is None:
+            self.t0 = self.t_min = self.t_max = temp
+        self.t_min = min(self.t_min, temp)
+        self.t_max = max(self.t_max, temp)
+        t = temp - self.t0
+        self.n += 1
+        self.soma_t += t
+        self.soma_tt += t * t
+        for i in range(3):
+            g = raw[4 + i]
+            self.soma_g[i] += g
+            self.soma_tg[i] += t * g
+
+    def faixa_c(self):
+        """Variação de temperatura observada, em °C"""
+        return (self.t_max - self.t_min) / CONTAGENS_POR_C
+
+    def ajustar(self):
+        """
+        Calcula o modelo com referência na temperatura média das amostras
+        Sem variação térmica suficiente, ajusta apenas o offset
+        """
+        if self.n == 0:
+            return None
+        n = self.n
+        t_medio = self.soma_t // n
+        denominador = n * self.soma_tt - self.soma_t * self.soma_t
+        offset = []
+        inclinacao = []
+        for i in range(3):
+            if self.t_max - self.t_min >= FAIXA_MINIMA and denominador > 0:
+                k = ((n * self.soma_tg[i] - self.soma_t * self.soma_g[i]) << Q) // denominador
+            else:
+                k = 0
+            # A reta passa pelo ponto médio: em t_ref, o bias é a média das leituras
+            offset.append((2 * self.soma_g[i] + n) // (2 * n))
+            inclinacao.append(k)
+        return ModeloBiasTermico(self.t0 + t_medio, offset, inclinacao)
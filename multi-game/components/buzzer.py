@@ -3,21 +3,95 @@
 
 from machine import Pin, PWM
 from utime import sleep
+import uasyncio as asyncio
 import config
 
+# Sons aguardando na fila da tarefa de som (os mais novos são descartados além disso)
+MAX_FILA = 32
+
 class Buzzer:
     def __init__(self, pin=config.BUZZER_PIN):
         """Inicializa o buzzer no pino especificado"""
         self.buzzer = PWM(Pin(pin))
         self.buzzer.duty_u16(0)  # Inicialmente sem som
+        self.fila = None  # Fila da tarefa de som (None = tocar bloqueando)
+        self.tocando = False  # A tarefa de som está tocando um item da fila
+    
+    def _ligar(self, frequencia):
+        """Liga o PWM na frequência dada (0 = silêncio)"""
+        if frequencia:
+            self.buzzer.freq(frequencia)
+            self.buzzer.duty_u16(32768)  # 50% do ciclo de trabalho
+        else:
+            self.buzzer.duty_u16(0)
+    
+    def ligar(self, frequencia):
+        """Liga o som sem bloquear; quem chamou o desliga com silenciar() na hora certa"""
+        self._ligar(frequencia)
+    
+    def silenciar(self):
+        """Desliga o som e descarta os sons enfileirados"""
+        self.buzzer.duty_u16(0)
+        if self.fila:
+            self.fila.clear()
     
     def tocar_som(self, frequencia, duracao_ms):
-        """Toca um som com frequência e duração específicas"""
-        self.buzzer.freq(frequencia)
-        self.buzzer.duty_u16(32768)  # 50% do ciclo de trabalho
+        """
+        Toca um som com frequência e duração específicas
+        Com a tarefa de som ativa, apenas enfileira e retorna imediatamente
+        """
+        if self.fila is not None:
+            if len(self.fila) < MAX_FILA:
+                self.fila.append((frequencia, duracao_ms))
+            return
+        self._ligar(frequencia)
         sleep(duracao_ms/1000)
         self.buzzer.duty_u16(0)  # Desliga o som
     
+    async def tocar_som_async(self, frequencia, duracao_ms):
+        """Toca um som sem bloquear as outras tarefas"""
+        self._ligar(frequencia)
+        await asyncio.sleep_ms(duracao_ms)
+        self.buzzer.duty_u16(0)  # Desliga o som
+    
+    def despachar(self):
+        """
+        Tira o próximo som da fila e o liga (o trabalho da tarefa de som por
+        item); retorna a duração em ms, ou None com a fila vazia
+        """
+        if not self.fila:
+            return None
+        frequencia, duracao_ms = self.fila.pop(0)
+        self.tocando = True
+        self._ligar(frequencia)
+        return duracao_ms
+    
+    def pausa(self, duracao_ms):
+        """Silêncio entre notas (enfileirado quando a tarefa de som está ativa)"""
+        self.tocar_som(0, duracao_ms)
+    
+    async def tarefa_som(self):
+        """Tarefa de som: toca em sequência os sons enfileirados por tocar_som()"""
+        self.fila = []
+        try:
+            while True:
+                duracao_ms = self.despachar()
+                if duracao_ms is None:
+                    await asyncio.sleep_ms(10)
+                else:
+                    await asyncio.sleep_ms(duracao_ms)
+                    self.buzzer.duty_u16(0)  # Desliga o som
+                    self.tocando = False
+        finally:
+            self.fila = None
+            self.tocando = False
+            self.buzzer.duty_u16(0)
+    
+    async def aguardar_fila(self):
+        """Aguarda a tarefa de som terminar de tocar tudo o que foi enfileirado"""
+        while self.fila or self.tocando:
+            await asyncio.sleep_ms(10)
+    
     def tocar_nota(self, nota, duracao_ms):
         """Toca uma nota musical pelo nome (ex: 'A4' para Lá)"""
         if nota in config.NOTAS:
@@ -29,17 +103,17 @@ class Buzzer:
     def tocar_fim_jogo(self):
         """Melodia simples de fim de jogo (3 notas)"""
         self.tocar_som(440, 150)  # Lá
-        sleep(0.05)
+        self.pausa(50)
         self.tocar_som(554, 150)  # Dó#
-        sleep(0.05)
+        self.pausa(50)
         self.tocar_som(659, 300)  # Mi
     
     def tocar_game_over(self):
         """Melodia triste de game over"""
         self.tocar_som(392, 200)  # Sol
-        sleep(0.05)
+        self.pausa(50)
         self.tocar_som(349, 200)  # Fá
-        sleep(0.05)
+        self.pausa(50)
         self.tocar_som(330, 400)  # Mi
     
     def bipe_reacao(self):
@@ -49,13 +123,10 @@ class Buzzer:
     def tocar_start(self):
         """Som de início do jogo"""
         for f in range(200, 600, 20):  # Sobe de 200 Hz até 600 Hz
-            self.buzzer.freq(f)
-            self.buzzer.duty_u16(30000)
-            sleep(0.01)
-        self.buzzer.duty_u16(0)
+            self.tocar_som(f, 10)
     
     def tocar_sequencia(self, sequencia):
         """Toca uma sequência de notas conforme lista de tuplas (nota, duração)"""
         for nota, duracao in sequencia:
             self.tocar_nota(nota, duracao)
-            sleep(0.05)  # Pequena pausa entre notas
\ No newline at end of file
+            self.pausa(50)  # Pequena pausa entre notas
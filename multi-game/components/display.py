@@ -13,6 +13,14 @@ class Display:
         self.i2c = SoftI2C(scl=Pin(scl_pin), sda=Pin(sda_pin))
         self.oled = ssd1306.SSD1306_I2C(width, height, self.i2c, addr=addr)
     
+    def desligar(self):
+        """Desliga o painel (economia de energia); o conteúdo é preservado"""
+        self.oled.poweroff()
+    
+    def ligar(self):
+        """Religa o painel após desligar()"""
+        self.oled.poweron()
+    
     def limpar(self):
         """Limpa o display"""
         self.oled.fill(0)
@@ -64,13 +72,22 @@ class Display:
         
         self.oled.show()
     
-    def exibir_tempos(self, resultados):
-        """Exibe os tempos de reação no OLED em forma de ranking"""
+    def exibir_tempos(self, resultados, ordenado=False, em_us=False):
+        """
+        Exibe os tempos de reação no OLED em forma de ranking
+        ordenado: os tempos já vêm do menor para o maior (evita reordenar)
+        em_us: tempos em microssegundos, exibidos em ms com uma casa decimal
+               (por padrão, em milissegundos, exibidos em segundos)
+        """
         self.limpar()
         self.texto("Ranking:", 0, 0, False)
-        sorted_times = sorted(resultados)  # Ordena os tempos do menor para o maior
+        sorted_times = resultados if ordenado else sorted(resultados)  # Do menor para o maior
         for i in range(min(10, len(sorted_times))):
-            self.texto(f"{i + 1}. {sorted_times[i]/1000:.2f} s", 0, (i + 1) * 10, False)
+            if em_us:
+                linha = f"{i + 1}. {sorted_times[i]/1000:.1f} ms"
+            else:
+                linha = f"{i + 1}. {sorted_times[i]/1000:.2f} s"
+            self.texto(linha, 0, (i + 1) * 10, False)
         self.oled.show()
     
     def exibir_game_over(self):
@@ -0,0 +1,73 @@
+# energia.py
+# Modo de economia de energia: dorme até o dispositivo ser movido
+
+from machine import Pin
+import machine
+from utime import sleep_ms
+import config
+
+class GerenciadorEnergia:
+    def __init__(self, display, matriz, buzzer, botoes, mpu=None,
+                 int_pin=config.MPU_INT_PIN):
+        """
+        Inicializa o gerenciador de energia
+        mpu: driver MPU6050 usado como fonte de wake-up (None = só botões)
+        int_pin: pino ligado ao INT do MPU-6050 (None = consulta o INT_STATUS por I2C)
+        """
+        self.display = display
+        self.matriz = matriz
+        self.buzzer = buzzer
+        self.botoes = botoes
+        self.mpu = mpu if mpu is not None and mpu.presente else None
+        self.int_pin = int_pin
+        self.acordar_flag = False
+
+    def _sinalizar(self, pin):
+        """Handler de interrupção: apenas marca que é hora de acordar"""
+        self.acordar_flag = True
+
+    def _esperar(self, intervalo_ms):
+        """Dorme o microcontrolador por um intervalo (lightsleep quando disponível)"""
+        try:
+            machine.lightsleep(intervalo_ms)
+        except (AttributeError, OSError, ValueError):
+            sleep_ms(intervalo_ms)
+
+    def dormir_ate_movimento(self):
+        """
+        Desliga display, matriz e buzzer, coloca o MPU-6050 em modo cíclico com
+        interrupção de movimento e dorme até o dispositivo ser movido (ou um
+        botão ser pressionado). Ao acordar, restaura sensor e display.
+        """
+        print("Entrando em modo de economia de energia")
+        self.matriz.apagar()
+        self.buzzer.buzzer.duty_u16(0)
+        self.display.desligar()
+
+        self.acordar_flag = False
+        pinos_irq = [self.botoes.button_a, self.botoes.button_b]
+        if self.mpu:
+            self.mpu.configurar_movimento(config.MOVIMENTO_LIMIAR_MG, config.MOVIMENTO_DURACAO_MS)
+            if self.int_pin is not None:
+                # INT do MPU-6050 é ativo em nível alto
+                pino_int = Pin(self.int_pin, Pin.IN)
+                pino_int.irq(handler=self._sinalizar, trigger=Pin.IRQ_RISING)
+                pinos_irq.append(pino_int)
+        for pino in pinos_irq[:2]:
+            pino.irq(handler=self._sinalizar, trigger=Pin.IRQ_FALLING)
+
+        try:
+            while not self.acordar_flag:
+                self._esperar(config.ENERGIA_INTERVALO_MS)
+                # Sem pino INT, o evento travado no MPU-6050 é lido pelo barramento
+                if self.mpu and self.int_pin is None and self.mpu.movimento_detectado():
+                    break
+                if self.botoes.esta_pressionado_a() or self.botoes.esta_pressionado_b():
+                    break
+        finally:
+            for pino in pinos_irq:
+                pino.irq(handler=None)
+            if self.mpu:
+                self.mpu.modo_normal()
+            self.display.ligar()
+            print("Movimento detectado: retomando")
\ No newline at end of file
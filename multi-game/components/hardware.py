@@ -0,0 +1,95 @@
+# hardware.py
+# Contexto de hardware compartilhado: cada periférico é criado uma única vez,
+# na primeira vez em que é usado, e reaproveitado pelo menu e pelas etapas
+
+class Hardware:
+    def __init__(self):
+        """Nenhum periférico é criado aqui; só no primeiro acesso"""
+        self._dispositivos = {}
+
+    def _obter(self, nome, criar, opcional=False):
+        """
+        Retorna o periférico nome, criando-o com criar() na primeira vez
+        Periféricos opcionais que falham ficam guardados como None, para que
+        a ausência não seja testada de novo a cada etapa
+        """
+        try:
+            return self._dispositivos[nome]
+        except KeyError:
+            pass
+        try:
+            dispositivo = criar()
+        except Exception as e:
+            if not opcional:
+                raise
+            print(f"Erro ao inicializar {nome}: {e}")
+            dispositivo = None
+        self._dispositivos[nome] = dispositivo
+        return dispositivo
+
+    @property
+    def display(self):
+        from components.display import Display
+        return self._obter('display', Display)
+
+    @property
+    def matriz(self):
+        from components.matriz_led import MatrizLED
+        return self._obter('matriz', MatrizLED)
+
+    @property
+    def buzzer(self):
+        from components.buzzer import Buzzer
+        return self._obter('buzzer', Buzzer)
+
+    @property
+    def botoes(self):
+        from utils import Botoes
+        return self._obter('botoes', Botoes)
+
+    @property
+    def joystick(self):
+        """Joystick, ou None se não puder ser inicializado"""
+        from utils import Joystick
+        return self._obter('joystick', Joystick, opcional=True)
+
+    @property
+    def i2c_sensor(self):
+        """Barramento I2C do MPU-6050"""
+        from components.mpu6050 import criar_i2c_sensor
+        return self._obter('i2c_sensor', criar_i2c_sensor, opcional=True)
+
+    @property
+    def mpu(self):
+        """Driver do MPU-6050 no barramento compartilhado (None sem barramento)"""
+        def criar():
+            from components.mpu6050 import MPU6050
+            i2c = self.i2c_sensor
+            return MPU6050(i2c) if i2c is not None else None
+        return self._obter('mpu', criar, opcional=True)
+
+    @property
+    def sensor_presente(self):
+        """Resultado (guardado) da detecção do MPU-6050 no barramento"""
+        mpu = self.mpu
+        return mpu is not None and mpu.presente
+
+    def reset(self):
+        """Leva os periféricos já criados ao estado inicial: tela, LEDs e som desligados"""
+        dispositivos = self._dispositivos
+        if dispositivos.get('display'):
+            dispositivos['display'].limpar()
+        if dispositivos.get('matriz'):
+            dispositivos['matriz'].apagar()
+        if dispositivos.get('buzzer'):
+            dispositivos['buzzer'].silenciar()
+
+# Contexto único do programa
+_contexto = None
+
+def contexto():
+    """Retorna o contexto de hardware do programa (criado no primeiro uso)"""
+    global _contexto
+    if _contexto is None:
+        _contexto = Hardware()
+    return _contexto
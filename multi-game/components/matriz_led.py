@@ -5,7 +5,11 @@ from machine import Pin
 import neopixel
 import config
 import urandom
-from utime import sleep
+from utime import sleep, ticks_us, ticks_add
+import uasyncio as asyncio
+
+# Tempo em nível baixo após o último bit para os WS2812 travarem os dados (us)
+LATCH_US = 50
 
 class MatrizLED:
     def __init__(self, pin=config.LED_PIN, num_leds=config.NUM_LEDS):
@@ -25,6 +29,29 @@ class MatrizLED:
         r, g, b = cor
         self.acender_led(x, y, r, g, b)
     
+    def acender_estimulo(self, x, y, cor):
+        """
+        Acende um LED e retorna o instante (ticks_us) em que a cor aparece:
+        o fim da escrita mais o tempo de trava dos WS2812
+        """
+        if 0 <= x <= 4 and 0 <= y <= 4:
+            self.np[self.matrix[4 - y][x]] = cor
+        self.np.write()
+        return ticks_add(ticks_us(), LATCH_US)
+    
+    def definir_led(self, x, y, cor):
+        """Muda a cor de um LED só no buffer (aparece no próximo mostrar())"""
+        if 0 <= x <= 4 and 0 <= y <= 4:
+            self.np[self.matrix[4 - y][x]] = cor
+    
+    def limpar_buffer(self):
+        """Apaga todos os LEDs só no buffer"""
+        self.np.fill(config.COR_APAGADO)
+    
+    def mostrar(self):
+        """Envia o buffer para a matriz (um quadro inteiro em uma escrita)"""
+        self.np.write()
+    
     def apagar(self):
         """Apaga todos os LEDs da matriz"""
         self.np.fill(config.COR_APAGADO)
@@ -51,25 +78,49 @@ class MatrizLED:
             self.apagar_led(x, y)
             sleep(duracao)
     
+    async def piscar_led_async(self, x, y, cor, vezes=3, duracao=0.2):
+        """Pisca um LED específico várias vezes sem bloquear as outras tarefas"""
+        duracao_ms = int(duracao * 1000)
+        for _ in range(vezes):
+            self.acender_led_cor(x, y, cor)
+            await asyncio.sleep_ms(duracao_ms)
+            self.apagar_led(x, y)
+            await asyncio.sleep_ms(duracao_ms)
+    
+    def _desenhar(self, padrao):
+        """Apaga a matriz e desenha um padrão (lista de tuplas (x, y, cor))"""
+        self.apagar()
+        for x, y, cor in padrao:
+            self.acender_led_cor(x, y, cor)
+    
     def mostrar_padrao(self, padrao, duracao=0.5):
         """
         Mostra um padrão na matriz. O padrão é uma lista de tuplas (x, y, cor)
         Exemplo: [(0, 0, COR_VERDE), (1, 1, COR_AZUL)]
         """
-        self.apagar()
-        for x, y, cor in padrao:
-            self.acender_led_cor(x, y, cor)
+        self._desenhar(padrao)
         sleep(duracao)
         self.apagar()
     
+    async def mostrar_padrao_async(self, padrao, duracao=0.5):
+        """Versão de mostrar_padrao() que não bloqueia as outras tarefas"""
+        self._desenhar(padrao)
+        await asyncio.sleep_ms(int(duracao * 1000))
+        self.apagar()
+    
     def mostrar_animacao(self, frames, duracao_frame=0.2):
         """
         Mostra uma animação na matriz. 
         frames é uma lista de padrões, cada um sendo uma lista de tuplas (x, y, cor)
         """
         for frame in frames:
-            self.apagar()
-            for x, y, cor in frame:
-                self.acender_led_cor(x, y, cor)
+            self._desenhar(frame)
             sleep(duracao_frame)
+        self.apagar()
+    
+    async def mostrar_animacao_async(self, frames, duracao_frame=0.2):
+        """Versão de mostrar_animacao() que não bloqueia as outras tarefas"""
+        for frame in frames:
+            self._desenhar(frame)
+            await asyncio.sleep_ms(int(duracao_frame * 1000))
         self.apagar()
\ No newline at end of file
@@ -0,0 +1,197 @@
+# mpu6050.py
+# Driver compartilhado do sensor MPU-6050 (acelerômetro + giroscópio)
+
+from machine import I2C, Pin, SoftI2C
+from utime import sleep
+import struct
+import config
+
+# === REGISTRADORES ===
+REG_ACCEL_CONFIG = 0x1C     # Faixa e filtro passa-altas do acelerômetro
+REG_MOT_THR = 0x1F          # Limiar de detecção de movimento (2 mg por LSB)
+REG_MOT_DUR = 0x20          # Duração mínima do movimento (1 ms por LSB)
+REG_INT_PIN_CFG = 0x37      # Configuração do pino INT
+REG_INT_ENABLE = 0x38       # Habilitação das interrupções
+REG_INT_STATUS = 0x3A       # Estado das interrupções (limpa na leitura)
+REG_DADOS = 0x3B            # Início do bloco ACCEL_XOUT_H .. GYRO_ZOUT_L (14 bytes)
+REG_MOT_DETECT_CTRL = 0x69  # Atraso de ligação e contagem da detecção de movimento
+REG_PWR_MGMT_1 = 0x6B       # Gerenciamento de energia
+REG_PWR_MGMT_2 = 0x6C       # Frequência de wake-up e standby por eixo
+REG_WHO_AM_I = 0x75         # Identificação do dispositivo
+
+# Bits de interrupção e de energia
+INT_MOT = 0x40              # INT_ENABLE / INT_STATUS: detecção de movimento
+PWR_CYCLE = 0x20            # PWR_MGMT_1: alterna entre sleep e uma amostra
+PWR_TEMP_DIS = 0x08         # PWR_MGMT_1: desliga o sensor de temperatura
+STBY_GYRO = 0x07            # PWR_MGMT_2: giroscópio (X, Y, Z) em standby
+HPF_5HZ = 0x01              # ACCEL_CONFIG: passa-altas de 5 Hz
+HPF_HOLD = 0x07             # ACCEL_CONFIG: congela a referência do passa-altas
+
+# Frequência de wake-up no modo cíclico (LP_WAKE_CTRL em PWR_MGMT_2)
+WAKE_1_25HZ, WAKE_5HZ, WAKE_20HZ, WAKE_40HZ = range(4)
+
+# Fatores de escala para as faixas padrão (±2g e ±250°/s)
+ESCALA_ACCEL = 16384.0
+ESCALA_GYRO = 131.0
+
+# Contagens por unidade, para comparar limiares sem ponto flutuante
+CONTAGENS_POR_G = 16384
+CONTAGENS_POR_DPS = 131
+
+# Índices dos eixos na tupla bruta retornada por ler_raw()
+AX, AY, AZ, TEMP, GX, GY, GZ = range(7)
+
+def g_para_contagens(g):
+    """Converte um limiar em g para contagens brutas do acelerômetro"""
+    return int(g * CONTAGENS_POR_G)
+
+def dps_para_contagens(dps):
+    """Converte um limiar em °/s para contagens brutas do giroscópio"""
+    return int(dps * CONTAGENS_POR_DPS)
+
+def criar_i2c_sensor(scl_pin=config.MPU_SCL_PIN, sda_pin=config.MPU_SDA_PIN):
+    """Cria o barramento I2C do sensor, com fallback para SoftI2C"""
+    try:
+        # Tenta inicializar o I2C em hardware
+        i2c = I2C(0, scl=Pin(scl_pin), sda=Pin(sda_pin), freq=400000)
+        print("I2C inicializado com ID 0")
+    except Exception as e:
+        print(f"Erro ao inicializar I2C: {e}")
+        # Fallback para SoftI2C
+        i2c = SoftI2C(scl=Pin(scl_pin), sda=Pin(sda_pin), freq=100000)
+        print("Usando SoftI2C")
+    return i2c
+
+def decodificar(data):
+    """
+    Decodifica o bloco de 14 bytes lido a partir de 0x3B
+    Retorna uma tupla com as contagens brutas (inteiros, sem ponto flutuante):
+    (accel_x, accel_y, accel_z, temp, gyro_x, gyro_y, gyro_z)
+    """
+    # Sete inteiros de 16 bits big-endian com sinal em uma única chamada
+    return struct.unpack('>7h', data)
+
+def converter(raw):
+    """Converte uma amostra bruta para unidades físicas (g, °C e °/s)"""
+    accel_x, accel_y, accel_z, temp, gyro_x, gyro_y, gyro_z = raw
+    return {
+        'accel': {
+            'x': accel_x / ESCALA_ACCEL,
+            'y': accel_y / ESCALA_ACCEL,
+            'z': accel_z / ESCALA_ACCEL
+        },
+        'gyro': {
+            'x': gyro_x / ESCALA_GYRO,
+            'y': gyro_y / ESCALA_GYRO,
+            'z': gyro_z / ESCALA_GYRO
+        },
+        'temp': temp / 340.0 + 36.53
+    }
+
+class MPU6050:
+    def __init__(self, i2c, addr=config.MPU_ADDR):
+        """Inicializa o driver e acorda o sensor se ele estiver no barramento"""
+        self.i2c = i2c
+        self.addr = addr
+        self.buffer = bytearray(14)  # Reutilizado a cada leitura
+        self.gravador = None         # GravadorTrace opcional (ver sensor_trace.py)
+        self.compensacao = None      # ModeloBiasTermico opcional (ver bias_termico.py)
+
+        # Verifica se o sensor está presente
+        self.presente = self.addr in self.i2c.scan()
+        if self.presente:
+            self.acordar()
+            if config.COMPENSAR_TEMPERATURA:
+                self.carregar_compensacao()
+
+    def acordar(self):
+        """Tira o MPU-6050 do modo sleep"""
+        self.i2c.writeto_mem(self.addr, REG_PWR_MGMT_1, b'\x00')
+        sleep(0.1)
+
+    def carregar_compensacao(self, caminho=config.BIAS_TERMICO_ARQUIVO):
+        """Carrega o modelo de bias térmico salvo pela calibração do SensorTest"""
+        from components.bias_termico import carregar
+        self.compensacao = carregar(caminho)
+        if self.compensacao:
+            print(f"Compensacao termica carregada de {caminho}")
+        return self.compensacao
+
+    def configurar_movimento(self, limiar_mg=40, duracao_ms=5, wake=WAKE_5HZ):
+        """
+        Configura a interrupção de movimento e coloca o acelerômetro em modo
+        cíclico de baixo consumo (giroscópio e temperatura desligados)
+        O evento fica travado em INT_STATUS e no pino INT até ser lido
+        """
+        self.i2c.writeto_mem(self.addr, REG_PWR_MGMT_1, b'\x00')
+        self.i2c.writeto_mem(self.addr, REG_ACCEL_CONFIG, bytes([HPF_5HZ]))
+        self.i2c.writeto_mem(self.addr, REG_INT_PIN_CFG, b'\x20')  # LATCH_INT_EN
+        self.i2c.writeto_mem(self.addr, REG_MOT_THR, bytes([max(1, min(255, limiar_mg // 2))]))
+        self.i2c.writeto_mem(self.addr, REG_MOT_DUR, bytes([max(1, min(255, duracao_ms))]))
+        self.i2c.writeto_mem(self.addr, REG_MOT_DETECT_CTRL, b'\x15')
+        self.i2c.writeto_mem(self.addr, REG_INT_ENABLE, bytes([INT_MOT]))
+        sleep(0.01)  # Deixa o passa-altas estabilizar antes de congelar a referência
+        self.i2c.writeto_mem(self.addr, REG_ACCEL_CONFIG, bytes([HPF_HOLD]))
+        self.i2c.writeto_mem(self.addr, REG_PWR_MGMT_2, bytes([(wake << 6) | STBY_GYRO]))
+        self.i2c.writeto_mem(self.addr, REG_PWR_MGMT_1, bytes([PWR_CYCLE | PWR_TEMP_DIS]))
+        self.movimento_detectado()  # Descarta eventos antigos
+
+    def movimento_detectado(self):
+        """Lê (e limpa) o INT_STATUS; retorna True se houve movimento"""
+        try:
+            return bool(self.i2c.readfrom_mem(self.addr, REG_INT_STATUS, 1)[0] & INT_MOT)
+        except Exception as e:
+            print(f"Erro ao ler MPU-6050: {e}")
+            return False
+
+    def modo_normal(self):
+        """Desfaz configurar_movimento: interrupções desligadas e medição contínua"""
+        self.i2c.writeto_mem(self.addr, REG_INT_ENABLE, b'\x00')
+        self.i2c.writeto_mem(self.addr, REG_INT_PIN_CFG, b'\x00')
+        self.i2c.writeto_mem(self.addr, REG_ACCEL_CONFIG, b'\x00')
+        self.i2c.writeto_mem(self.addr, REG_PWR_MGMT_2, b'\x00')
+        self.acordar()
+
+    def ler_raw(self):
+        """
+        Lê o bloco completo de dados em uma única transação I2C
+        Retorna a tupla de contagens brutas ou None em caso de erro
+        A temperatura vem no mesmo bloco e, se houver modelo carregado, o bias
+        térmico do giroscópio já sai descontado (o trace grava o valor compensado)
+        """
+        try:
+            self.i2c.readfrom_mem_into(self.addr, REG_DADOS, self.buffer)
+        except Exception as e:
+            print(f"Erro ao ler MPU-6050: {e}")
+            return None
+
+        raw = decodificar(self.buffer)
+        if self.compensacao:
+            raw = self.compensacao.compensar(raw)
+        if self.gravador:
+            self.gravador.registrar(raw)
+        return raw
+
+    def ler(self):
+        """
+        Lê os dados do acelerômetro e giroscópio em unidades físicas
+        Usa ponto flutuante: prefira ler_raw() nos laços de jogo
+        """
+        raw = self.ler_raw()
+        if raw is None:
+            return None
+        return converter(raw)
+
+    def gravar(self, caminho):
+        """Passa a gravar todas as leituras em um arquivo de trace binário"""
+        from components.sensor_trace import GravadorTrace
+        self.parar_gravacao()
+        self.gravador = GravadorTrace(caminho)
+        print(f"Gravando trace do sensor em {caminho}")
+
+    def parar_gravacao(self):
+        """Encerra a gravação, descarregando os buffers pendentes"""
+        if self.gravador:
+            self.gravador.fechar()
+            print(f"Trace gravado: {self.gravador.total} amostras")
+            self.gravador = None
\ No newline at end of file
@@ -0,0 +1,114 @@
+# partitura.py
+# Partituras do jogo de ritmo em formato binário compacto
+#
+# Formato do arquivo (".rtm"):
+#   cabeçalho (10 bytes): b'RITM', versão (u8), resolução (u8, ticks por batida),
+#                         BPM inicial (u16), número de eventos (u16)
+#   eventos (7 bytes), em ordem de tick: tick (u32), trilha (u8), valor (u16)
+#     trilha 0/1: nota na faixa A/B, valor = duração em ticks
+#     trilha TRILHA_ANDAMENTO: mudança de andamento, valor = novo BPM
+# Todos os campos em little-endian.
+#
+# Os ticks são convertidos em microssegundos desde o início da música a
+# partir do último ponto de mudança de andamento (não da nota anterior), de
+# modo que o arredondamento não se acumula ao longo da música. Os tempos
+# ficam abaixo de 2^29 us (~8 minutos), o limite de ticks_add().
+
+import struct
+import urandom
+
+MAGICO = b'RITM'
+VERSAO = 1
+FORMATO_CABECALHO = '<4sBBHH'
+FORMATO_EVENTO = '<IBH'
+TAMANHO_CABECALHO = struct.calcsize(FORMATO_CABECALHO)  # 10 bytes
+TAMANHO_EVENTO = struct.calcsize(FORMATO_EVENTO)        # 7 bytes
+
+TRILHA_ANDAMENTO = 0xFF
+
+def us_por_batida(bpm):
+    """Duração de uma batida em microssegundos (arredondada)"""
+    return (60000000 + bpm // 2) // bpm
+
+def compilar(eventos, bpm, resolucao=4):
+    """
+    Monta uma partitura a partir de uma lista de (tick, trilha, valor)
+    (ver o formato acima); retorna os bytes do arquivo
+    Mudanças de andamento vêm antes das notas do mesmo tick, que já tocam
+    no andamento novo
+    """
+    eventos = sorted(eventos, key=lambda e: (e[0], e[1] != TRILHA_ANDAMENTO, e[1]))
+    dados = bytearray(TAMANHO_CABECALHO + len(eventos) * TAMANHO_EVENTO)
+    struct.pack_into(FORMATO_CABECALHO, dados, 0, MAGICO, VERSAO, resolucao, bpm, len(eventos))
+    for i, evento in enumerate(eventos):
+        struct.pack_into(FORMATO_EVENTO, dados, TAMANHO_CABECALHO + i * TAMANHO_EVENTO, *evento)
+    return dados
+
+def gravar(caminho, eventos, bpm, resolucao=4):
+    """Compila e grava uma partitura em arquivo"""
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(compilar(eventos, bpm, resolucao))
+
+def aleatoria(notas=20, bpm=100, resolucao=4):
+    """Partitura aleatória: uma nota a cada meia batida ou batida, em uma das faixas"""
+    eventos = []
+    tick = 0
+    for _ in range(notas):
+        eventos.append((tick, urandom.randint(0, 1), resolucao // 2))
+        tick += resolucao * urandom.randint(1, 2) // 2
+    return Partitura(compilar(eventos, bpm, resolucao))
+
+def carregar(caminho):
+    """Lê uma partitura de arquivo (ValueError se o formato for inválido)"""
+    with open(caminho, 'rb') as arquivo:
+        return Partitura(arquivo.read())
+
+class Partitura:
+    def __init__(self, dados):
+        """dados: bytes no formato acima (mantidos como estão, sem decodificar os eventos)"""
+        if len(dados) < TAMANHO_CABECALHO:
+            raise ValueError("partitura truncada")
+        magico, versao, resolucao, bpm, n = struct.unpack_from(FORMATO_CABECALHO, dados)
+        if magico != MAGICO or versao != VERSAO or not resolucao or not bpm:
+            raise ValueError("partitura invalida")
+        if len(dados) < TAMANHO_CABECALHO + n * TAMANHO_EVENTO:
+            raise ValueError("partitura truncada")
+        self.dados = dados
+        self.resolucao = resolucao
+        self.bpm_inicial = bpm
+        self.eventos = n
+        self.notas = sum(1 for i in range(n) if self._evento(i)[1] != TRILHA_ANDAMENTO)
+        self.reiniciar()
+
+    def _evento(self, i):
+        return struct.unpack_from(FORMATO_EVENTO, self.dados, TAMANHO_CABECALHO + i * TAMANHO_EVENTO)
+
+    def reiniciar(self):
+        """Volta o cursor ao início da música"""
+        self.cursor = 0
+        self.bpm = self.bpm_inicial
+        self.us_batida = us_por_batida(self.bpm)
+        self.tick_base = 0   # Tick da última mudança de andamento
+        self.us_base = 0     # Instante (us) desse tick
+
+    def _us(self, tick):
+        """Instante (us desde o início) de um tick no andamento atual"""
+        batidas, resto = divmod(tick - self.tick_base, self.resolucao)
+        return self.us_base + batidas * self.us_batida + resto * self.us_batida // self.resolucao
+
+    def proxima(self):
+        """
+        Próxima nota como (instante_us, trilha, duracao_us), aplicando as
+        mudanças de andamento no caminho; None no fim da música
+        """
+        while self.cursor < self.eventos:
+            tick, trilha, valor = self._evento(self.cursor)
+            self.cursor += 1
+            if trilha == TRILHA_ANDAMENTO:
+                self.us_base = self._us(tick)
+                self.tick_base = tick
+                self.bpm = valor
+                self.us_batida = us_por_batida(valor)
+                continue
+            return self._us(tick), trilha, valor * self.us_batida // self.resolucao
+        return None
@@ -0,0 +1,288 @@
+# placar.py
+# Placar persistente: histórico binário só de acréscimo e índice top-N por etapa
+#
+# Histórico ("placar.bin", rotacionado para "placar.1.bin"):
+#   registros de 16 bytes: seq (u32), etapa (u16), pontuação (i32),
+#   tempo (u32, utime.time()), verificação (u16)
+# Índice de cada etapa ("placar_<etapa>.top"):
+#   cabeçalho (12 bytes): b'TOPN', versão (u8), entradas (u8), flags (u8),
+#   reservado (u8), seq seguinte (u32): os registros com seq menor já estão no índice
+#   entradas de 12 bytes, já ordenadas: pontuação (i32), seq (u32), tempo (u32)
+# Todos os campos em little-endian.
+#
+# O histórico só cresce até max_registros e então é rotacionado (o arquivo
+# antigo é substituído por inteiro), sem reescrever registros no lugar. O
+# índice é reescrito por completo em um arquivo temporário e renomeado sobre
+# o anterior: uma queda de energia deixa o índice antigo ou o novo, nunca um
+# misto. Um registro incompleto no fim do histórico é descartado ao abrir o
+# placar; um índice ausente ou inválido é reconstruído a partir do histórico,
+# e um índice atrasado (energia cortada entre o histórico e o índice, ou
+# pontuação que não entrou no top-N) recebe só os registros mais novos.
+
+import os
+import struct
+from utime import time
+
+VERSAO = 2
+MAGICO_INDICE = b'TOPN'
+FORMATO_REGISTRO = '<IHiIH'
+FORMATO_CABECALHO = '<4sBBBBI'
+FORMATO_ENTRADA = '<iII'
+TAMANHO_REGISTRO = struct.calcsize(FORMATO_REGISTRO)    # 16 bytes
+TAMANHO_CABECALHO = struct.calcsize(FORMATO_CABECALHO)  # 12 bytes
+TAMANHO_ENTRADA = struct.calcsize(FORMATO_ENTRADA)      # 12 bytes
+
+MENOR_MELHOR = 0x01  # Flag do índice: pontuações menores ficam à frente (ex.: tempo)
+
+def nome_arquivo(etapa):
+    """Forma do nome da etapa usada nos arquivos (minúsculas, sem espaços)"""
+    return etapa.lower().replace(" ", "_")
+
+def id_etapa(etapa):
+    """Identificador de 16 bits da etapa no histórico (FNV-1a dobrado)"""
+    h = 0x811C
+    for c in nome_arquivo(etapa).encode():
+        h = ((h ^ c) * 0x0193) & 0xFFFF
+    return h
+
+def _verificacao(seq, etapa, pontuacao, tempo):
+    """Soma de verificação de 16 bits dos campos de um registro"""
+    v = seq ^ (seq >> 16) ^ etapa ^ pontuacao ^ (pontuacao >> 16) ^ tempo ^ (tempo >> 16)
+    return (v ^ 0xA55A) & 0xFFFF
+
+def _existe(caminho):
+    try:
+        os.stat(caminho)
+        return True
+    except OSError:
+        return False
+
+def _gravar_atomico(caminho, dados):
+    """Grava dados em um temporário e o renomeia sobre o arquivo final"""
+    temporario = caminho + ".tmp"
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(dados)
+    try:
+        os.rename(temporario, caminho)
+    except OSError:
+        # Sistemas de arquivos em que rename não substitui (ex.: FAT)
+        os.remove(caminho)
+        os.rename(temporario, caminho)
+
+def ler_registros(caminho, inicio=0):
+    """
+    Gera (seq, etapa, pontuacao, tempo) dos registros válidos de um histórico,
+    a partir do registro de número inicio (posição no arquivo)
+    """
+    try:
+        arquivo = open(caminho, 'rb')
+    except OSError:
+        return
+    buffer = bytearray(TAMANHO_REGISTRO)
+    with arquivo:
+        if inicio:
+            arquivo.seek(inicio * TAMANHO_REGISTRO)
+        while arquivo.readinto(buffer) == TAMANHO_REGISTRO:
+            seq, etapa, pontuacao, tempo, verificacao = struct.unpack(FORMATO_REGISTRO, buffer)
+            if verificacao == _verificacao(seq, etapa, pontuacao, tempo):
+                yield seq, etapa, pontuacao, tempo
+
+class Placar:
+    def __init__(self, caminho="placar.bin", max_registros=256, top_n=5):
+        """
+        caminho: histórico ativo (o rotacionado é caminho com sufixo ".1.bin")
+        max_registros: registros por arquivo de histórico antes de rotacionar
+        top_n: entradas guardadas no índice de cada etapa
+        """
+        self.caminho = caminho
+        self.caminho_antigo = caminho.rsplit(".", 1)[0] + ".1.bin"
+        self.prefixo = caminho.rsplit(".", 1)[0] + "_"
+        self.max_registros = max_registros
+        self.top_n = top_n
+        self.registro = bytearray(TAMANHO_REGISTRO)  # Reutilizado a cada escrita
+        self.indices = {}  # etapa -> (flags, lista de entradas), carregados sob demanda
+        self.seq, self.registros = self._retomar()
+
+    # === HISTÓRICO ===
+    def _retomar(self):
+        """Próximo número de sequência e registros no histórico ativo"""
+        try:
+            tamanho = os.stat(self.caminho)[6]
+        except OSError:
+            tamanho = 0
+        if tamanho % TAMANHO_REGISTRO:
+            # Escrita interrompida: descarta só o registro incompleto do fim
+            tamanho -= tamanho % TAMANHO_REGISTRO
+            with open(self.caminho, 'rb') as arquivo:
+                dados = arquivo.read(tamanho)
+            _gravar_atomico(self.caminho, dados)
+        # Só o último registro é lido (o do arquivo antigo, se o ativo está vazio)
+        ultimo = self._ultimo_registro(self.caminho) or self._ultimo_registro(self.caminho_antigo)
+        return (ultimo[0] + 1 if ultimo else 0), tamanho // TAMANHO_REGISTRO
+
+    def _registros_desde(self, seq):
+        """Registros do histórico com número de sequência >= seq (lê só o fim dos arquivos)"""
+        faltam = self.seq - seq
+        if faltam <= 0:
+            return
+        if faltam > self.registros:
+            try:
+                antigos = os.stat(self.caminho_antigo)[6] // TAMANHO_REGISTRO
+            except OSError:
+                antigos = 0
+            inicio = max(0, antigos - (faltam - self.registros))
+            for registro in ler_registros(self.caminho_antigo, inicio):
+                yield registro
+            faltam = self.registros
+        for registro in ler_registros(self.caminho, self.registros - faltam):
+            yield registro
+
+    def _ultimo_registro(self, caminho):
+        """Último registro válido de um histórico, ou None"""
+        try:
+            tamanho = os.stat(caminho)[6]
+        except OSError:
+            return None
+        if tamanho < TAMANHO_REGISTRO:
+            return None
+        with open(caminho, 'rb') as arquivo:
+            arquivo.seek(tamanho - TAMANHO_REGISTRO)
+            arquivo.readinto(self.registro)
+        seq, etapa, pontuacao, tempo, verificacao = struct.unpack(FORMATO_REGISTRO, self.registro)
+        if verificacao == _verificacao(seq, etapa, pontuacao, tempo):
+            return seq, etapa, pontuacao, tempo
+        # Registro final danificado: percorre o arquivo atrás do último válido
+        ultimo = None
+        for registro in ler_registros(caminho):
+            ultimo = registro
+        return ultimo
+
+    def _rotacionar(self):
+        """Substitui o histórico antigo pelo ativo e começa um novo"""
+        if _existe(self.caminho_antigo):
+            os.remove(self.caminho_antigo)
+        if _existe(self.caminho):
+            os.rename(self.caminho, self.caminho_antigo)
+        self.registros = 0
+
+    def _acrescentar(self, etapa, pontuacao, tempo):
+        """Acrescenta um registro ao histórico (rotacionando se estiver cheio)"""
+        if self.registros >= self.max_registros:
+            self._rotacionar()
+        struct.pack_into(FORMATO_REGISTRO, self.registro, 0, self.seq, etapa, pontuacao, tempo,
+                         _verificacao(self.seq, etapa, pontuacao, tempo))
+        with open(self.caminho, 'ab') as arquivo:
+            arquivo.write(self.registro)
+        self.seq += 1
+        self.registros += 1
+
+    # === ÍNDICE TOP-N ===
+    def _caminho_indice(self, etapa):
+        return self.prefixo + nome_arquivo(etapa) + ".top"
+
+    def _ler_indice(self, etapa):
+        """Lê o índice de uma etapa: (flags, entradas, seq seguinte), ou None se ausente ou inválido"""
+        try:
+            with open(self._caminho_indice(etapa), 'rb') as arquivo:
+                dados = arquivo.read()
+        except OSError:
+            return None
+        if len(dados) < TAMANHO_CABECALHO:
+            return None
+        magico, versao, n, flags, _, coberto = struct.unpack_from(FORMATO_CABECALHO, dados)
+        if magico != MAGICO_INDICE or versao != VERSAO or len(dados) != TAMANHO_CABECALHO + n * TAMANHO_ENTRADA:
+            return None
+        entradas = [struct.unpack_from(FORMATO_ENTRADA, dados, TAMANHO_CABECALHO + i * TAMANHO_ENTRADA)
+                    for i in range(n)]
+        return flags, entradas, coberto
+
+    def _gravar_indice(self, etapa, flags, entradas):
+        """Grava o índice cobrindo todo o histórico atual (até self.seq)"""
+        dados = bytearray(TAMANHO_CABECALHO + len(entradas) * TAMANHO_ENTRADA)
+        struct.pack_into(FORMATO_CABECALHO, dados, 0, MAGICO_INDICE, VERSAO, len(entradas), flags, 0,
+                         self.seq)
+        for i, entrada in enumerate(entradas):
+            struct.pack_into(FORMATO_ENTRADA, dados, TAMANHO_CABECALHO + i * TAMANHO_ENTRADA, *entrada)
+        _gravar_atomico(self._caminho_indice(etapa), dados)
+
+    def _inserir(self, entradas, entrada, flags):
+        """
+        Insere uma entrada (pontuacao, seq, tempo) na lista ordenada, mantendo
+        no máximo top_n; retorna a posição (0 = melhor) ou None se não entrou
+        Em caso de empate, a pontuação mais antiga fica à frente
+        """
+        menor_melhor = flags & MENOR_MELHOR
+        pontuacao = entrada[0]
+        posicao = len(entradas)
+        for i, (outra, _, _) in enumerate(entradas):
+            if (pontuacao < outra) if menor_melhor else (pontuacao > outra):
+                posicao = i
+                break
+        if posicao >= self.top_n:
+            return None
+        entradas.insert(posicao, entrada)
+        del entradas[self.top_n:]
+        return posicao
+
+    def _indice(self, etapa, flags):
+        """Índice da etapa (carregado, ou reconstruído do histórico se inválido)"""
+        indice = self.indices.get(etapa)
+        if indice is None:
+            lido = self._ler_indice(etapa)
+            if lido is None or lido[0] != flags or lido[2] > self.seq:
+                # Ausente, inválido ou à frente do histórico (histórico perdido)
+                indice = (flags, self.reconstruir(etapa, flags))
+            else:
+                indice = (flags, lido[1])
+                if lido[2] < self.seq:
+                    self._atualizar(etapa, flags, lido[1], lido[2])
+            self.indices[etapa] = indice
+        return indice
+
+    def _atualizar(self, etapa, flags, entradas, coberto):
+        """Acrescenta ao índice os registros gravados depois dele e o regrava"""
+        ident = id_etapa(etapa)
+        for seq, id_registro, pontuacao, tempo in self._registros_desde(coberto):
+            if id_registro == ident:
+                self._inserir(entradas, (pontuacao, seq, tempo), flags)
+        self._gravar_indice(etapa, flags, entradas)
+
+    def reconstruir(self, etapa, flags=0):
+        """Refaz o índice de uma etapa percorrendo todo o histórico (caminho lento)"""
+        ident = id_etapa(etapa)
+        entradas = []
+        for caminho in (self.caminho_antigo, self.caminho):
+            for seq, id_registro, pontuacao, tempo in ler_registros(caminho):
+                if id_registro == ident:
+                    self._inserir(entradas, (pontuacao, seq, tempo), flags)
+        self._gravar_indice(etapa, flags, entradas)
+        return entradas
+
+    # === INTERFACE ===
+    def registrar(self, etapa, pontuacao, menor_melhor=False):
+        """
+        Grava uma pontuação no histórico e atualiza o índice da etapa
+        Retorna a posição no ranking (0 = recorde) ou None se ficou fora do top-N
+        """
+        flags = MENOR_MELHOR if menor_melhor else 0
+        pontuacao = int(pontuacao)
+        tempo = time()
+        # O índice é carregado (ou reconstruído) antes de o registro entrar no histórico
+        _, entradas = self._indice(etapa, flags)
+        # Histórico primeiro: se a energia cair antes do índice, o índice fica
+        # atrasado e _indice() acrescenta o registro ao carregá-lo
+        seq = self.seq
+        self._acrescentar(id_etapa(etapa), pontuacao, tempo)
+        posicao = self._inserir(entradas, (pontuacao, seq, tempo), flags)
+        if posicao is not None:
+            self._gravar_indice(etapa, flags, entradas)
+        return posicao
+
+    def melhores(self, etapa, menor_melhor=False):
+        """Lista [(pontuacao, seq, tempo), ...] do ranking da etapa, do melhor para o pior"""
+        return self._indice(etapa, MENOR_MELHOR if menor_melhor else 0)[1]
+
+    def recorde(self, etapa, menor_melhor=False):
+        """Melhor pontuação da etapa, ou None"""
+        entradas = self.melhores(etapa, menor_melhor)
+        return entradas[0][0] if entradas else None
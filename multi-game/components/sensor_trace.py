@@ -0,0 +1,260 @@
+# sensor_trace.py
+# Gravação e reprodução de traces binários do MPU-6050
+#
+# Formato do arquivo:
+#   cabeçalho (8 bytes): b'MPUT', versão (u8), tamanho do registro (u8), reservado (u16)
+#   registros (18 bytes): t_us (u32), accel x/y/z, temp, gyro x/y/z (7 x i16, contagens brutas)
+# Todos os campos em little-endian. O tempo é relativo ao início da gravação.
+
+import struct
+
+try:
+    from utime import ticks_us, ticks_diff
+except ImportError:
+    # Execução no host (CPython)
+    from time import perf_counter_ns
+
+    def ticks_us():
+        return perf_counter_ns() // 1000
+
+    def ticks_diff(fim, inicio):
+        return fim - inicio
+
+MAGICO = b'MPUT'
+VERSAO = 1
+FORMATO_CABECALHO = '<4sBBH'
+FORMATO_REGISTRO = '<I7h'
+TAMANHO_CABECALHO = struct.calcsize(FORMATO_CABECALHO)  # 8 bytes
+TAMANHO_REGISTRO = struct.calcsize(FORMATO_REGISTRO)    # 18 bytes
+
+class GravadorTrace:
+    """
+    Grava amostras brutas em registros de tamanho fixo com buffer duplo.
+    Enquanto um buffer é preenchido, o outro (já cheio) é escrito no flash
+    em blocos pequenos a cada nova amostra, para não travar o laço do jogo.
+    """
+    def __init__(self, caminho, registros_por_buffer=32, bloco=64):
+        self.arquivo = open(caminho, 'wb')
+        self.arquivo.write(struct.pack(FORMATO_CABECALHO, MAGICO, VERSAO, TAMANHO_REGISTRO, 0))
+
+        self.registros_por_buffer = registros_por_buffer
+        self.bloco = bloco  # Bytes escritos no flash por amostra registrada
+        self.buffers = [
+            bytearray(registros_por_buffer * TAMANHO_REGISTRO),
+            bytearray(registros_por_buffer * TAMANHO_REGISTRO)
+        ]
+        self.ativo = 0         # Índice do buffer sendo preenchido
+        self.posicao = 0       # Registros no buffer ativo
+        self.pendente = None   # memoryview do buffer cheio aguardando escrita
+        self.escrito = 0       # Bytes do buffer pendente já escritos
+
+        self.total = 0         # Amostras gravadas
+        self.bloqueios = 0     # Vezes em que foi preciso escrever um buffer inteiro de uma vez
+
+        # Tempo acumulado em microssegundos (imune ao wrap-around de ticks_us)
+        self.t_ultimo = ticks_us()
+        self.t_acumulado = 0
+
+    def registrar(self, raw):
+        """Registra uma amostra bruta (tupla de 7 contagens) com timestamp"""
+        agora = ticks_us()
+        self.t_acumulado += ticks_diff(agora, self.t_ultimo)
+        self.t_ultimo = agora
+
+        # Avança a escrita do buffer anterior, um bloco por vez
+        if self.pendente is not None:
+            self._escrever_bloco()
+
+        struct.pack_into(FORMATO_REGISTRO, self.buffers[self.ativo],
+                         self.posicao * TAMANHO_REGISTRO,
+                         self.t_acumulado & 0xFFFFFFFF, *raw)
+        self.posicao += 1
+        self.total += 1
+
+        if self.posicao == self.registros_por_buffer:
+            # O buffer anterior ainda não terminou de ser escrito: termina agora
+            if self.pendente is not None:
+                self.bloqueios += 1
+                self._escrever_pendente()
+            self.pendente = memoryview(self.buffers[self.ativo])
+            self.escrito = 0
+            self.ativo ^= 1
+            self.posicao = 0
+
+    def _escrever_bloco(self):
+        """Escreve o próximo bloco do buffer pendente"""
+        fim = min(self.escrito + self.bloco, len(self.pendente))
+        self.arquivo.write(self.pendente[self.escrito:fim])
+        self.escrito = fim
+        if fim == len(self.pendente):
+            self.pendente = None
+
+    def _escrever_pendente(self):
+        """Escreve de uma vez o restante do buffer pendente"""
+        self.arquivo.write(self.pendente[self.escrito:])
+        self.pendente = None
+
+    def fechar(self):
+        """Descarrega os buffers e fecha o arquivo"""
+        if self.arquivo is None:
+            return
+        if self.pendente is not None:
+            self._escrever_pendente()
+        if self.posicao:
+            self.arquivo.write(memoryview(self.buffers[self.ativo])[:self.posicao * TAMANHO_REGISTRO])
+            self.posicao = 0
+        self.arquivo.close()
+        self.arquivo = None
+
+class ReprodutorTrace:
+    """
+    Reproduz um trace gravado pela mesma interface do driver MPU6050
+    (ler_raw / ler), permitindo rodar os jogos sem o sensor físico.
+
+    tempo_real=False: cada leitura devolve a próxima amostra do arquivo
+    tempo_real=True: devolve a amostra correspondente ao tempo decorrido
+    repetir=True: volta ao início do trace ao chegar no fim
+    """
+    def __init__(self, caminho, tempo_real=False, repetir=False, registros_por_leitura=32):
+        self.arquivo = open(caminho, 'rb')
+        magico, versao, tamanho, _ = struct.unpack(FORMATO_CABECALHO,
+                                                   self.arquivo.read(TAMANHO_CABECALHO))
+        if magico != MAGICO or versao != VERSAO or tamanho != TAMANHO_REGISTRO:
+            self.arquivo.close()
+            raise ValueError(f"Trace invalido: {caminho}")
+
+        self.tempo_real = tempo_real
+        self.repetir = repetir
+        self.presente = True   # Compatível com MPU6050.presente
+        self.gravador = None   # Compatível com MPU6050.gravador
+
+        self.buffer = bytearray(registros_por_leitura * TAMANHO_REGISTRO)
+        self._reiniciar()
+
+    def _reiniciar(self):
+        """Volta ao primeiro registro do trace"""
+        self.arquivo.seek(TAMANHO_CABECALHO)
+        self.disponiveis = 0   # Registros válidos no buffer
+        self.indice = 0        # Próximo registro a consumir do buffer
+        self.t_base = 0        # Correção do wrap-around do campo de 32 bits
+        self.t_anterior = 0
+        self.atual = None      # Última amostra entregue
+        self.seguinte = None   # Amostra lida antecipadamente (modo tempo real)
+        self.t_ultimo = ticks_us()
+        self.decorrido = 0     # Tempo de reprodução acumulado em microssegundos
+
+    def _proximo(self):
+        """Retorna (t_us, raw) do próximo registro ou None no fim do arquivo"""
+        if self.indice == self.disponiveis:
+            lidos = self.arquivo.readinto(self.buffer) or 0
+            self.disponiveis = lidos // TAMANHO_REGISTRO
+            self.indice = 0
+            if self.disponiveis == 0:
+                return None
+
+        campos = struct.unpack_from(FORMATO_REGISTRO, self.buffer, self.indice * TAMANHO_REGISTRO)
+        self.indice += 1
+
+        t = campos[0]
+        if t < self.t_anterior:
+            self.t_base += 0x100000000
+        self.t_anterior = t
+        return self.t_base + t, campos[1:]
+
+    def _proximo_ou_repetir(self):
+        amostra = self._proximo()
+        if amostra is None and self.repetir:
+            self._reiniciar()
+            amostra = self._proximo()
+        return amostra
+
+    def ler_raw(self):
+        """
+        Retorna a próxima tupla de contagens brutas ou None no fim do trace
+        (no modo tempo real, a última amostra é mantida após o fim)
+        """
+        if not self.tempo_real:
+            amostra = self._proximo_ou_repetir()
+            return amostra[1] if amostra else None
+
+        agora = ticks_us()
+        self.decorrido += ticks_diff(agora, self.t_ultimo)
+        self.t_ultimo = agora
+        if self.seguinte is None:
+            self.seguinte = self._proximo_ou_repetir()
+        # Descarta as amostras cujo instante já passou, ficando com a mais recente
+        while self.seguinte is not None and (self.atual is None or self.seguinte[0] <= self.decorrido):
+            self.atual = self.seguinte
+            self.seguinte = self._proximo()
+            if self.seguinte is None and self.repetir:
+                raw = self.atual[1]
+                self._reiniciar()
+                return raw
+        if self.atual is None:
+            return None
+        return self.atual[1]
+
+    def ler(self):
+        """Lê a próxima amostra em unidades físicas (mesma interface do MPU6050)"""
+        from components.mpu6050 import converter
+        raw = self.ler_raw()
+        if raw is None:
+            return None
+        return converter(raw)
+
+    def amostras(self):
+        """Itera sobre todas as amostras (t_us, raw) a partir do início"""
+        self._reiniciar()
+        while True:
+            amostra = self._proximo()
+            if amostra is None:
+                return
+            yield amostra
+
+    def parar_gravacao(self):
+        """Compatível com MPU6050.parar_gravacao (nada a fazer)"""
+        pass
+
+    def fechar(self):
+        """Fecha o arquivo do trace"""
+        self.arquivo.close()
+
+def resumir(caminho):
+    """Imprime um resumo do trace: duração, taxa e faixa de cada eixo"""
+    reprodutor = ReprodutorTrace(caminho)
+    nomes = ('ax', 'ay', 'az', 'temp', 'gx', 'gy', 'gz')
+    minimos = [32767] * 7
+    maximos = [-32768] * 7
+    somas = [0] * 7
+    total = 0
+    t_final = 0
+    for t, raw in reprodutor.amostras():
+        for i in range(7):
+            v = raw[i]
+            somas[i] += v
+            if v < minimos[i]:
+                minimos[i] = v
+            if v > maximos[i]:
+                maximos[i] = v
+        total += 1
+        t_final = t
+    reprodutor.fechar()
+
+    print(f"Trace: {caminho}")
+    print(f"Amostras: {total}")
+    if total == 0:
+        return
+    duracao_s = t_final / 1000000
+    print(f"Duracao: {duracao_s:.2f} s")
+    if duracao_s > 0:
+        print(f"Taxa media: {total / duracao_s:.1f} Hz")
+    for i, nome in enumerate(nomes):
+        print(f"  {nome}: min={minimos[i]} max={maximos[i]} media={somas[i] // total}")
+
+# Executa o resumo quando este arquivo é executado diretamente (placa ou host)
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2:
+        print("Uso: sensor_trace.py <arquivo.bin>")
+    else:
+        resumir(sys.argv[1])
\ No newline at end of file
@@ -3,6 +3,10 @@
 
 from machine import Pin, SoftI2C, PWM
 
+# === VERSÃO ===
+# Versão do firmware, impressa pelos benchmarks junto dos resultados
+VERSAO_FIRMWARE = "1.0.0"
+
 # === CONFIGURAÇÃO DE PINOS ===
 # Matriz de LEDs
 LED_PIN = 7
@@ -26,6 +30,12 @@ OLED_ADDR = 0x3C
 OLED_WIDTH = 128
 OLED_HEIGHT = 64
 
+# Sensor MPU-6050 (I2C secundário)
+MPU_SCL_PIN = 1
+MPU_SDA_PIN = 0
+MPU_ADDR = 0x68
+MPU_INT_PIN = None  # Pino ligado ao INT do sensor (None = consulta por I2C)
+
 # === CONFIGURAÇÃO DA MATRIZ DE LEDs ===
 NUM_LEDS = 25  # Matriz 5x5
 
@@ -53,6 +63,77 @@ COR_APAGADO = (0, 0, 0)
 # Tempo máximo de exibição de um LED (em milissegundos)
 LED_MAX_TIME = 1000
 
+# === FÍSICA DOS JOGOS DE INCLINAÇÃO ===
+# Reparte o brilho da bola entre LEDs vizinhos quando ela está entre duas
+# células (False = acende só a célula ocupada)
+FISICA_SUAVIZAR = True
+
+# === JOGO DA COBRINHA ===
+# Tabuleiro em células; maior que 5x5, a matriz mostra uma janela em volta da cabeça
+COBRA_LARGURA = 5
+COBRA_ALTURA = 5
+
+# === JOGO DE RITMO ===
+# Partitura tocada pelo jogo (formato em components/partitura.py); sem o
+# arquivo, uma sequência aleatória é usada
+RITMO_PARTITURA = "musicas/demo.rtm"
+
+# === JOGO DE LABIRINTO ===
+# Tamanho máximo (em células) dos labirintos gerados; o nível 1 tem 2x2 e
+# cada nível soma uma célula até esse limite
+LABIRINTO_MAX_CELULAS = 15
+
+# === PLACAR ===
+# Histórico de pontuações no flash (None = só na RAM, perdido ao reiniciar)
+PLACAR_ARQUIVO = "placar.bin"
+# Registros por arquivo de histórico antes de rotacionar (16 bytes cada)
+PLACAR_MAX_REGISTROS = 256
+# Posições guardadas no ranking de cada etapa
+PLACAR_TOP_N = 5
+
+# === CACHE DE ETAPAS ===
+# Etapas mantidas na memória entre partidas (reiniciadas com reset())
+CACHE_ETAPAS = 2
+# Heap livre mínimo (bytes) após uma partida; abaixo disso as etapas menos
+# usadas recentemente são descartadas
+CACHE_HEAP_MINIMO = 40 * 1024
+
+# === MEMÓRIA ===
+# Mede o heap de cada etapa (base, pico, retido, fragmentação, pausas do GC)
+# e avisa quando ela passa do seu ORCAMENTO_MEMORIA
+MEMORIA_TELEMETRIA = True
+# Intervalo de amostragem do heap durante a partida (ms)
+MEMORIA_PERIODO_MS = 1000
+
+# === ECONOMIA DE ENERGIA ===
+# Tempo sem uso no menu até dormir, em segundos (0 = nunca dorme)
+INATIVIDADE_MENU_S = 120
+# Movimento que acorda a placa: limiar (mg) e duração mínima (ms)
+MOVIMENTO_LIMIAR_MG = 40
+MOVIMENTO_DURACAO_MS = 5
+# Intervalo de cada lightsleep enquanto aguarda o movimento (ms)
+ENERGIA_INTERVALO_MS = 250
+
+# === COMPENSAÇÃO TÉRMICA DO SENSOR ===
+# Desconta o bias do giroscópio conforme a temperatura (modelo do SensorTest)
+COMPENSAR_TEMPERATURA = True
+BIAS_TERMICO_ARQUIVO = "bias_termico.json"
+# Duração máxima da calibração térmica, em segundos (B encerra antes)
+BIAS_TERMICO_DURACAO_S = 600
+
+# === PERFIL DE DESEMPENHO ===
+# Etapas medidas pelo profiler (nomes do menu, ex.: ("Inclinacao",)), ou True
+# para todas. Vazio = desligado, sem custo.
+PERFIL_ETAPAS = ()
+# Além da serial, grava o relatório em "perfil_<etapa>.txt"
+PERFIL_SALVAR = False
+
+# === TRACE DO SENSOR ===
+# Grava as leituras do MPU-6050 de cada jogo em "trace_<jogo>.bin"
+GRAVAR_TRACE_SENSOR = False
+# Caminho de um trace para reproduzir no lugar do sensor real (None = sensor real)
+REPRODUZIR_TRACE_SENSOR = None
+
 # === CONFIGURAÇÕES DE ÁUDIO ===
 # Frequências para notas musicais básicas
 NOTAS = {
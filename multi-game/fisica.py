@@ -0,0 +1,130 @@
+# fisica.py
+# Física de ponto fixo para os jogos de inclinação: a aceleração medida vira
+# velocidade e posição em frações de célula a cada passo (100-200 Hz), com
+# atrito, colisão contra paredes e quique
+#
+# Posição e velocidade são inteiros em 1/UNIDADE de célula (e por segundo),
+# sem floats no laço. A célula (cx, cy) vai de cx*UNIDADE a (cx+1)*UNIDADE-1;
+# o centro fica em cx*UNIDADE + METADE. O mundo é qualquer objeto com
+# parede(x, y) (ex.: labirinto.Labirinto ou Caixa).
+
+from components.mpu6050 import CONTAGENS_POR_G
+
+BITS = 12
+UNIDADE = 1 << BITS   # 4096 subdivisões por célula
+METADE = UNIDADE >> 1
+MASCARA = UNIDADE - 1
+
+# Aceleração a 1 g de inclinação (células/s²)
+ACELERACAO_G = 30
+# Perda de velocidade por segundo (1/s): v -= v * ATRITO * dt
+ATRITO = 3
+# Velocidade conservada em uma colisão (%)
+QUIQUE = 40
+# Velocidade máxima (células/s); abaixo de 1 célula por passo para passos até 50 ms
+VELOCIDADE_MAXIMA = 15
+# Inclinação ignorada (ruído do sensor, mesa quase plana), em contagens brutas
+ZONA_MORTA = CONTAGENS_POR_G // 20
+
+class Caixa:
+    """Mundo sem paredes internas: só as bordas de uma área largura x altura"""
+    def __init__(self, largura=5, altura=5):
+        self.largura = largura
+        self.altura = altura
+
+    def parede(self, x, y):
+        return not (0 <= x < self.largura and 0 <= y < self.altura)
+
+class Corpo:
+    def __init__(self, mundo, aceleracao_g=ACELERACAO_G, atrito=ATRITO, quique=QUIQUE):
+        self.mundo = mundo
+        # Aceleração a 1 g em unidades/s² (ver _velocidade)
+        self.ganho = aceleracao_g * UNIDADE
+        self.atrito = atrito
+        self.quique = quique
+        self.limite = VELOCIDADE_MAXIMA * UNIDADE
+        self.posicionar(0, 0)
+
+    def posicionar(self, cx, cy):
+        """Coloca o corpo parado no centro da célula (cx, cy)"""
+        self.x = (cx << BITS) + METADE
+        self.y = (cy << BITS) + METADE
+        self.vx = 0
+        self.vy = 0
+
+    def celula(self):
+        """Célula ocupada (quantização da posição na grade)"""
+        return self.x >> BITS, self.y >> BITS
+
+    def passo(self, ax, ay, dt):
+        """
+        Integra dt ms com a aceleração (ax, ay) em contagens brutas, já nos
+        eixos da matriz (x para a direita, y para baixo)
+        Retorna True se o corpo bateu em uma parede neste passo (com
+        velocidade de pelo menos 1 célula/s; encostado, não conta)
+        """
+        if -ZONA_MORTA < ax < ZONA_MORTA:
+            ax = 0
+        if -ZONA_MORTA < ay < ZONA_MORTA:
+            ay = 0
+        self.vx = self._velocidade(self.vx, ax, dt)
+        self.vy = self._velocidade(self.vy, ay, dt)
+
+        # Eixos separados: uma colisão em x não impede o movimento em y (desliza na parede)
+        colidiu = False
+        x = self.x + self.vx * dt // 1000
+        if (x >> BITS) != (self.x >> BITS) and self.mundo.parede(x >> BITS, self.y >> BITS):
+            x = self._encostar(self.x, self.vx)
+            colidiu = not -UNIDADE < self.vx < UNIDADE
+            self.vx = -self.vx * self.quique // 100
+        self.x = x
+
+        y = self.y + self.vy * dt // 1000
+        if (y >> BITS) != (self.y >> BITS) and self.mundo.parede(self.x >> BITS, y >> BITS):
+            y = self._encostar(self.y, self.vy)
+            colidiu = colidiu or not -UNIDADE < self.vy < UNIDADE
+            self.vy = -self.vy * self.quique // 100
+        self.y = y
+        return colidiu
+
+    def _velocidade(self, v, a, dt):
+        """Nova velocidade: aceleração, atrito e limite"""
+        # Contagens em 1/16 para o produto caber em um inteiro pequeno do MicroPython
+        v += (a >> 4) * self.ganho // (CONTAGENS_POR_G >> 4) * dt // 1000
+        v -= v * self.atrito * dt // 1000
+        if not a and -UNIDADE // 64 < v < UNIDADE // 64:
+            v = 0  # O atrito arredondado nunca zeraria uma velocidade residual
+        if v > self.limite:
+            v = self.limite
+        elif v < -self.limite:
+            v = -self.limite
+        return v
+
+    @staticmethod
+    def _encostar(pos, v):
+        """Posição encostada na borda da célula atual, do lado do movimento"""
+        celula = pos >> BITS
+        if v > 0:
+            return ((celula + 1) << BITS) - 1
+        return celula << BITS
+
+def desenhar_suave(matriz, x, y, cor, ox=0, oy=0, mundo=None):
+    """
+    Desenha um ponto em coordenadas de ponto fixo repartindo o brilho entre
+    os até 4 LEDs vizinhos (interpolação bilinear), no buffer da matriz
+    ox, oy: canto da janela visível, em células
+    mundo: se dado, as células de parede não são pintadas por cima
+    """
+    fx = x - METADE - (ox << BITS)
+    fy = y - METADE - (oy << BITS)
+    x0 = fx >> BITS
+    y0 = fy >> BITS
+    wx = fx & MASCARA
+    wy = fy & MASCARA
+    r, g, b = cor
+    for dx, px in ((0, UNIDADE - wx), (1, wx)):
+        for dy, py in ((0, UNIDADE - wy), (1, wy)):
+            peso = (px * py) >> BITS
+            if peso and not (mundo and mundo.parede(ox + x0 + dx, oy + y0 + dy)):
+                matriz.definir_led(x0 + dx, y0 + dy,
+                                   ((r * peso) >> BITS, (g * peso) >> BITS, (b * peso) >> BITS))
@@ -0,0 +1,132 @@
+# framebuf.py
+# Substituto do módulo framebuf do MicroPython para execução no host
+#
+# Só o formato MONO_VLSB (o do SSD1306): cada byte guarda 8 pixels de uma
+# coluna, o bit 0 em cima, e as "páginas" de 8 linhas vêm uma após a outra.
+# O texto usa uma fonte 5x7 em células de 8x8, como a fonte embutida.
+
+MONO_VLSB = 0
+MONO_HLSB = 3
+MONO_HMSB = 4
+RGB565 = 1
+GS2_HMSB = 5
+GS4_HMSB = 2
+GS8 = 6
+
+# Fonte 5x7, ASCII 32 a 126: 5 colunas por caractere, bit 0 na linha de cima
+FONTE = bytes.fromhex(
+    '0000000000' '00005f0000' '0007000700' '147f147f14' '242a7f2a12'
+    '2313086462' '3649552250' '0005030000' '001c224100' '0041221c00'
+    '082a1c2a08' '08083e0808' '0050300000' '0808080808' '0060600000'
+    '2010080402' '3e5149453e' '00427f4000' '4261514946' '2141454b31'
+    '1814127f10' '2745454539' '3c4a494930' '0171090503' '3649494936'
+    '064949291e' '0036360000' '0056360000' '0008142241' '1414141414'
+    '4122140800' '0201510906' '324979413e' '7e1111117e' '7f49494936'
+    '3e41414122' '7f4141221c' '7f49494941' '7f09090101' '3e41415132'
+    '7f0808087f' '00417f4100' '2040413f01' '7f08142241' '7f40404040'
+    '7f0204027f' '7f0408107f' '3e4141413e' '7f09090906' '3e4151215e'
+    '7f09192946' '4649494931' '01017f0101' '3f4040403f' '1f2040201f'
+    '7f2018207f' '6314081463' '0304780403' '6151494543' '00007f4141'
+    '0204081020' '41417f0000' '0402010204' '4040404040' '0001020400'
+    '2054545478' '7f48444438' '3844444420' '384444487f' '3854545418'
+    '087e090102' '081454543c' '7f08040478' '00447d4000' '2040443d00'
+    '007f102844' '00417f4000' '7c04180478' '7c08040478' '3844444438'
+    '7c14141408' '081414187c' '7c08040408' '4854545420' '043f444020'
+    '3c4040207c' '1c2040201c' '3c4030403c' '4428102844' '0c5050503c'
+    '4464544c44' '0008364100' '00007f0000' '0041360800' '08082a1c08'
+)
+
+class FrameBuffer:
+    def __init__(self, buffer, width, height, format=MONO_VLSB, stride=None):
+        if format != MONO_VLSB:
+            raise ValueError("formato nao suportado no host")
+        self.buffer = buffer
+        self.width = width
+        self.height = height
+
+    # === PIXELS ===
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        i = (y >> 3) * self.width + x
+        bit = 1 << (y & 7)
+        if c is None:
+            return 1 if self.buffer[i] & bit else 0
+        if c:
+            self.buffer[i] |= bit
+        else:
+            self.buffer[i] &= ~bit & 0xFF
+
+    def fill(self, c):
+        valor = 0xFF if c else 0
+        buffer = self.buffer
+        for i in range(len(buffer)):
+            buffer[i] = valor
+
+    def fill_rect(self, x, y, w, h, c):
+        for yy in range(max(y, 0), min(y + h, self.height)):
+            for xx in range(max(x, 0), min(x + w, self.width)):
+                self.pixel(xx, yy, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self.fill_rect(x, y, w, h, c)
+            return
+        self.hline(x, y, w, c)
+        self.hline(x, y + h - 1, w, c)
+        self.vline(x, y, h, c)
+        self.vline(x + w - 1, y, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        """Bresenham"""
+        dx = abs(x2 - x1)
+        dy = -abs(y2 - y1)
+        sx = 1 if x1 < x2 else -1
+        sy = 1 if y1 < y2 else -1
+        erro = dx + dy
+        while True:
+            self.pixel(x1, y1, c)
+            if x1 == x2 and y1 == y2:
+                return
+            e2 = 2 * erro
+            if e2 >= dy:
+                erro += dy
+                x1 += sx
+            if e2 <= dx:
+                erro += dx
+                y1 += sy
+
+    def scroll(self, xstep, ystep):
+        copia = FrameBuffer(bytearray(self.buffer), self.width, self.height)
+        for y in range(self.height):
+            for x in range(self.width):
+                sx = x - xstep
+                sy = y - ystep
+                if 0 <= sx < self.width and 0 <= sy < self.height:
+                    self.pixel(x, y, copia.pixel(sx, sy))
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        for yy in range(fbuf.height):
+            for xx in range(fbuf.width):
+                c = fbuf.pixel(xx, yy)
+                if c != key:
+                    self.pixel(x + xx, y + yy, c)
+
+    # === TEXTO ===
+    def text(self, s, x, y, c=1):
+        for caractere in s:
+            codigo = ord(caractere)
+            if not 32 <= codigo <= 126:
+                codigo = 127  # Fora da fonte: célula cheia, como na fonte embutida
+            for coluna in range(5):
+                bits = FONTE[(codigo - 32) * 5 + coluna] if codigo < 127 else 0x7F
+                for linha in range(8):
+                    if (bits >> linha) & 1:
+                        self.pixel(x + coluna, y + linha, c)
+            x += 8
@@ -0,0 +1,71 @@
+# i2c_emulado.py
+# Barramento I2C emulado para execução no host (CPython / porta Unix do MicroPython)
+#
+# Cada par de pinos (scl, sda) corresponde a um barramento físico. Dispositivos
+# emulados são conectados a um barramento e ficam visíveis para qualquer
+# machine.I2C / machine.SoftI2C criado com os mesmos pinos.
+
+ENODEV = 19
+
+_barramentos = {}
+
+def _id_pino(pino):
+    """Aceita um machine.Pin emulado ou o número do pino"""
+    return getattr(pino, 'id', pino)
+
+def barramento(scl, sda):
+    """Retorna o dicionário de dispositivos (endereço -> dispositivo) do barramento"""
+    chave = (_id_pino(scl), _id_pino(sda))
+    if chave not in _barramentos:
+        _barramentos[chave] = {}
+    return _barramentos[chave]
+
+def conectar(dispositivo, scl, sda, addr):
+    """Conecta um dispositivo emulado ao barramento dos pinos indicados"""
+    barramento(scl, sda)[addr] = dispositivo
+
+def desconectar_todos():
+    """Remove todos os dispositivos de todos os barramentos"""
+    _barramentos.clear()
+
+class BarramentoEmulado:
+    """
+    Implementa a interface de machine.I2C sobre dispositivos emulados.
+    Um dispositivo precisa oferecer ler(reg, n) -> bytes e escrever(reg, dados).
+    """
+    def __init__(self, scl, sda, freq=400000):
+        self.dispositivos = barramento(scl, sda)
+        self.freq = freq
+        self.ponteiros = {}  # Registrador atual de cada endereço (para writeto/readfrom)
+
+    def _dispositivo(self, addr):
+        dispositivo = self.dispositivos.get(addr)
+        if dispositivo is None:
+            raise OSError(ENODEV)
+        return dispositivo
+
+    def scan(self):
+        return sorted(self.dispositivos)
+
+    def readfrom_mem(self, addr, reg, n, addrsize=8):
+        return bytes(self._dispositivo(addr).ler(reg, n))
+
+    def readfrom_mem_into(self, addr, reg, buf, addrsize=8):
+        buf[:] = self._dispositivo(addr).ler(reg, len(buf))
+
+    def writeto_mem(self, addr, reg, buf, addrsize=8):
+        self._dispositivo(addr).escrever(reg, bytes(buf))
+
+    def writeto(self, addr, buf, stop=True):
+        dispositivo = self._dispositivo(addr)
+        if len(buf):
+            self.ponteiros[addr] = buf[0]
+            if len(buf) > 1:
+                dispositivo.escrever(buf[0], bytes(buf[1:]))
+        return 1
+
+    def readfrom(self, addr, n, stop=True):
+        return bytes(self._dispositivo(addr).ler(self.ponteiros.get(addr, 0), n))
+
+    def readfrom_into(self, addr, buf, stop=True):
+        buf[:] = self.readfrom(addr, len(buf))
\ No newline at end of file
@@ -0,0 +1,143 @@
+# machine.py
+# Substituto do módulo machine do MicroPython para execução no host
+#
+# Os pinos de entrada leem o nível definido pelo host (Pin.definir_nivel),
+# que também dispara as interrupções de borda configuradas com Pin.irq; os
+# barramentos I2C enxergam os dispositivos emulados de i2c_emulado.py. Leituras
+# de entrada e mudanças de PWM avisam o simulador (simulador.py), se houver,
+# e cada leitura gasta um pouco do relógio virtual (ver utime.py).
+
+from i2c_emulado import BarramentoEmulado
+import simulador
+import utime
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    # Nível externo de cada pino de entrada (id -> 0/1)
+    _niveis = {}
+    # Pinos com interrupção configurada (id -> lista de Pin)
+    _irqs = {}
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.modo = mode
+        self.pull = pull
+        self.saida = 0
+        self.handler = None
+        self.trigger = 0
+        if value is not None:
+            self.saida = value
+
+    def init(self, mode=-1, pull=-1, value=None):
+        if mode != -1:
+            self.modo = mode
+        if pull != -1:
+            self.pull = pull
+        if value is not None:
+            self.saida = value
+
+    def value(self, v=None):
+        if v is not None:
+            self.saida = 1 if v else 0
+            return None
+        if self.modo == Pin.OUT:
+            return self.saida
+        utime.custo_leitura()
+        simulador.sondar()
+        return Pin._niveis.get(self.id, self._nivel_padrao())
+
+    def __call__(self, v=None):
+        return self.value(v)
+
+    def on(self):
+        self.saida = 1
+
+    def off(self):
+        self.saida = 0
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, **kwargs):
+        self.handler = handler
+        self.trigger = trigger
+        pinos = Pin._irqs.setdefault(self.id, [])
+        if self in pinos:
+            pinos.remove(self)
+        if handler is not None:
+            pinos.append(self)
+
+    def _nivel_padrao(self):
+        return 1 if self.pull == Pin.PULL_UP else 0
+
+    @classmethod
+    def definir_nivel(cls, id, nivel):
+        """
+        (Host) Define o nível externo lido por um pino de entrada e chama os
+        handlers de interrupção cuja borda (descida ou subida) aconteceu
+        """
+        anterior = cls._niveis.get(id)
+        cls._niveis[id] = nivel
+        for pino in list(cls._irqs.get(id, ())):
+            antes = anterior if anterior is not None else pino._nivel_padrao()
+            if antes == nivel:
+                continue
+            borda = Pin.IRQ_FALLING if nivel == 0 else Pin.IRQ_RISING
+            if pino.trigger & borda:
+                pino.handler(pino)
+
+class PWM:
+    def __init__(self, pin, freq=0, duty_u16=0):
+        self.pin = pin
+        self._freq = freq
+        self._duty = duty_u16
+
+    def freq(self, valor=None):
+        if valor is None:
+            return self._freq
+        self._freq = valor
+        simulador.pwm_alterado(self)
+
+    def duty_u16(self, valor=None):
+        if valor is None:
+            return self._duty
+        self._duty = valor
+        simulador.pwm_alterado(self)
+
+    def deinit(self):
+        self._duty = 0
+        simulador.pwm_alterado(self)
+
+class ADC:
+    # Valor lido por cada pino analógico (id -> 0..65535); padrão: centro
+    _valores = {}
+
+    def __init__(self, pin):
+        self.id = getattr(pin, 'id', pin)
+
+    def read_u16(self):
+        utime.custo_leitura()
+        simulador.sondar()
+        return ADC._valores.get(self.id, 32768)
+
+    @classmethod
+    def definir_valor(cls, id, valor):
+        """(Host) Define o valor lido por um pino analógico"""
+        cls._valores[id] = valor
+
+class I2C(BarramentoEmulado):
+    def __init__(self, id=0, scl=None, sda=None, freq=400000, **kwargs):
+        BarramentoEmulado.__init__(self, scl, sda, freq)
+
+class SoftI2C(BarramentoEmulado):
+    def __init__(self, scl, sda, freq=400000, timeout=50000):
+        BarramentoEmulado.__init__(self, scl, sda, freq)
+
+def lightsleep(time_ms=None):
+    """No host, o sono leve é apenas uma espera"""
+    if time_ms is not None:
+        utime.sleep_ms(time_ms)
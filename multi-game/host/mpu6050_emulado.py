@@ -0,0 +1,328 @@
+# mpu6050_emulado.py
+# Emulador do mapa de registradores do MPU-6050 para o barramento I2C do host
+#
+# O emulador gera as leituras a partir de um perfil de movimento: uma função
+# perfil(t_s) -> (ax, ay, az [g], temp [°C], gx, gy, gz [°/s]). Há perfis
+# sintéticos e um perfil que reproduz um trace gravado (components/sensor_trace.py).
+
+import math
+import random
+from utime import ticks_us, ticks_diff
+import i2c_emulado
+
+# === REGISTRADORES ===
+SMPLRT_DIV = 0x19
+CONFIG = 0x1A
+GYRO_CONFIG = 0x1B
+ACCEL_CONFIG = 0x1C
+MOT_THR = 0x1F
+MOT_DUR = 0x20
+FIFO_EN = 0x23
+INT_PIN_CFG = 0x37
+INT_ENABLE = 0x38
+INT_STATUS = 0x3A
+ACCEL_XOUT_H = 0x3B
+USER_CTRL = 0x6A
+PWR_MGMT_1 = 0x6B
+PWR_MGMT_2 = 0x6C
+FIFO_COUNTH = 0x72
+FIFO_COUNTL = 0x73
+FIFO_R_W = 0x74
+WHO_AM_I = 0x75
+
+# Bits relevantes
+PWR_DEVICE_RESET = 0x80
+PWR_SLEEP = 0x40
+USER_FIFO_EN = 0x40
+USER_FIFO_RESET = 0x04
+FIFO_TEMP = 0x80
+FIFO_XG = 0x40
+FIFO_YG = 0x20
+FIFO_ZG = 0x10
+FIFO_ACCEL = 0x08
+INT_FIFO_OFLOW = 0x10
+INT_DATA_RDY = 0x01
+INT_MOT = 0x40
+ACCEL_HPF_HOLD = 0x07  # ACCEL_CONFIG: referência do passa-altas congelada
+INT_RD_CLEAR = 0x10  # INT_PIN_CFG: qualquer leitura limpa o INT_STATUS
+
+TAMANHO_FIFO = 1024
+
+# Registradores somente leitura (escritas são ignoradas)
+_SOMENTE_LEITURA = set(range(ACCEL_XOUT_H, ACCEL_XOUT_H + 14)) | {
+    INT_STATUS, FIFO_COUNTH, FIFO_COUNTL, WHO_AM_I
+}
+
+def _int16(valor):
+    """Satura e converte para inteiro de 16 bits com sinal"""
+    valor = int(round(valor))
+    if valor > 32767:
+        return 32767
+    if valor < -32768:
+        return -32768
+    return valor
+
+# === PERFIS DE MOVIMENTO ===
+def perfil_parado(temp=25.0):
+    """Dispositivo em repouso sobre uma superfície plana"""
+    def perfil(t):
+        return (0.0, 0.0, 1.0, temp, 0.0, 0.0, 0.0)
+    return perfil
+
+def perfil_inclinacao(periodo_s=4.0, amplitude_g=0.6, temp=25.0):
+    """Inclinação circular contínua: a gravidade percorre os eixos X e Y"""
+    def perfil(t):
+        fase = 2 * math.pi * t / periodo_s
+        ax = amplitude_g * math.sin(fase)
+        ay = amplitude_g * math.cos(fase)
+        az = math.sqrt(max(0.0, 1.0 - ax * ax - ay * ay))
+        return (ax, ay, az, temp, 0.0, 0.0, 0.0)
+    return perfil
+
+def perfil_rotacao(velocidade_dps=90.0, periodo_s=2.0, temp=25.0):
+    """Rotação em torno de Z, alternando o sentido a cada período"""
+    def perfil(t):
+        sentido = 1 if int(t / periodo_s) % 2 == 0 else -1
+        return (0.0, 0.0, 1.0, temp, 0.0, 0.0, sentido * velocidade_dps)
+    return perfil
+
+def perfil_ruidoso(base, sigma_g=0.01, sigma_dps=0.5, semente=0):
+    """Adiciona ruído gaussiano determinístico a outro perfil"""
+    gerador = random.Random(semente)
+    def perfil(t):
+        ax, ay, az, temp, gx, gy, gz = base(t)
+        return (ax + gerador.gauss(0, sigma_g), ay + gerador.gauss(0, sigma_g),
+                az + gerador.gauss(0, sigma_g), temp,
+                gx + gerador.gauss(0, sigma_dps), gy + gerador.gauss(0, sigma_dps),
+                gz + gerador.gauss(0, sigma_dps))
+    return perfil
+
+def perfil_trace(caminho, repetir=True):
+    """Reproduz um trace gravado no sensor real (ver components/sensor_trace.py)"""
+    import bisect
+    from components.sensor_trace import ReprodutorTrace
+    from components.mpu6050 import converter
+
+    reprodutor = ReprodutorTrace(caminho)
+    tempos = []
+    amostras = []
+    for t_us, raw in reprodutor.amostras():
+        dados = converter(raw)
+        tempos.append(t_us / 1000000)
+        amostras.append((dados['accel']['x'], dados['accel']['y'], dados['accel']['z'],
+                         dados['temp'],
+                         dados['gyro']['x'], dados['gyro']['y'], dados['gyro']['z']))
+    reprodutor.fechar()
+    if not amostras:
+        raise ValueError(f"Trace vazio: {caminho}")
+    duracao = tempos[-1] if tempos[-1] > 0 else 1.0
+
+    def perfil(t):
+        if repetir:
+            t = t % duracao
+        indice = bisect.bisect_right(tempos, t) - 1
+        return amostras[max(0, min(indice, len(amostras) - 1))]
+    return perfil
+
+def perfil_por_nome(nome):
+    """Perfil pelo nome usado na linha de comando: parado, inclinacao, rotacao ou trace:<arquivo>"""
+    if nome == 'parado':
+        return perfil_parado()
+    if nome == 'inclinacao':
+        return perfil_ruidoso(perfil_inclinacao())
+    if nome == 'rotacao':
+        return perfil_ruidoso(perfil_rotacao())
+    if nome.startswith('trace:'):
+        return perfil_trace(nome[len('trace:'):])
+    raise ValueError(f"Perfil desconhecido: {nome}")
+
+class MPU6050Emulado:
+    """
+    Emula o MPU-6050 no nível de registradores: WHO_AM_I, PWR_MGMT_1 (reset e
+    sleep), taxa de amostragem, faixas do acelerômetro/giroscópio, bloco de dados
+    em 0x3B, INT_STATUS e FIFO de 1024 bytes.
+    """
+    def __init__(self, perfil=None, relogio=ticks_us):
+        self.perfil = perfil or perfil_parado()
+        self.relogio = relogio
+        # Tempo acumulado em microssegundos (imune ao wrap-around de ticks_us)
+        self.t_ultimo = relogio()
+        self.t_acumulado = 0
+        self.regs = bytearray(128)
+        self.fifo = bytearray(TAMANHO_FIFO)
+        self.leituras = 0  # Transações de leitura atendidas (útil em benchmarks)
+        self.resetar()
+
+    def resetar(self):
+        """Estado de power-on: tudo zerado, dispositivo em sleep"""
+        for i in range(len(self.regs)):
+            self.regs[i] = 0
+        self.regs[PWR_MGMT_1] = PWR_SLEEP
+        self.regs[WHO_AM_I] = 0x68
+        self.fifo_inicio = 0
+        self.fifo_qtd = 0
+        self.t_ultima_amostra = self._agora_us()
+        self.referencia_mov = None  # Aceleração congelada pelo HPF_HOLD
+        self.tempo_mov = 0         # Tempo (ms) seguido acima de MOT_THR
+
+    def _agora_us(self):
+        agora = self.relogio()
+        self.t_acumulado += ticks_diff(agora, self.t_ultimo)
+        self.t_ultimo = agora
+        return self.t_acumulado
+
+    # === CONFIGURAÇÃO ===
+    def taxa_amostragem_hz(self):
+        """Taxa de amostragem conforme CONFIG (DLPF) e SMPLRT_DIV"""
+        dlpf = self.regs[CONFIG] & 0x07
+        base = 8000 if dlpf in (0, 7) else 1000
+        return base / (1 + self.regs[SMPLRT_DIV])
+
+    def _lsb_por_g(self):
+        return 16384 >> ((self.regs[ACCEL_CONFIG] >> 3) & 0x03)
+
+    def _lsb_por_dps(self):
+        return 131.0 / (1 << ((self.regs[GYRO_CONFIG] >> 3) & 0x03))
+
+    def dormindo(self):
+        return bool(self.regs[PWR_MGMT_1] & PWR_SLEEP)
+
+    # === GERAÇÃO DE AMOSTRAS ===
+    def _amostra_raw(self, t_us):
+        """Amostra do perfil no instante t_us em contagens brutas"""
+        ax, ay, az, temp, gx, gy, gz = self.perfil(t_us / 1000000)
+        lsb_g = self._lsb_por_g()
+        lsb_dps = self._lsb_por_dps()
+        return (_int16(ax * lsb_g), _int16(ay * lsb_g), _int16(az * lsb_g),
+                _int16((temp - 36.53) * 340),
+                _int16(gx * lsb_dps), _int16(gy * lsb_dps), _int16(gz * lsb_dps))
+
+    def _escrever_dados(self, raw):
+        """Atualiza o bloco de registradores 0x3B..0x48"""
+        for i, valor in enumerate(raw):
+            valor &= 0xFFFF
+            self.regs[ACCEL_XOUT_H + 2 * i] = valor >> 8
+            self.regs[ACCEL_XOUT_H + 2 * i + 1] = valor & 0xFF
+
+    def _empilhar_fifo(self, raw):
+        """Coloca na FIFO os campos habilitados em FIFO_EN"""
+        habilitados = self.regs[FIFO_EN]
+        campos = []
+        if habilitados & FIFO_ACCEL:
+            campos.extend(raw[0:3])
+        if habilitados & FIFO_TEMP:
+            campos.append(raw[3])
+        if habilitados & FIFO_XG:
+            campos.append(raw[4])
+        if habilitados & FIFO_YG:
+            campos.append(raw[5])
+        if habilitados & FIFO_ZG:
+            campos.append(raw[6])
+        for valor in campos:
+            valor &= 0xFFFF
+            for byte in (valor >> 8, valor & 0xFF):
+                if self.fifo_qtd == TAMANHO_FIFO:
+                    # Estouro: descarta o byte mais antigo, como o chip real
+                    self.fifo_inicio = (self.fifo_inicio + 1) % TAMANHO_FIFO
+                    self.fifo_qtd -= 1
+                    self.regs[INT_STATUS] |= INT_FIFO_OFLOW
+                self.fifo[(self.fifo_inicio + self.fifo_qtd) % TAMANHO_FIFO] = byte
+                self.fifo_qtd += 1
+
+    def _sincronizar(self):
+        """Gera as amostras ocorridas desde a última sincronização"""
+        agora = self._agora_us()
+        if self.dormindo():
+            self.t_ultima_amostra = agora
+            return
+
+        periodo = 1000000 / self.taxa_amostragem_hz()
+        pendentes = int((agora - self.t_ultima_amostra) / periodo)
+        if pendentes <= 0:
+            return
+
+        usar_fifo = self.regs[USER_CTRL] & USER_FIFO_EN and self.regs[FIFO_EN]
+        if usar_fifo:
+            # Não há por que gerar mais amostras do que cabem na FIFO
+            limite = TAMANHO_FIFO // 2 + 1
+            if pendentes > limite:
+                self.t_ultima_amostra += (pendentes - limite) * periodo
+                pendentes = limite
+            for _ in range(pendentes):
+                self.t_ultima_amostra += periodo
+                self._empilhar_fifo(self._amostra_raw(self.t_ultima_amostra))
+        else:
+            self.t_ultima_amostra += pendentes * periodo
+
+        raw = self._amostra_raw(self.t_ultima_amostra)
+        self._escrever_dados(raw)
+        self.regs[INT_STATUS] |= INT_DATA_RDY
+        self._detectar_movimento(raw, pendentes * periodo / 1000)
+
+    def _detectar_movimento(self, raw, decorrido_ms):
+        """Trava INT_MOT se algum eixo ficar além de MOT_THR por MOT_DUR ms"""
+        if not (self.regs[INT_ENABLE] & INT_MOT) or self.referencia_mov is None:
+            return
+        limiar = self.regs[MOT_THR] * 2 * self._lsb_por_g() // 1000
+        if any(abs(raw[i] - self.referencia_mov[i]) > limiar for i in range(3)):
+            self.tempo_mov += decorrido_ms
+            if self.tempo_mov >= self.regs[MOT_DUR]:
+                self.regs[INT_STATUS] |= INT_MOT
+        else:
+            self.tempo_mov = 0
+
+    # === INTERFACE DO BARRAMENTO ===
+    def escrever(self, reg, dados):
+        """Escrita I2C a partir de reg (com auto-incremento)"""
+        self._sincronizar()
+        for byte in dados:
+            if reg == PWR_MGMT_1 and byte & PWR_DEVICE_RESET:
+                self.resetar()
+            elif reg == USER_CTRL:
+                if byte & USER_FIFO_RESET:
+                    self.fifo_inicio = 0
+                    self.fifo_qtd = 0
+                self.regs[reg] = byte & ~USER_FIFO_RESET & 0xFF
+            elif reg == FIFO_R_W:
+                pass  # Escrita na FIFO pelo barramento não é suportada
+            elif reg == ACCEL_CONFIG and byte & 0x07 == ACCEL_HPF_HOLD:
+                # Congela a aceleração atual como referência do movimento
+                self.regs[reg] = byte
+                self.referencia_mov = self._amostra_raw(self._agora_us())[:3]
+                self.tempo_mov = 0
+            elif reg not in _SOMENTE_LEITURA:
+                self.regs[reg] = byte
+            if reg != FIFO_R_W:
+                reg = (reg + 1) & 0x7F
+
+    def ler(self, reg, n):
+        """Leitura I2C a partir de reg (com auto-incremento, exceto na FIFO)"""
+        self._sincronizar()
+        self.leituras += 1
+        resposta = bytearray(n)
+        for i in range(n):
+            if reg == FIFO_R_W:
+                if self.fifo_qtd:
+                    resposta[i] = self.fifo[self.fifo_inicio]
+                    self.fifo_inicio = (self.fifo_inicio + 1) % TAMANHO_FIFO
+                    self.fifo_qtd -= 1
+                continue  # O ponteiro permanece na FIFO
+            if reg == FIFO_COUNTH:
+                resposta[i] = self.fifo_qtd >> 8
+            elif reg == FIFO_COUNTL:
+                resposta[i] = self.fifo_qtd & 0xFF
+            else:
+                resposta[i] = self.regs[reg]
+            if reg == INT_STATUS or (self.regs[INT_PIN_CFG] & INT_RD_CLEAR):
+                self.regs[INT_STATUS] = 0
+            reg = (reg + 1) & 0x7F
+        return resposta
+
+def conectar(perfil=None, scl=1, sda=0, addr=0x68, relogio=ticks_us):
+    """
+    Cria um MPU-6050 emulado e o conecta ao barramento I2C do sensor
+    (pinos 0/1, como na BitDogLab). Retorna o emulador.
+    """
+    sensor = MPU6050Emulado(perfil, relogio)
+    i2c_emulado.conectar(sensor, scl, sda, addr)
+    return sensor
\ No newline at end of file
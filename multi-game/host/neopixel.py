@@ -0,0 +1,35 @@
+# neopixel.py
+# Substituto do módulo neopixel do MicroPython para execução no host
+#
+# Guarda as cores em um buffer, como o original; write() entrega o quadro
+# ao simulador, que desenha a matriz no terminal ou em PNG.
+
+import simulador
+
+class NeoPixel:
+    ORDER = (1, 0, 2, 3)
+
+    def __init__(self, pin, n, bpp=3, timing=1):
+        self.pin = pin
+        self.n = n
+        self.bpp = bpp
+        self.buf = [(0,) * bpp] * n
+        self.escritas = 0
+
+    def __len__(self):
+        return self.n
+
+    def __setitem__(self, i, cor):
+        self.buf[i] = tuple(cor)
+
+    def __getitem__(self, i):
+        return self.buf[i]
+
+    def fill(self, cor):
+        cor = tuple(cor)
+        for i in range(self.n):
+            self.buf[i] = cor
+
+    def write(self):
+        self.escritas += 1
+        simulador.matriz_escrita(self)
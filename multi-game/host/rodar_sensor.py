@@ -0,0 +1,246 @@
+# rodar_sensor.py
+# Executa uma etapa com sensor no host, usando o MPU-6050 emulado
+#
+# Uso (a partir da pasta multi-game):
+#   python host/rodar_sensor.py TiltGame --perfil inclinacao --segundos 10
+#   python host/rodar_sensor.py GyroGame --perfil trace:trace_giroscopio.bin
+#   python host/rodar_sensor.py TiltGame --segundos 30 --virtual --semente 1
+#   python host/rodar_sensor.py SensorTest --opcao 0 --segundos 5
+#
+# Display, matriz, buzzer e botões são substituídos por dublês de console;
+# o código da etapa e o driver do sensor rodam sem modificações. No
+# SensorTest, os botões seguem um roteiro: escolhem a opção --opcao, saem
+# dela após --segundos e voltam.
+
+import os
+import sys
+from time import perf_counter
+
+_AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_AQUI))
+sys.path.insert(0, _AQUI)
+
+import utime
+import urandom
+from utime import ticks_ms, ticks_diff
+import mpu6050_emulado
+
+ETAPAS = {
+    'TiltGame': 'stages.tilt_game',
+    'MazeGame': 'stages.maze_game',
+    'BalanceGame': 'stages.balance_game',
+    'GyroGame': 'stages.gyro_game',
+    'SensorTest': 'stages.sensor_test',
+}
+
+class DisplayConsole:
+    """Dublê do Display: imprime as mensagens quando mudam"""
+    def __init__(self):
+        self.ultima = None
+        self.atualizacoes = 0
+
+    def mostrar_mensagem(self, mensagens, y_inicial=0, espacamento=10):
+        self.atualizacoes += 1
+        if mensagens != self.ultima:
+            print("[OLED] " + " | ".join(mensagens))
+            self.ultima = list(mensagens)
+
+    def limpar(self):
+        self.atualizacoes += 1
+
+    def texto(self, texto, x=0, y=0, mostrar=True):
+        if mostrar:
+            self.atualizacoes += 1
+
+    def exibir_numero_grande(self, numero):
+        print(f"[OLED] {numero}")
+
+class MatrizConsole:
+    """Dublê da MatrizLED: guarda o estado dos 25 LEDs e conta as escritas"""
+    def __init__(self):
+        self.pixels = {}
+        self.escritas = 0
+
+    def acender_led(self, x, y, r=20, g=20, b=20):
+        if 0 <= x <= 4 and 0 <= y <= 4:
+            self.pixels[(x, y)] = (r, g, b)
+            self.escritas += 1
+
+    def acender_led_cor(self, x, y, cor):
+        self.acender_led(x, y, *cor)
+
+    def apagar_led(self, x, y):
+        self.pixels.pop((x, y), None)
+        self.escritas += 1
+
+    def definir_led(self, x, y, cor):
+        if 0 <= x <= 4 and 0 <= y <= 4:
+            self.pixels[(x, y)] = cor
+
+    def limpar_buffer(self):
+        self.pixels.clear()
+
+    def mostrar(self):
+        self.escritas += 1
+
+    def apagar(self):
+        self.pixels.clear()
+        self.escritas += 1
+
+    def piscar_led(self, x, y, cor, vezes=3, duracao=0.2):
+        self.escritas += 2 * vezes
+
+    async def piscar_led_async(self, x, y, cor, vezes=3, duracao=0.2):
+        self.escritas += 2 * vezes
+
+class BuzzerMudo:
+    """Dublê do Buzzer: conta os sons sem esperar a duração"""
+    def __init__(self):
+        self.sons = 0
+
+    def tocar_som(self, frequencia, duracao_ms):
+        self.sons += 1
+
+    def tocar_nota(self, nota, duracao_ms):
+        self.sons += 1
+
+    def tocar_fim_jogo(self):
+        self.sons += 3
+
+    def tocar_game_over(self):
+        self.sons += 3
+
+    def tocar_start(self):
+        self.sons += 1
+
+    def silenciar(self):
+        pass
+
+    async def tarefa_som(self):
+        pass
+
+class BotoesAutomaticos:
+    """
+    Dublê dos Botões: qualquer espera é atendida imediatamente pelo botão A.
+    Um roteiro [(botao, atraso_ms), ...] faz esta_pressionado_a/b relatarem
+    cada aperto uma vez, atraso_ms depois do aperto anterior (menus que
+    esperam uma escolha, como o do SensorTest)
+    """
+    def __init__(self, roteiro=()):
+        self.roteiro = list(roteiro)
+        self.ultimo_aperto = ticks_ms()
+
+    def _apertado(self, botao):
+        if not self.roteiro:
+            return False
+        proximo, atraso_ms = self.roteiro[0]
+        if proximo != botao or ticks_diff(ticks_ms(), self.ultimo_aperto) < atraso_ms:
+            return False
+        self.roteiro.pop(0)
+        self.ultimo_aperto = ticks_ms()
+        return True
+
+    def aguardar_botao_a(self, debounce=True):
+        pass
+
+    def aguardar_botao_b(self, debounce=True):
+        pass
+
+    def aguardar_qualquer_botao(self, debounce=True):
+        return 1
+
+    async def aguardar_qualquer_botao_async(self, debounce=True):
+        return 1
+
+    def esta_pressionado_a(self):
+        return self._apertado('A')
+
+    def esta_pressionado_b(self):
+        return self._apertado('B')
+
+    def atualizar(self):
+        pass
+
+    def limpar_eventos(self):
+        pass
+
+    def foi_pressionado_a(self):
+        return False
+
+    def foi_pressionado_b(self):
+        return False
+
+# Opções do menu do SensorTest que só terminam com o botão B
+OPCOES_ATE_B = (0, 3)  # Visualização ao vivo e teste na matriz
+OPCAO_VOLTAR = 4
+
+def roteiro_sensor_test(opcao, segundos):
+    """
+    Escolhe a opção no menu do SensorTest (A avança, B escolhe), sai dela
+    com B após 'segundos' quando ela espera o B e escolhe "Voltar"
+    """
+    roteiro = [('A', 0)] * opcao + [('B', 0)]
+    if opcao in OPCOES_ATE_B:
+        roteiro.append(('B', segundos * 1000))
+    roteiro += [('A', 0)] * OPCAO_VOLTAR + [('B', 0)]
+    return roteiro
+
+def main(argv):
+    if not argv or argv[0] not in ETAPAS:
+        print("Uso: rodar_sensor.py <" + "|".join(ETAPAS) + "> [--perfil nome] [--segundos N] [--virtual] [--semente S]")
+        print("                      [--opcao N]  (SensorTest: 0 ao vivo, 1 calibracao, 2 termica, 3 matriz)")
+        return 1
+
+    nome_etapa = argv[0]
+    perfil = 'inclinacao'
+    segundos = None
+    opcao = 3
+    i = 1
+    while i < len(argv):
+        if argv[i] == '--perfil':
+            perfil = argv[i + 1]
+            i += 2
+        elif argv[i] == '--segundos':
+            segundos = int(argv[i + 1])
+            i += 2
+        elif argv[i] == '--virtual':
+            utime.usar_relogio(utime.RelogioVirtual())
+            i += 1
+        elif argv[i] == '--opcao':
+            opcao = int(argv[i + 1])
+            i += 2
+        elif argv[i] == '--semente':
+            urandom.seed(int(argv[i + 1]))
+            i += 2
+        else:
+            print(f"Argumento desconhecido: {argv[i]}")
+            return 1
+
+    sensor = mpu6050_emulado.conectar(mpu6050_emulado.perfil_por_nome(perfil))
+
+    modulo = __import__(ETAPAS[nome_etapa], None, None, [nome_etapa])
+    display, matriz, buzzer = DisplayConsole(), MatrizConsole(), BuzzerMudo()
+    roteiro = ()
+    if nome_etapa == 'SensorTest':
+        roteiro = roteiro_sensor_test(opcao, segundos if segundos is not None else 5)
+    etapa = getattr(modulo, nome_etapa)(display, matriz, buzzer, BotoesAutomaticos(roteiro))
+    if segundos is not None and hasattr(etapa, 'tempo_total'):
+        etapa.tempo_total = segundos
+
+    inicio = ticks_ms()
+    inicio_real = perf_counter()
+    pontuacao = etapa.iniciar()
+    duracao = ticks_diff(ticks_ms(), inicio)
+    duracao_real = int((perf_counter() - inicio_real) * 1000)
+
+    print("=== Resultado ===")
+    print(f"Etapa: {nome_etapa}")
+    print(f"Pontuacao: {pontuacao}")
+    print(f"Duracao: {duracao} ms (tempo real: {duracao_real} ms)")
+    print(f"Leituras do sensor: {sensor.leituras}")
+    print(f"Escritas na matriz: {matriz.escritas}")
+    print(f"Atualizacoes do display: {display.atualizacoes}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
\ No newline at end of file
@@ -0,0 +1,544 @@
+# simulador.py
+# Simulador dos periféricos da BitDogLab no host
+#
+# Os substitutos de machine, neopixel e ssd1306 chamam as funções deste
+# módulo (matriz_escrita, oled_mostrado, pwm_alterado e sondar). Sem um
+# Simulador instalado elas não fazem nada, então os benchmarks e o
+# rodar_sensor.py continuam usando os mesmos módulos sem custo.
+#
+# Com um Simulador instalado (ver simular.py):
+# - a matriz 5x5 e o OLED 128x64 são desenhados no terminal (cores ANSI e
+#   caracteres braille ou meios-blocos) e/ou gravados como quadros PNG;
+# - teclas viram botões e joystick: z = A, x = B, setas ou wasd = joystick,
+#   espaço = botão central, q = sair. O terminal não avisa quando a tecla é
+#   solta, então cada toque segura o controle por 'segurar_ms' (a repetição
+#   automática da tecla mantém o controle pressionado);
+# - cada tom do buzzer (PWM do pino 21) é registrado com frequência e duração.
+#
+# As entradas são lidas de forma cooperativa: sondar() é chamado quando o
+# firmware lê um pino ou o ADC, escreve na matriz, atualiza o OLED ou dorme
+# no uasyncio, sem threads.
+
+import sys
+import utime  # Módulo inteiro: o utime do host também importa este (ver utime.py)
+
+# === PINOS DA PLACA (os mesmos do config.py do multi-game) ===
+PINO_MATRIZ = 7
+PINO_BOTAO_A = 5
+PINO_BOTAO_B = 6
+PINO_JOYSTICK_X = 27
+PINO_JOYSTICK_Y = 26
+PINO_JOYSTICK_SW = 22
+PINO_BUZZER = 21
+
+# Índice do LED -> (x, y) com y = 0 na linha de baixo (inverso de config.LED_MATRIX)
+MAPA_MATRIZ = [
+    [24, 23, 22, 21, 20],
+    [15, 16, 17, 18, 19],
+    [14, 13, 12, 11, 10],
+    [5, 6, 7, 8, 9],
+    [4, 3, 2, 1, 0],
+]
+POSICAO_LED = [None] * 25
+for _linha in range(5):
+    for _x in range(5):
+        POSICAO_LED[MAPA_MATRIZ[_linha][_x]] = (_x, 4 - _linha)
+
+# Controles: nome -> ('pino', id) para botões ou ('adc', id, valor) para o joystick
+CONTROLES = {
+    'A': ('pino', PINO_BOTAO_A),
+    'B': ('pino', PINO_BOTAO_B),
+    'central': ('pino', PINO_JOYSTICK_SW),
+    'dir': ('adc', PINO_JOYSTICK_X, 65535),
+    'esq': ('adc', PINO_JOYSTICK_X, 0),
+    'cima': ('adc', PINO_JOYSTICK_Y, 65535),
+    'baixo': ('adc', PINO_JOYSTICK_Y, 0),
+}
+ADC_CENTRO = 32768
+
+# Teclas -> controles ('sair' encerra o simulador)
+TECLAS = {
+    'z': 'A', 'x': 'B', ' ': 'central',
+    'w': 'cima', 's': 'baixo', 'a': 'esq', 'd': 'dir',
+    'cima': 'cima', 'baixo': 'baixo', 'esq': 'esq', 'dir': 'dir',
+    'q': 'sair',
+}
+SETAS = {'A': 'cima', 'B': 'baixo', 'C': 'dir', 'D': 'esq'}
+
+SEGURAR_MS = 150  # Quanto tempo um toque de tecla mantém o controle pressionado
+QUADRO_MS = 50    # Intervalo mínimo entre dois desenhos (terminal e PNG)
+
+# Simulador instalado (None: os ganchos abaixo não fazem nada)
+atual = None
+
+# === GANCHOS CHAMADOS PELOS SUBSTITUTOS DOS MÓDULOS ===
+def sondar():
+    if atual is not None:
+        atual.sondar()
+
+def matriz_escrita(np):
+    if atual is not None:
+        atual.matriz_escrita(np)
+
+def oled_mostrado(oled):
+    if atual is not None:
+        atual.oled_mostrado(oled)
+
+def pwm_alterado(pwm):
+    if atual is not None:
+        atual.pwm_alterado(pwm)
+
+def limitar_espera_ns(ns):
+    """Quanto o relógio virtual pode avançar de uma vez (até o próximo evento agendado)"""
+    if atual is not None:
+        return atual.limitar_espera_ns(ns)
+    return ns
+
+def _brilho(c):
+    """Cor de um canal do LED (0-255, tipicamente até 100) na tela: os tons fracos ficam visíveis"""
+    return min(255, 40 + 2 * c) if c > 0 else 0
+
+class Encerrar(SystemExit):
+    """Fim da simulação (tecla q ou tempo esgotado); passa pelos 'except Exception' do firmware"""
+    pass
+
+# === TECLADO ===
+class Teclado:
+    """Lê o stdin sem bloquear, em modo sem eco e sem esperar Enter (se houver termios)"""
+    def __init__(self):
+        import select
+        self.fd = sys.stdin.fileno()
+        self.poll = select.poll()
+        self.poll.register(self.fd, select.POLLIN)
+        self.termios_original = None
+        try:
+            import termios
+            self.termios = termios
+            atributos = termios.tcgetattr(self.fd)
+            self.termios_original = [list(a) if isinstance(a, list) else a for a in atributos]
+            atributos[3] &= ~(termios.ICANON | termios.ECHO)  # lflag; ISIG fica: Ctrl+C funciona
+            atributos[6][termios.VMIN] = 0
+            atributos[6][termios.VTIME] = 0
+            termios.tcsetattr(self.fd, termios.TCSANOW, atributos)
+        except (ImportError, OSError, AttributeError):
+            pass  # Sem termios (ex.: porta Unix sem o módulo): as teclas chegam após o Enter
+        try:
+            from os import read
+            self._ler = lambda: read(self.fd, 64)
+        except ImportError:
+            self._ler = lambda: sys.stdin.buffer.read(1)
+
+    def restaurar(self):
+        if self.termios_original is not None:
+            self.termios.tcsetattr(self.fd, self.termios.TCSANOW, self.termios_original)
+            self.termios_original = None
+
+    def ler(self):
+        """Teclas disponíveis agora (setas como 'cima', 'baixo', 'esq', 'dir')"""
+        teclas = []
+        while self.poll.poll(0):
+            dados = self._ler()
+            if not dados:
+                break
+            i = 0
+            while i < len(dados):
+                if dados[i] == 0x1B and i + 2 < len(dados) and dados[i + 1] == 0x5B:
+                    seta = SETAS.get(chr(dados[i + 2]))
+                    if seta:
+                        teclas.append(seta)
+                    i += 3
+                    continue
+                teclas.append(chr(dados[i]).lower())
+                i += 1
+        return teclas
+
+# === TERMINAL ===
+class Painel:
+    """
+    Desenha OLED, matriz e estado no topo do terminal; o que o firmware
+    imprime rola na região abaixo do painel
+    """
+    def __init__(self, modo_oled='braille'):
+        self.modo_oled = modo_oled
+        self.linhas_oled = 16 if modo_oled == 'braille' else 32
+        self.colunas_oled = 64 if modo_oled == 'braille' else 128
+        self.altura = self.linhas_oled + 5
+        saida = sys.stdout
+        saida.write('\x1b[2J\x1b[?25l')                   # Limpa a tela, esconde o cursor
+        saida.write(f'\x1b[{self.altura + 1}r')            # Região de rolagem abaixo do painel
+        saida.write(f'\x1b[{self.altura + 1};1H')
+        saida.flush()
+
+    def fechar(self):
+        sys.stdout.write('\x1b[r\x1b[?25h\n')
+        sys.stdout.flush()
+
+    def _linhas_oled(self, sim):
+        buf = sim.oled
+        largura = sim.oled_largura
+        linhas = []
+        if buf is None or not sim.oled_ligado:
+            vazia = ' ' * self.colunas_oled
+            linhas = [vazia] * self.linhas_oled
+            if buf is not None:
+                texto = '(desligado)'
+                margem = (self.colunas_oled - len(texto)) // 2
+                linhas[self.linhas_oled // 2] = ' ' * margem + texto + ' ' * (self.colunas_oled - margem - len(texto))
+            return linhas
+
+        def pixel(x, y):
+            return (buf[(y >> 3) * largura + x] >> (y & 7)) & 1
+
+        if self.modo_oled == 'braille':
+            # Cada caractere braille tem 2x4 pontos
+            pontos = ((0, 0, 0x01), (0, 1, 0x02), (0, 2, 0x04), (1, 0, 0x08),
+                      (1, 1, 0x10), (1, 2, 0x20), (0, 3, 0x40), (1, 3, 0x80))
+            for linha in range(self.linhas_oled):
+                caracteres = []
+                for coluna in range(self.colunas_oled):
+                    bits = 0
+                    for dx, dy, bit in pontos:
+                        if pixel(2 * coluna + dx, 4 * linha + dy):
+                            bits |= bit
+                    caracteres.append(chr(0x2800 + bits))
+                linhas.append(''.join(caracteres))
+        else:
+            # Meios-blocos: 1x2 pixels por caractere
+            simbolos = (' ', '▀', '▄', '█')
+            for linha in range(self.linhas_oled):
+                linhas.append(''.join(simbolos[pixel(x, 2 * linha) | (pixel(x, 2 * linha + 1) << 1)]
+                                      for x in range(self.colunas_oled)))
+        return linhas
+
+    def _linha_matriz(self, sim, y):
+        partes = []
+        for x in range(5):
+            r, g, b = sim.leds[y * 5 + x]
+            if r or g or b:
+                partes.append(f'\x1b[38;2;{_brilho(r)};{_brilho(g)};{_brilho(b)}m██')
+            else:
+                partes.append('\x1b[38;2;60;60;60m░░')
+        return ''.join(partes) + '\x1b[0m'
+
+    def desenhar(self, sim):
+        saida = []
+        saida.append('\x1b7\x1b[H')  # Guarda o cursor e vai ao topo
+        borda = '─' * self.colunas_oled
+        saida.append(f'┌{borda}┐   Matriz\x1b[K\n')
+        oled = self._linhas_oled(sim)
+        for i, linha in enumerate(oled):
+            direita = ''
+            if i < 5:
+                direita = '   ' + self._linha_matriz(sim, 4 - i)
+            saida.append(f'│{linha}│{direita}\x1b[K\n')
+        saida.append(f'└{borda}┘\x1b[K\n')
+        saida.append(f' Buzzer: {sim.descricao_buzzer()}   {sim.descricao_pwm()}\x1b[K\n')
+        saida.append(f' Controles: {sim.descricao_controles()}\x1b[K\n')
+        saida.append(' Teclas: z=A  x=B  setas/wasd=joystick  espaco=central  q=sair\x1b[K\n')
+        saida.append('\x1b8')        # Volta o cursor para a região de rolagem
+        sys.stdout.write(''.join(saida))
+        sys.stdout.flush()
+
+# === PNG ===
+try:
+    from zlib import compress as _comprimir, crc32 as _crc32
+except ImportError:
+    from binascii import crc32 as _crc32
+    _comprimir = None
+
+def _deflate_sem_compressao(dados):
+    """Fluxo zlib com blocos 'stored' (para portas sem compressão)"""
+    saida = bytearray(b'\x78\x01')
+    for inicio in range(0, len(dados), 65535):
+        bloco = dados[inicio:inicio + 65535]
+        final = 1 if inicio + 65535 >= len(dados) else 0
+        n = len(bloco)
+        saida += bytes((final, n & 0xFF, n >> 8, ~n & 0xFF, (~n >> 8) & 0xFF))
+        saida += bloco
+    a, b = 1, 0
+    for byte in dados:
+        a = (a + byte) % 65521
+        b = (b + a) % 65521
+    saida += ((b << 16) | a).to_bytes(4, 'big')
+    return bytes(saida)
+
+def gravar_png(caminho, largura, altura, rgb):
+    """Grava um PNG RGB de 8 bits a partir dos pixels linha a linha (3 bytes por pixel)"""
+    bruto = bytearray()
+    passo = largura * 3
+    for y in range(altura):
+        bruto.append(0)  # Filtro 'nenhum'
+        bruto += rgb[y * passo:(y + 1) * passo]
+    dados = _comprimir(bytes(bruto)) if _comprimir else _deflate_sem_compressao(bytes(bruto))
+
+    def bloco(tipo, conteudo):
+        return (len(conteudo).to_bytes(4, 'big') + tipo + conteudo +
+                (_crc32(tipo + conteudo) & 0xFFFFFFFF).to_bytes(4, 'big'))
+
+    cabecalho = (largura.to_bytes(4, 'big') + altura.to_bytes(4, 'big') +
+                 bytes((8, 2, 0, 0, 0)))
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(b'\x89PNG\r\n\x1a\n')
+        arquivo.write(bloco(b'IHDR', cabecalho))
+        arquivo.write(bloco(b'IDAT', dados))
+        arquivo.write(bloco(b'IEND', b''))
+
+class GravadorPNG:
+    """
+    Grava cada quadro como PNG: OLED ampliado 2x à esquerda e a matriz à
+    direita (quadro_00000.png, quadro_00001.png, ...)
+    """
+    ESCALA = 2
+    LED = 20          # Lado de um LED (pixels)
+    ESPACO = 4        # Espaço entre LEDs
+    MARGEM = 16
+    COR_OLED = (120, 210, 255)
+
+    def __init__(self, pasta):
+        self.pasta = pasta
+        self.quadros = 0
+        try:
+            import os
+            os.mkdir(pasta)
+        except OSError:
+            pass  # A pasta já existe
+
+    def gravar(self, sim):
+        largura_oled = sim.oled_largura * self.ESCALA
+        altura_oled = sim.oled_altura * self.ESCALA
+        lado_matriz = 5 * self.LED + 4 * self.ESPACO
+        largura = largura_oled + 2 * self.MARGEM + lado_matriz
+        altura = max(altura_oled, lado_matriz)
+        rgb = bytearray(largura * altura * 3)
+
+        # OLED
+        buf = sim.oled if sim.oled_ligado else None
+        if buf is not None:
+            cor = bytes(self.COR_OLED) * self.ESCALA
+            for y in range(sim.oled_altura):
+                linha = bytearray(largura_oled * 3)
+                pagina = (y >> 3) * sim.oled_largura
+                bit = 1 << (y & 7)
+                for x in range(sim.oled_largura):
+                    if buf[pagina + x] & bit:
+                        i = x * self.ESCALA * 3
+                        linha[i:i + len(cor)] = cor
+                for k in range(self.ESCALA):
+                    inicio = ((y * self.ESCALA + k) * largura) * 3
+                    rgb[inicio:inicio + len(linha)] = linha
+
+        # Matriz (linha de cima da imagem = y = 4)
+        x0 = largura_oled + self.MARGEM
+        y0 = (altura - lado_matriz) // 2
+        for y in range(5):
+            for x in range(5):
+                r, g, b = sim.leds[(4 - y) * 5 + x]
+                cor = bytes((_brilho(r), _brilho(g), _brilho(b))) if (r or g or b) else b'\x28\x28\x28'
+                trecho = cor * self.LED
+                px = x0 + x * (self.LED + self.ESPACO)
+                for py in range(y0 + y * (self.LED + self.ESPACO), y0 + y * (self.LED + self.ESPACO) + self.LED):
+                    inicio = (py * largura + px) * 3
+                    rgb[inicio:inicio + len(trecho)] = trecho
+
+        gravar_png(f'{self.pasta}/quadro_{self.quadros:05d}.png', largura, altura, rgb)
+        self.quadros += 1
+
+# === SIMULADOR ===
+class Simulador:
+    def __init__(self, painel=None, png=None, teclado=None, segurar_ms=SEGURAR_MS,
+                 segundos=None, log_buzzer=True):
+        self.painel = painel
+        self.png = png
+        self.teclado = teclado
+        self.segurar_ms = segurar_ms
+        self.log_buzzer = log_buzzer
+
+        self.leds = [(0, 0, 0)] * 25   # Por posição: índice y * 5 + x
+        self.oled = None
+        self.oled_largura = 128
+        self.oled_altura = 64
+        self.oled_ligado = True
+        self.escritas_matriz = 0
+        self.atualizacoes_oled = 0
+        self.quadros = 0
+
+        # Buzzer: tom atual (frequência, início) e total de tons tocados
+        self.tom = None
+        self.inicio_tom = 0
+        self.tons = 0
+        self.ultimo_tom = None
+        self.pwm = {}  # Outros PWMs (ex.: servos do braço robótico): pino -> (freq, duty)
+
+        # Controles pressionados: nome -> instante de soltar (None = até soltar())
+        self.pressionados = {}
+
+        self.inicio = utime.ticks_ms()
+        self.prazo = None if segundos is None else utime.ticks_add(self.inicio, int(segundos * 1000))
+        self.ultima_sondagem = None
+        self.ultimo_quadro = None
+        self.sujo = True
+
+    # === INSTALAÇÃO ===
+    def instalar(self):
+        global atual
+        atual = self
+        return self
+
+    def desinstalar(self):
+        global atual
+        if atual is self:
+            atual = None
+        if self.tom is not None:
+            self._fim_tom(utime.ticks_ms())
+        if self.teclado is not None:
+            self.teclado.restaurar()
+        if self.painel is not None:
+            self.painel.desenhar(self)
+            self.painel.fechar()
+
+    # === CONTROLES ===
+    def pressionar(self, controle, duracao_ms=None):
+        """Pressiona um controle (ver CONTROLES) por duracao_ms, ou até soltar() se None"""
+        import machine
+        tipo = CONTROLES[controle]
+        if tipo[0] == 'pino':
+            machine.Pin.definir_nivel(tipo[1], 0)
+        else:
+            machine.ADC.definir_valor(tipo[1], tipo[2])
+        self.pressionados[controle] = None if duracao_ms is None else utime.ticks_add(utime.ticks_ms(), duracao_ms)
+        self.sujo = True
+
+    def soltar(self, controle):
+        import machine
+        if controle not in self.pressionados:
+            return
+        del self.pressionados[controle]
+        tipo = CONTROLES[controle]
+        if tipo[0] == 'pino':
+            machine.Pin.definir_nivel(tipo[1], 1)
+        else:
+            # Só volta ao centro se a direção oposta do mesmo eixo não está pressionada
+            for outro, prazo in self.pressionados.items():
+                if CONTROLES[outro][0] == 'adc' and CONTROLES[outro][1] == tipo[1]:
+                    return
+            machine.ADC.definir_valor(tipo[1], ADC_CENTRO)
+        self.sujo = True
+
+    def _tecla(self, tecla):
+        controle = TECLAS.get(tecla)
+        if controle == 'sair':
+            raise Encerrar(0)
+        if controle is None:
+            return
+        if controle in ('cima', 'baixo', 'esq', 'dir'):
+            # Uma direção nova substitui a anterior (o joystick aponta para um lado só)
+            for outro in ('cima', 'baixo', 'esq', 'dir'):
+                if outro != controle:
+                    self.soltar(outro)
+        self.pressionar(controle, self.segurar_ms)
+
+    def sondar(self):
+        """Lê o teclado, solta controles vencidos e desenha se preciso (no máximo uma vez por ms)"""
+        agora = utime.ticks_ms()
+        if agora == self.ultima_sondagem:
+            return
+        self.ultima_sondagem = agora
+        if self.prazo is not None and utime.ticks_diff(agora, self.prazo) >= 0:
+            raise Encerrar(0)
+        if self.teclado is not None:
+            for tecla in self.teclado.ler():
+                self._tecla(tecla)
+        if self.pressionados:
+            for controle, prazo in list(self.pressionados.items()):
+                if prazo is not None and utime.ticks_diff(agora, prazo) >= 0:
+                    self.soltar(controle)
+        self._desenhar(agora)
+
+    def limitar_espera_ns(self, ns):
+        """Espera máxima no relógio virtual; a reprodução de trilhas (trilha.py) para em cada entrada"""
+        return ns
+
+    def _desenhar(self, agora):
+        if not self.sujo or (self.painel is None and self.png is None):
+            return
+        if self.ultimo_quadro is not None and utime.ticks_diff(agora, self.ultimo_quadro) < QUADRO_MS:
+            return
+        self.ultimo_quadro = agora
+        self.sujo = False
+        self.quadros += 1
+        if self.painel is not None:
+            self.painel.desenhar(self)
+        if self.png is not None:
+            self.png.gravar(self)
+
+    # === PERIFÉRICOS ===
+    def matriz_escrita(self, np):
+        """Quadro enviado pela matriz (o NeoPixel de 25 LEDs do pino 7)"""
+        if getattr(np.pin, 'id', np.pin) != PINO_MATRIZ or np.n != 25:
+            return
+        leds = self.leds
+        for i in range(25):
+            x, y = POSICAO_LED[i]
+            leds[y * 5 + x] = np.buf[i][:3]
+        self.escritas_matriz += 1
+        self.sujo = True
+        self.sondar()
+
+    def oled_mostrado(self, oled):
+        self.oled = bytes(oled.buffer)
+        if oled.invertido:
+            self.oled = bytes(~b & 0xFF for b in self.oled)
+        self.oled_largura = oled.width
+        self.oled_altura = oled.height
+        self.oled_ligado = oled.ligado
+        self.atualizacoes_oled += 1
+        self.sujo = True
+        self.sondar()
+
+    def pwm_alterado(self, pwm):
+        pino = getattr(pwm.pin, 'id', pwm.pin)
+        freq = pwm.freq()
+        duty = pwm.duty_u16()
+        if pino != PINO_BUZZER:
+            if self.pwm.get(pino) != (freq, duty):
+                self.pwm[pino] = (freq, duty)
+                self.sujo = True
+            return
+        tom = freq if duty and freq else None
+        if tom == self.tom:
+            return
+        agora = utime.ticks_ms()
+        if self.tom is not None:
+            self._fim_tom(agora)
+        self.tom = tom
+        self.inicio_tom = agora
+        self.sujo = True
+
+    def _fim_tom(self, agora):
+        duracao = utime.ticks_diff(agora, self.inicio_tom)
+        self.tons += 1
+        self.ultimo_tom = (self.tom, duracao)
+        if self.log_buzzer and duracao > 0:  # Liga/desliga no mesmo ms: inaudível, só conta
+            instante = utime.ticks_diff(self.inicio_tom, self.inicio)
+            print(f"[BUZZER] {instante / 1000:8.3f} s  {self.tom} Hz  {duracao} ms")
+        self.tom = None
+
+    # === DESCRIÇÕES (painel) ===
+    def descricao_buzzer(self):
+        if self.tom is not None:
+            texto = f"{self.tom} Hz (tocando)"
+        elif self.ultimo_tom is not None:
+            texto = f"ultimo {self.ultimo_tom[0]} Hz / {self.ultimo_tom[1]} ms"
+        else:
+            texto = "mudo"
+        return f"{texto}, {self.tons} tons"
+
+    def descricao_pwm(self):
+        if not self.pwm:
+            return ""
+        return "PWM: " + "  ".join(f"p{p}={duty}" for p, (freq, duty) in sorted(self.pwm.items()))
+
+    def descricao_controles(self):
+        if not self.pressionados:
+            return "-"
+        return " ".join(sorted(self.pressionados))
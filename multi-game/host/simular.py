@@ -0,0 +1,164 @@
+# simular.py
+# Roda um programa da BitDogLab sem modificações no host, com os periféricos
+# simulados (ver simulador.py)
+#
+# Uso:
+#   cd multi-game && python host/simular.py                    # roda main.py
+#   cd multi-game && python host/simular.py --png quadros --segundos 20
+#   cd braco-robotico && python ../multi-game/host/simular.py main.py
+#
+# Opções:
+#   --png PASTA        grava cada quadro (OLED + matriz) como PNG na pasta
+#   --sem-painel       não desenha no terminal (só as mensagens e o log do buzzer)
+#   --oled MODO        braille (64x16 caracteres, padrão) ou blocos (128x32)
+#   --perfil NOME      movimento do MPU-6050 emulado (ver rodar_sensor.py) ou
+#                      'nenhum' para rodar sem o sensor
+#   --segundos N       encerra a simulação após N segundos
+#   --semente S        semente do urandom (partidas repetíveis)
+#   --segurar MS       quanto tempo um toque de tecla mantém o controle pressionado
+#   --raiz PASTA       pasta do projeto (pasta atual e de importação); padrão:
+#                      a do programa (ex.: --raiz . para bench/bench_componentes.py)
+#   --virtual          relógio virtual (ver utime.py): as esperas não levam tempo
+#                      real; use com --segundos (tempo simulado) e sem teclado
+#
+# Funciona com CPython e com a porta Unix do MicroPython (micropython host/simular.py).
+
+import os
+import sys
+
+_AQUI = os.path.dirname(os.path.abspath(__file__))
+
+def _uso():
+    print("Uso: simular.py [programa.py] [--png pasta] [--sem-painel] [--oled braille|blocos]")
+    print("                [--perfil nome|nenhum] [--segundos N] [--semente S] [--segurar MS] [--virtual]")
+    print("                [--raiz pasta]")
+
+def separar(programa, raiz=None):
+    """(raiz, arquivo): a pasta do projeto (--raiz ou a do programa) e o programa relativo a ela"""
+    if raiz is None:
+        return os.path.split(programa)
+    return raiz, os.path.relpath(programa, raiz)
+
+def preparar(raiz):
+    """
+    A pasta do projeto vira a pasta atual: arquivos relativos, como musicas/
+    e o placar, ficam onde o firmware espera; os substitutos do host vêm
+    antes dela no caminho de importação
+    """
+    if raiz:
+        os.chdir(raiz)
+    sys.path.insert(0, '.')
+    sys.path.insert(0, _AQUI)
+
+def executar(arquivo, sim):
+    """Roda o programa com o simulador instalado até ele terminar, a tecla q ou o prazo"""
+    import simulador
+    sim.instalar()
+    with open(arquivo) as f:
+        codigo = f.read()
+    codigo = compile(codigo, arquivo, 'exec')
+    try:
+        exec(codigo, {'__name__': '__main__', '__file__': arquivo})
+    except simulador.Encerrar:
+        pass
+    except KeyboardInterrupt:
+        print("Interrompido")
+    finally:
+        sim.desinstalar()
+
+def main(argv):
+    programa = 'main.py'
+    png = None
+    painel = True
+    modo_oled = 'braille'
+    perfil = 'parado'
+    segundos = None
+    semente = None
+    segurar_ms = None
+    virtual = False
+    raiz = None
+    i = 0
+    try:
+        while i < len(argv):
+            opcao = argv[i]
+            if opcao == '--png':
+                png = argv[i + 1]
+                i += 2
+            elif opcao == '--sem-painel':
+                painel = False
+                i += 1
+            elif opcao == '--oled':
+                modo_oled = argv[i + 1]
+                i += 2
+            elif opcao == '--perfil':
+                perfil = argv[i + 1]
+                i += 2
+            elif opcao == '--segundos':
+                segundos = float(argv[i + 1])
+                i += 2
+            elif opcao == '--semente':
+                semente = int(argv[i + 1])
+                i += 2
+            elif opcao == '--segurar':
+                segurar_ms = int(argv[i + 1])
+                i += 2
+            elif opcao == '--raiz':
+                raiz = argv[i + 1]
+                i += 2
+            elif opcao == '--virtual':
+                virtual = True
+                i += 1
+            elif opcao.startswith('--'):
+                print(f"Argumento desconhecido: {opcao}")
+                _uso()
+                return 1
+            else:
+                programa = opcao
+                i += 1
+    except (IndexError, ValueError):
+        _uso()
+        return 1
+    if modo_oled not in ('braille', 'blocos'):
+        _uso()
+        return 1
+
+    raiz, arquivo = separar(programa, raiz)
+    preparar(raiz)
+
+    import simulador
+    import urandom
+    import utime
+    from utime import ticks_ms, ticks_diff
+    if virtual:
+        utime.usar_relogio(utime.RelogioVirtual())
+    if semente is not None:
+        urandom.seed(semente)
+
+    if perfil != 'nenhum':
+        import mpu6050_emulado
+        mpu6050_emulado.conectar(mpu6050_emulado.perfil_por_nome(perfil))
+
+    # No relógio virtual o tempo não segue o de quem digita
+    interativo = sys.stdin.isatty() and not virtual
+    terminal = painel and sys.stdout.isatty()
+    sim = simulador.Simulador(
+        painel=simulador.Painel(modo_oled) if terminal else None,
+        png=simulador.GravadorPNG(png) if png else None,
+        teclado=simulador.Teclado() if interativo else None,
+        segurar_ms=segurar_ms if segurar_ms is not None else simulador.SEGURAR_MS,
+        segundos=segundos)
+    executar(arquivo, sim)
+
+    duracao = ticks_diff(ticks_ms(), sim.inicio)
+    print("=== Simulacao ===")
+    print(f"Programa: {programa}")
+    print(f"Duracao: {duracao} ms")
+    print(f"Escritas na matriz: {sim.escritas_matriz}")
+    print(f"Atualizacoes do OLED: {sim.atualizacoes_oled}")
+    print(f"Tons do buzzer: {sim.tons}")
+    if png:
+        print(f"Quadros PNG: {sim.png.quadros} em {png}/")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
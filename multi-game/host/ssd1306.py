@@ -0,0 +1,58 @@
+# ssd1306.py
+# Substituto do driver ssd1306 do MicroPython para execução no host
+#
+# Mesma interface do driver (um FrameBuffer MONO_VLSB com show(), poweroff(),
+# contrast()...); em vez de enviar o buffer pelo I2C, show() o entrega ao
+# simulador, que desenha o OLED no terminal ou em PNG.
+
+import framebuf
+import simulador
+
+class SSD1306(framebuf.FrameBuffer):
+    def __init__(self, width, height, external_vcc=False):
+        self.width = width
+        self.height = height
+        self.external_vcc = external_vcc
+        self.pages = height // 8
+        self.buffer = bytearray(self.pages * width)
+        super().__init__(self.buffer, width, height, framebuf.MONO_VLSB)
+        self.ligado = True
+        self.contraste = 255
+        self.invertido = False
+        self.init_display()
+
+    def init_display(self):
+        self.fill(0)
+        self.show()
+
+    def poweroff(self):
+        self.ligado = False
+        simulador.oled_mostrado(self)
+
+    def poweron(self):
+        self.ligado = True
+        simulador.oled_mostrado(self)
+
+    def contrast(self, contrast):
+        self.contraste = contrast
+
+    def invert(self, invert):
+        self.invertido = bool(invert)
+        simulador.oled_mostrado(self)
+
+    def rotate(self, rotate):
+        pass
+
+    def show(self):
+        simulador.oled_mostrado(self)
+
+class SSD1306_I2C(SSD1306):
+    def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False):
+        self.i2c = i2c
+        self.addr = addr
+        super().__init__(width, height, external_vcc)
+
+class SSD1306_SPI(SSD1306):
+    def __init__(self, width, height, spi, dc, res, cs, external_vcc=False):
+        self.spi = spi
+        super().__init__(width, height, external_vcc)
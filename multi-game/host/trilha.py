@@ -0,0 +1,580 @@
+# trilha.py
+# Gravação e reprodução determinística de sessões no simulador da placa
+#
+# Uma sessão jogada no simulador (ver simular.py) é gravada em uma trilha
+# binária: os apertos e solturas dos controles com o instante de cada um, as
+# amostras do MPU-6050 emulado e a semente do urandom. A reprodução roda o
+# mesmo programa no relógio virtual (ver utime.py), sem teclado, aplicando as
+# entradas nos mesmos instantes: os quadros (matriz, OLED e buzzer) saem
+# idênticos a cada execução, e a trilha vira um teste de ponta a ponta de
+# uma etapa.
+#
+# Uso (a partir da pasta do projeto):
+#   python host/trilha.py gravar sessoes/reacao.bdt                # joga main.py; q encerra
+#   python host/trilha.py reproduzir sessoes/reacao.bdt --fixar    # guarda os quadros como referência
+#   python host/trilha.py reproduzir sessoes/reacao.bdt            # compara com a referência
+#
+# Opções de gravar: [programa.py] --raiz, --perfil, --semente, --segundos,
+# --segurar, --oled e --sem-painel, como no simular.py (a semente padrão é
+# sorteada e guardada na trilha).
+# Opções de reproduzir: --raiz PASTA, --fixar, --png PASTA (quadros em PNG)
+# e --quadros ARQUIVO.csv (um quadro por linha: instante, saída, crc, CPU).
+#
+# A reprodução informa o tempo de CPU do host gasto entre dois quadros (sem
+# o desenho, já que o relógio virtual não espera) e a latência, em tempo
+# simulado, de cada borda de um controle até a primeira mudança na matriz,
+# no OLED e no buzzer. Havendo referência na trilha, o primeiro quadro
+# diferente é informado e o código de saída é 1.
+#
+# As duas execuções rodam em uma cópia temporária do projeto que tem só os
+# .py na raiz: o que o firmware grava ali (placar, calibração, traces)
+# começa sempre ausente, como em uma placa recém-gravada, e é descartado.
+#
+# Formato (little-endian; varint = inteiro sem sinal em base 128, LEB128):
+#   cabeçalho: b'BDLT', versão (u8), flags (u8, bit 0 = sensor conectado),
+#              semente (u32), duração (varint, us), programa (varint + UTF-8)
+#   entradas:  quantidade (varint); cada uma: delta_us (varint) e código (u8):
+#              índice em CONTROLES_TRILHA, bit 7 = soltura
+#   sensor:    quantidade (varint); cada amostra: delta_us (varint) e 7 x i16
+#              (accel em 1/8192 g, temperatura em 1/100 °C, gyro em 1/64 °/s)
+#   quadros:   quantidade (varint, 0 = sem referência); cada um: delta_us
+#              (varint) e crc32 do estado das saídas (u32)
+# O tempo das entradas e dos quadros conta do início da simulação; o das
+# amostras, da criação do MPU-6050 emulado (o tempo do perfil de movimento).
+#
+# Só CPython (usa os, shutil, tempfile e zlib).
+
+import bisect
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from time import perf_counter_ns
+from zlib import crc32
+
+import simular
+import simulador
+import utime
+
+MAGICO = b'BDLT'
+VERSAO = 1
+FORMATO_CABECALHO = '<4sBBI'
+FORMATO_AMOSTRA = '<7h'
+FLAG_SENSOR = 0x01
+SOLTURA = 0x80
+
+# Ordem fixa dos controles no arquivo (nomes de simulador.CONTROLES)
+CONTROLES_TRILHA = ('A', 'B', 'central', 'cima', 'baixo', 'esq', 'dir')
+
+# Resolução das amostras: ±4 g, ±327 °C e ±512 °/s em 16 bits
+ESCALA_ACCEL = 8192
+ESCALA_TEMP = 100
+ESCALA_GYRO = 64
+
+SAIDAS = ('matriz', 'oled', 'buzzer')
+
+# === FORMATO ===
+def _escrever_varint(saida, valor):
+    while valor >= 0x80:
+        saida.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    saida.append(valor)
+
+def _ler_varint(dados, pos):
+    valor = 0
+    deslocamento = 0
+    while True:
+        byte = dados[pos]
+        pos += 1
+        valor |= (byte & 0x7F) << deslocamento
+        if byte < 0x80:
+            return valor, pos
+        deslocamento += 7
+
+def _saturar(valor):
+    valor = int(round(valor))
+    return max(-32768, min(32767, valor))
+
+def quantizar(amostra):
+    """(ax, ay, az, temp, gx, gy, gz) do perfil -> 7 inteiros de 16 bits"""
+    ax, ay, az, temp, gx, gy, gz = amostra
+    return (_saturar(ax * ESCALA_ACCEL), _saturar(ay * ESCALA_ACCEL), _saturar(az * ESCALA_ACCEL),
+            _saturar(temp * ESCALA_TEMP),
+            _saturar(gx * ESCALA_GYRO), _saturar(gy * ESCALA_GYRO), _saturar(gz * ESCALA_GYRO))
+
+def desquantizar(raw):
+    return (raw[0] / ESCALA_ACCEL, raw[1] / ESCALA_ACCEL, raw[2] / ESCALA_ACCEL,
+            raw[3] / ESCALA_TEMP,
+            raw[4] / ESCALA_GYRO, raw[5] / ESCALA_GYRO, raw[6] / ESCALA_GYRO)
+
+class Trilha:
+    def __init__(self, programa, semente, sensor):
+        self.programa = programa  # Relativo à pasta do projeto
+        self.semente = semente
+        self.sensor = sensor      # MPU-6050 emulado conectado
+        self.duracao_us = 0
+        self.entradas = []        # (t_us, controle, pressionado)
+        self.amostras = []        # (t_us, raw)
+        self.quadros = None       # Referência: (t_us, crc32), ou None
+
+    def salvar(self, caminho):
+        # O perfil pode ser consultado fora de ordem (ex.: referência do detector de movimento)
+        amostras = []
+        for t, raw in sorted(self.amostras, key=lambda amostra: amostra[0]):
+            if not amostras or amostras[-1][1] != raw:
+                amostras.append((t, raw))
+        self.amostras = amostras
+
+        dados = bytearray(struct.pack(FORMATO_CABECALHO, MAGICO, VERSAO,
+                                      FLAG_SENSOR if self.sensor else 0, self.semente))
+        _escrever_varint(dados, self.duracao_us)
+        nome = self.programa.encode()
+        _escrever_varint(dados, len(nome))
+        dados += nome
+
+        _escrever_varint(dados, len(self.entradas))
+        anterior = 0
+        for t, controle, pressionado in self.entradas:
+            _escrever_varint(dados, t - anterior)
+            dados.append(CONTROLES_TRILHA.index(controle) | (0 if pressionado else SOLTURA))
+            anterior = t
+
+        _escrever_varint(dados, len(amostras))
+        anterior = 0
+        for t, raw in amostras:
+            _escrever_varint(dados, max(0, t - anterior))
+            dados += struct.pack(FORMATO_AMOSTRA, *raw)
+            anterior = t
+
+        quadros = self.quadros or []
+        _escrever_varint(dados, len(quadros))
+        anterior = 0
+        for t, crc in quadros:
+            _escrever_varint(dados, t - anterior)
+            dados += struct.pack('<I', crc)
+            anterior = t
+
+        with open(caminho, 'wb') as arquivo:
+            arquivo.write(dados)
+
+def carregar(caminho):
+    """Lê uma trilha gravada por Trilha.salvar()"""
+    with open(caminho, 'rb') as arquivo:
+        dados = arquivo.read()
+    tamanho = struct.calcsize(FORMATO_CABECALHO)
+    magico, versao, flags, semente = struct.unpack_from(FORMATO_CABECALHO, dados)
+    if magico != MAGICO:
+        raise ValueError(f"Não é uma trilha: {caminho}")
+    if versao != VERSAO:
+        raise ValueError(f"Versão de trilha não suportada: {versao}")
+    pos = tamanho
+    duracao, pos = _ler_varint(dados, pos)
+    n, pos = _ler_varint(dados, pos)
+    programa = bytes(dados[pos:pos + n]).decode()
+    pos += n
+    trilha = Trilha(programa, semente, bool(flags & FLAG_SENSOR))
+    trilha.duracao_us = duracao
+
+    n, pos = _ler_varint(dados, pos)
+    t = 0
+    for _ in range(n):
+        delta, pos = _ler_varint(dados, pos)
+        t += delta
+        codigo = dados[pos]
+        pos += 1
+        trilha.entradas.append((t, CONTROLES_TRILHA[codigo & ~SOLTURA], not codigo & SOLTURA))
+
+    n, pos = _ler_varint(dados, pos)
+    t = 0
+    passo = struct.calcsize(FORMATO_AMOSTRA)
+    for _ in range(n):
+        delta, pos = _ler_varint(dados, pos)
+        t += delta
+        trilha.amostras.append((t, struct.unpack_from(FORMATO_AMOSTRA, dados, pos)))
+        pos += passo
+
+    n, pos = _ler_varint(dados, pos)
+    if n:
+        trilha.quadros = []
+        t = 0
+        for _ in range(n):
+            delta, pos = _ler_varint(dados, pos)
+            t += delta
+            trilha.quadros.append((t, struct.unpack_from('<I', dados, pos)[0]))
+            pos += 4
+    return trilha
+
+# === SENSOR ===
+def perfil_gravado(base, trilha):
+    """Perfil que repassa o 'base' já na resolução da trilha e guarda cada amostra nova"""
+    def perfil(t):
+        raw = quantizar(base(t))
+        amostras = trilha.amostras
+        if not amostras or amostras[-1][1] != raw:
+            amostras.append((int(t * 1000000), raw))
+        return desquantizar(raw)
+    return perfil
+
+def perfil_reproduzido(amostras):
+    """Perfil que devolve a última amostra gravada até o instante t"""
+    tempos = [t / 1000000 for t, _ in amostras]
+    valores = [desquantizar(raw) for _, raw in amostras] or [(0.0, 0.0, 1.0, 25.0, 0.0, 0.0, 0.0)]
+
+    def perfil(t):
+        return valores[max(0, bisect.bisect_right(tempos, t) - 1)]
+    return perfil
+
+# === SIMULADORES ===
+class _SimuladorTrilha(simulador.Simulador):
+    def __init__(self, trilha, **opcoes):
+        super().__init__(**opcoes)
+        self.trilha = trilha
+        self.t0_ns = utime.relogio_atual().agora_ns()
+
+    def agora_us(self):
+        """Microssegundos desde o início da simulação (sem custo de leitura no relógio virtual)"""
+        return (utime.relogio_atual().agora_ns() - self.t0_ns) // 1000
+
+class SimuladorGravacao(_SimuladorTrilha):
+    """Simulador interativo que anota cada borda dos controles na trilha"""
+    def pressionar(self, controle, duracao_ms=None):
+        if controle not in self.pressionados:
+            self.trilha.entradas.append((self.agora_us(), controle, True))
+        super().pressionar(controle, duracao_ms)
+
+    def soltar(self, controle):
+        if controle in self.pressionados:
+            self.trilha.entradas.append((self.agora_us(), controle, False))
+        super().soltar(controle)
+
+class SimuladorReproducao(_SimuladorTrilha):
+    """
+    Aplica as entradas da trilha nos instantes gravados e registra cada
+    quadro (escrita da matriz, atualização do OLED, mudança do buzzer) com
+    o crc32 do estado das saídas e o tempo de CPU gasto desde o anterior
+    """
+    def __init__(self, trilha, **opcoes):
+        super().__init__(trilha, segundos=trilha.duracao_us / 1000000, **opcoes)
+        self.proxima = 0          # Próxima entrada da trilha
+        self.saidas = []          # (t_us, saida, crc32 do estado)
+        self.cpu_ns = []          # CPU entre quadros da matriz/OLED
+        self.pendentes = []       # Bordas aguardando resposta: (t_us, controle, pressionado, estados, latências)
+        self.respostas = []       # (controle, pressionado, {saida: latência_us})
+        self.estado_buzzer = self._estado('buzzer')
+        self.t_cpu = perf_counter_ns()
+
+    def _estado(self, saida):
+        if saida == 'matriz':
+            dados = bytearray()
+            for cor in self.leds:
+                dados.extend(cor)
+            return crc32(dados)
+        if saida == 'oled':
+            return crc32(self.oled or b'', 1 if self.oled_ligado else 0)
+        return crc32(repr((self.tom, sorted(self.pwm.items()))).encode())
+
+    # === ENTRADAS ===
+    def sondar(self):
+        entradas = self.trilha.entradas
+        if self.proxima < len(entradas):
+            agora = self.agora_us()
+            while self.proxima < len(entradas) and entradas[self.proxima][0] <= agora:
+                t, controle, pressionado = entradas[self.proxima]
+                self.proxima += 1
+                self._borda(t, controle, pressionado)
+        super().sondar()
+
+    def _borda(self, t, controle, pressionado):
+        # Uma resposta só conta para a borda mais recente
+        self._encerrar_pendentes()
+        estados = {saida: self._estado(saida) for saida in SAIDAS}
+        self.pendentes.append((t, controle, pressionado, estados, {}))
+        if pressionado:
+            simulador.Simulador.pressionar(self, controle, None)
+        else:
+            simulador.Simulador.soltar(self, controle)
+
+    def _encerrar_pendentes(self):
+        for t, controle, pressionado, estados, latencias in self.pendentes:
+            self.respostas.append((controle, pressionado, latencias))
+        self.pendentes = []
+
+    def limitar_espera_ns(self, ns):
+        entradas = self.trilha.entradas
+        if self.proxima < len(entradas):
+            falta = entradas[self.proxima][0] * 1000 - (utime.relogio_atual().agora_ns() - self.t0_ns)
+            return max(0, min(ns, falta))
+        return ns
+
+    # === SAÍDAS ===
+    def _quadro(self, saida):
+        fim = perf_counter_ns()
+        t = self.agora_us()
+        estado = self._estado(saida)
+        self.saidas.append((t, saida, estado))
+        if saida != 'buzzer':
+            self.cpu_ns.append(fim - self.t_cpu)
+        for t_borda, _, _, estados, latencias in self.pendentes:
+            if saida not in latencias and estado != estados[saida]:
+                latencias[saida] = t - t_borda
+        self.t_cpu = perf_counter_ns()
+
+    def matriz_escrita(self, np):
+        escritas = self.escritas_matriz
+        super().matriz_escrita(np)
+        if self.escritas_matriz != escritas:
+            self._quadro('matriz')
+
+    def oled_mostrado(self, oled):
+        super().oled_mostrado(oled)
+        self._quadro('oled')
+
+    def pwm_alterado(self, pwm):
+        super().pwm_alterado(pwm)
+        estado = self._estado('buzzer')
+        if estado != self.estado_buzzer:
+            self.estado_buzzer = estado
+            self._quadro('buzzer')
+
+    def quadros_referencia(self):
+        """(t_us, crc32) de cada quadro: o estado das três saídas juntas"""
+        estados = {saida: 0 for saida in SAIDAS}
+        quadros = []
+        for t, saida, estado in self.saidas:
+            estados[saida] = estado
+            quadros.append((t, crc32(struct.pack('<III', estados['matriz'], estados['oled'], estados['buzzer']))))
+        return quadros
+
+# === EXECUÇÃO ===
+def _copia_limpa(raiz):
+    """Cópia temporária do projeto com só os .py na raiz (sem placar, calibração...)"""
+    destino = tempfile.mkdtemp(prefix='trilha_')
+    origem = raiz or '.'
+    for nome in os.listdir(origem):
+        caminho = os.path.join(origem, nome)
+        if nome.startswith('.') or nome == '__pycache__':
+            continue
+        if os.path.isdir(caminho):
+            shutil.copytree(caminho, os.path.join(destino, nome),
+                            ignore=shutil.ignore_patterns('__pycache__'))
+        elif nome.endswith('.py'):
+            shutil.copy2(caminho, destino)
+    return destino
+
+def _descartar_firmware(raiz):
+    """Tira de sys.modules os módulos do projeto já importados (os de host/ ficam)"""
+    pasta = os.path.abspath(raiz or '.') + os.sep
+    host = simular._AQUI + os.sep
+    for nome, modulo in list(sys.modules.items()):
+        arquivo = getattr(modulo, '__file__', None)
+        if arquivo and os.path.abspath(arquivo).startswith(pasta) \
+                and not os.path.abspath(arquivo).startswith(host):
+            del sys.modules[nome]
+
+def _rodar(raiz, arquivo, criar_sim, perfil):
+    """
+    Roda o programa na cópia limpa do projeto; retorna o simulador
+    O firmware é importado da cópia a cada execução e descartado no fim:
+    duas reproduções no mesmo processo partem do mesmo estado
+    """
+    pasta_original = os.getcwd()
+    modulos = dict(sys.modules)
+    caminho = list(sys.path)
+    _descartar_firmware(raiz)
+    copia = _copia_limpa(raiz)
+    try:
+        simular.preparar(copia)
+        sim = criar_sim()
+        if perfil is not None:
+            import mpu6050_emulado
+            mpu6050_emulado.conectar(perfil())
+        simular.executar(arquivo, sim)
+        return sim
+    finally:
+        os.chdir(pasta_original)
+        shutil.rmtree(copia, ignore_errors=True)
+        for nome in list(sys.modules):
+            if nome not in modulos:
+                del sys.modules[nome]
+        sys.modules.update(modulos)
+        sys.path[:] = caminho
+
+def _opcoes(argv, nomes, bandeiras=()):
+    """Separa posicionais, opções com valor (nomes) e opções sem valor (bandeiras)"""
+    posicionais = []
+    opcoes = {}
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in bandeiras:
+            opcoes[arg] = True
+            i += 1
+        elif arg in nomes:
+            if i + 1 >= len(argv):
+                raise ValueError(f"falta o valor de {arg}")
+            opcoes[arg] = argv[i + 1]
+            i += 2
+        elif arg.startswith('--'):
+            raise ValueError(f"argumento desconhecido: {arg}")
+        else:
+            posicionais.append(arg)
+            i += 1
+    return posicionais, opcoes
+
+def gravar(argv):
+    posicionais, opcoes = _opcoes(argv, ('--raiz', '--perfil', '--semente', '--segundos', '--segurar', '--oled'),
+                                  ('--sem-painel',))
+    if not 1 <= len(posicionais) <= 2:
+        raise ValueError("gravar espera a trilha e, opcionalmente, o programa")
+    caminho = os.path.abspath(posicionais[0])
+    programa = posicionais[1] if len(posicionais) > 1 else 'main.py'
+    raiz, arquivo = simular.separar(programa, opcoes.get('--raiz'))
+    nome_perfil = opcoes.get('--perfil', 'parado')
+    if nome_perfil.startswith('trace:'):
+        nome_perfil = 'trace:' + os.path.abspath(nome_perfil[len('trace:'):])
+    semente = int(opcoes['--semente']) if '--semente' in opcoes else int.from_bytes(os.urandom(4), 'little')
+    segundos = float(opcoes['--segundos']) if '--segundos' in opcoes else None
+    segurar_ms = int(opcoes.get('--segurar', simulador.SEGURAR_MS))
+    modo_oled = opcoes.get('--oled', 'braille')
+    if not sys.stdin.isatty():
+        print("A gravação é interativa: rode em um terminal")
+        return 1
+
+    trilha = Trilha(arquivo, semente, nome_perfil != 'nenhum')
+
+    def criar_sim():
+        import urandom
+        urandom.seed(semente)
+        terminal = '--sem-painel' not in opcoes and sys.stdout.isatty()
+        return SimuladorGravacao(trilha,
+                                 painel=simulador.Painel(modo_oled) if terminal else None,
+                                 teclado=simulador.Teclado(),
+                                 segurar_ms=segurar_ms, segundos=segundos)
+
+    def perfil():
+        import mpu6050_emulado
+        return perfil_gravado(mpu6050_emulado.perfil_por_nome(nome_perfil), trilha)
+
+    sim = _rodar(raiz, arquivo, criar_sim, perfil if trilha.sensor else None)
+    trilha.duracao_us = sim.agora_us()
+    trilha.salvar(caminho)
+    print("=== Gravacao ===")
+    print(f"Trilha: {posicionais[0]} ({os.path.getsize(caminho)} bytes)")
+    print(f"Programa: {arquivo}   Semente: {semente}")
+    print(f"Duracao: {trilha.duracao_us // 1000} ms")
+    print(f"Entradas: {len(trilha.entradas)}   Amostras do sensor: {len(trilha.amostras)}")
+    return 0
+
+def _percentil(valores, p):
+    return valores[int(p * (len(valores) - 1))]
+
+def _relatorio_latencias(respostas):
+    grupos = {}
+    for controle, pressionado, latencias in respostas:
+        grupos.setdefault((controle, pressionado), []).append(latencias)
+    print("Latencia entrada -> saida (ms simulados; mediana / maximo):")
+    if not grupos:
+        print("  (sem entradas)")
+    for controle in CONTROLES_TRILHA:
+        for pressionado in (True, False):
+            bordas = grupos.get((controle, pressionado))
+            if not bordas:
+                continue
+            partes = []
+            for saida in SAIDAS:
+                valores = sorted(l[saida] for l in bordas if saida in l)
+                if valores:
+                    partes.append(f"{saida} {_percentil(valores, 0.5) / 1000:.1f} / {valores[-1] / 1000:.1f} (n={len(valores)})")
+            sem_resposta = sum(1 for l in bordas if not l)
+            borda = "aperto" if pressionado else "soltura"
+            descricao = "  ".join(partes) if partes else "-"
+            print(f"  {controle:<7} {borda:<7} x{len(bordas):<3} {descricao}   sem resposta: {sem_resposta}")
+
+def reproduzir(argv):
+    posicionais, opcoes = _opcoes(argv, ('--raiz', '--png', '--quadros'), ('--fixar',))
+    if len(posicionais) != 1:
+        raise ValueError("reproduzir espera só a trilha")
+    caminho = os.path.abspath(posicionais[0])
+    trilha = carregar(caminho)
+    png = os.path.abspath(opcoes['--png']) if '--png' in opcoes else None
+    csv = os.path.abspath(opcoes['--quadros']) if '--quadros' in opcoes else None
+
+    def criar_sim():
+        import urandom
+        utime.usar_relogio(utime.RelogioVirtual())
+        urandom.seed(trilha.semente)
+        return SimuladorReproducao(trilha, png=simulador.GravadorPNG(png) if png else None,
+                                   log_buzzer=False)
+
+    def perfil():
+        return perfil_reproduzido(trilha.amostras)
+
+    inicio = perf_counter_ns()
+    sim = _rodar(opcoes.get('--raiz', ''), trilha.programa, criar_sim, perfil if trilha.sensor else None)
+    real_s = (perf_counter_ns() - inicio) / 1000000000
+    sim._encerrar_pendentes()
+    quadros = sim.quadros_referencia()
+
+    if csv:
+        with open(csv, 'w') as arquivo:
+            arquivo.write("t_us,saida,crc32,cpu_us\n")
+            cpu = iter(sim.cpu_ns)
+            for (t, saida, _), (_, crc) in zip(sim.saidas, quadros):
+                cpu_us = '' if saida == 'buzzer' else f"{next(cpu) / 1000:.1f}"
+                arquivo.write(f"{t},{saida},{crc:08x},{cpu_us}\n")
+
+    contagem = {saida: 0 for saida in SAIDAS}
+    for _, saida, _ in sim.saidas:
+        contagem[saida] += 1
+    assinatura = crc32(b''.join(struct.pack('<QI', t, crc) for t, crc in quadros))
+    print("=== Reproducao ===")
+    print(f"Trilha: {posicionais[0]}   Programa: {trilha.programa}   Semente: {trilha.semente}")
+    print(f"Duracao simulada: {trilha.duracao_us // 1000} ms   Tempo real: {real_s:.2f} s")
+    print(f"Entradas: {len(trilha.entradas)}   Amostras do sensor: {len(trilha.amostras)}")
+    print(f"Quadros: {len(quadros)} (matriz {contagem['matriz']}, OLED {contagem['oled']}, "
+          f"buzzer {contagem['buzzer']})   Assinatura: {assinatura:08x}")
+    cpu = sorted(sim.cpu_ns)
+    if cpu:
+        print(f"CPU por quadro (us, host): min {cpu[0] / 1000:.1f}  mediana {_percentil(cpu, 0.5) / 1000:.1f}  "
+              f"p95 {_percentil(cpu, 0.95) / 1000:.1f}  max {cpu[-1] / 1000:.1f}")
+    _relatorio_latencias(sim.respostas)
+
+    if '--fixar' in opcoes:
+        trilha.quadros = quadros
+        trilha.salvar(caminho)
+        print(f"Referencia: {len(quadros)} quadros gravados na trilha")
+        return 0
+    if trilha.quadros is None:
+        print("Referencia: ausente (use --fixar)")
+        return 0
+    for i, (esperado, obtido) in enumerate(zip(trilha.quadros, quadros)):
+        if esperado != obtido:
+            print(f"Referencia: DIVERGENCIA no quadro {i}: esperado t={esperado[0]} us crc {esperado[1]:08x}, "
+                  f"obtido t={obtido[0]} us crc {obtido[1]:08x}")
+            return 1
+    if len(trilha.quadros) != len(quadros):
+        print(f"Referencia: DIVERGENCIA no numero de quadros: esperado {len(trilha.quadros)}, obtido {len(quadros)}")
+        return 1
+    print(f"Referencia: {len(quadros)} quadros identicos")
+    return 0
+
+def _uso():
+    print("Uso: trilha.py gravar arquivo.bdt [programa.py] [--raiz pasta] [--perfil nome|nenhum]")
+    print("                      [--semente S] [--segundos N] [--segurar MS] [--oled braille|blocos] [--sem-painel]")
+    print("     trilha.py reproduzir arquivo.bdt [--raiz pasta] [--fixar] [--png pasta] [--quadros arquivo.csv]")
+
+def main(argv):
+    comandos = {'gravar': gravar, 'reproduzir': reproduzir}
+    if not argv or argv[0] not in comandos:
+        _uso()
+        return 1
+    try:
+        return comandos[argv[0]](argv[1:])
+    except ValueError as erro:
+        print(f"Erro: {erro}")
+        _uso()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,53 @@
+# uasyncio.py
+# Substituto do uasyncio do MicroPython para execução no host (sobre o asyncio)
+#
+# No CPython, os laços de eventos criados (asyncio.run, new_event_loop) medem
+# o tempo pelo relógio do utime do host; com o RelogioVirtual, quando não há
+# nada pronto para rodar o laço avança o relógio até o próximo temporizador
+# em vez de esperar. Na porta Unix do MicroPython o asyncio nativo segue o
+# relógio real.
+
+from asyncio import *
+from asyncio import sleep as _sleep
+import simulador
+import utime
+
+async def sleep_ms(ms):
+    simulador.sondar()  # Teclado e desenho do simulador, se houver (ver simulador.py)
+    await _sleep(ms / 1000)
+
+try:
+    import asyncio as _asyncio
+    import selectors as _selectors
+except ImportError:
+    _selectors = None
+
+if _selectors is not None:
+    class _Seletor(_selectors.DefaultSelector):
+        """Seletor que, no relógio virtual, avança o tempo em vez de bloquear"""
+        def select(self, timeout=None):
+            relogio = utime.relogio_atual()
+            if not relogio.virtual or timeout is None:
+                return super().select(timeout)
+            eventos = super().select(0)
+            if not eventos:
+                espera = int(timeout * 1000000000) + 1
+                limite = simulador.limitar_espera_ns(espera)
+                relogio.avancar_ns(limite)
+                if limite < espera:
+                    simulador.sondar()  # Chegou a hora de um evento agendado (ex.: entrada de uma trilha)
+            return eventos
+
+    class LacoHost(_asyncio.SelectorEventLoop):
+        """Laço de eventos no relógio do utime do host"""
+        def __init__(self):
+            super().__init__(_Seletor())
+
+        def time(self):
+            return utime.relogio_atual().agora_ns() / 1000000000
+
+    class _Politica(_asyncio.DefaultEventLoopPolicy):
+        def new_event_loop(self):
+            return LacoHost()
+
+    _asyncio.set_event_loop_policy(_Politica())
@@ -0,0 +1,27 @@
+# urandom.py
+# Substituto do módulo urandom do MicroPython para execução no host
+
+import random as _random
+
+_gerador = _random.Random()
+
+def seed(valor=None):
+    _gerador.seed(valor)
+
+def getrandbits(n):
+    return _gerador.getrandbits(n)
+
+def randint(a, b):
+    return _gerador.randint(a, b)
+
+def randrange(*args):
+    return _gerador.randrange(*args)
+
+def choice(sequencia):
+    return _gerador.choice(sequencia)
+
+def random():
+    return _gerador.random()
+
+def uniform(a, b):
+    return _gerador.uniform(a, b)
\ No newline at end of file
@@ -0,0 +1,155 @@
+# utime.py
+# Substituto do módulo utime do MicroPython para execução no host
+#
+# Todo o firmware mede e espera o tempo por este módulo, então ele é o ponto
+# de troca do relógio: o RelogioReal segue o relógio do computador e o
+# RelogioVirtual só anda quando alguém espera (sleep, uasyncio) ou lê o
+# relógio ou um pino. Com o relógio virtual uma partida de 30 s roda em
+# milissegundos, e os ticks são sempre os mesmos de uma execução para outra:
+#
+#   import utime
+#   utime.usar_relogio(utime.RelogioVirtual())
+#
+# Com o simulador instalado (simulador.py), ticks_us e as esperas também
+# o sondam: laços que só olham o relógio continuam recebendo as teclas, e
+# uma espera longa é feita em fatias para o terminal não congelar.
+
+import time as _time
+import simulador
+
+# Mesmo período dos ticks da maioria das portas do MicroPython (2^30)
+TICKS_PERIOD = 1 << 30
+_TICKS_MAX = TICKS_PERIOD - 1
+_TICKS_HALF = TICKS_PERIOD // 2
+
+# Instante (time()) em que o relógio virtual começa: 2025-01-01 00:00:00 UTC
+EPOCA_VIRTUAL = 1735689600
+
+# === RELÓGIOS ===
+class RelogioReal:
+    virtual = False
+
+    def __init__(self):
+        self.inicio = _time.perf_counter_ns()
+
+    def agora_ns(self):
+        """Nanossegundos desde a criação do relógio"""
+        return _time.perf_counter_ns() - self.inicio
+
+    def ler_ns(self):
+        """Como agora_ns(); no relógio virtual, a leitura também gasta tempo"""
+        return _time.perf_counter_ns() - self.inicio
+
+    def leitura(self):
+        pass
+
+    def dormir_ns(self, ns):
+        _time.sleep(ns / 1000000000)
+
+    def avancar_ns(self, ns):
+        pass
+
+    def segundos(self):
+        return int(_time.time())
+
+class RelogioVirtual:
+    """
+    Relógio que só anda quando o programa espera: dormir_ns() avança na hora,
+    sem esperar de verdade. Cada leitura do relógio ou de um pino gasta
+    custo_leitura_us, como o tempo de CPU de uma volta de laço na placa;
+    assim um laço de espera ativa (while ticks_diff(...) < ...) também termina.
+    """
+    virtual = True
+
+    def __init__(self, custo_leitura_us=10, epoca=EPOCA_VIRTUAL):
+        self.ns = 0
+        self.custo_ns = custo_leitura_us * 1000
+        self.epoca = epoca
+
+    def agora_ns(self):
+        return self.ns
+
+    def ler_ns(self):
+        self.ns += self.custo_ns
+        return self.ns
+
+    def leitura(self):
+        self.ns += self.custo_ns
+
+    def dormir_ns(self, ns):
+        if ns > 0:
+            self.ns += ns
+
+    def avancar_ns(self, ns):
+        if ns > 0:
+            self.ns += ns
+
+    def segundos(self):
+        return self.epoca + self.ns // 1000000000
+
+_relogio = RelogioReal()
+
+def usar_relogio(relogio):
+    """(Host) Troca o relógio de todo o programa; retorna o anterior"""
+    global _relogio
+    anterior = _relogio
+    _relogio = relogio
+    return anterior
+
+def relogio_atual():
+    """(Host) Relógio em uso (RelogioReal ou RelogioVirtual)"""
+    return _relogio
+
+def custo_leitura():
+    """(Host) Conta uma leitura de periférico (pino, ADC) no relógio virtual"""
+    _relogio.leitura()
+
+# === API DO UTIME ===
+def ticks_ms():
+    return (_relogio.ler_ns() // 1000000) & _TICKS_MAX
+
+def ticks_us():
+    if simulador.atual is not None:
+        simulador.atual.sondar()
+    return (_relogio.ler_ns() // 1000) & _TICKS_MAX
+
+def ticks_cpu():
+    return ticks_us()
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) & _TICKS_MAX
+
+def ticks_diff(fim, inicio):
+    return ((fim - inicio + _TICKS_HALF) & _TICKS_MAX) - _TICKS_HALF
+
+# Fatia das esperas com o simulador instalado (ns)
+_FATIA_NS = 10000000
+
+def sleep(segundos):
+    ns = int(segundos * 1000000000)
+    if simulador.atual is None:
+        _relogio.dormir_ns(ns)
+        return
+    fim = _relogio.agora_ns() + ns
+    while True:
+        simulador.atual.sondar()
+        falta = fim - _relogio.agora_ns()
+        if falta <= 0:
+            return
+        _relogio.dormir_ns(simulador.atual.limitar_espera_ns(min(falta, _FATIA_NS)))
+
+def sleep_ms(ms):
+    sleep(ms / 1000)
+
+def sleep_us(us):
+    sleep(us / 1000000)
+
+def time():
+    return _relogio.segundos()
+
+def localtime(segundos=None):
+    if segundos is None:
+        segundos = time()
+    if _relogio.virtual:
+        return _time.gmtime(segundos)[:8]  # Sem fuso, como na placa: igual em qualquer máquina
+    return _time.localtime(segundos)[:8]
@@ -0,0 +1,137 @@
+# labirinto.py
+# Gerador de labirintos (backtracker recursivo) em grade de bits compactada,
+# com campo de distâncias até a saída calculado por busca em largura
+#
+# Um labirinto de w x h células ocupa uma grade de (2w+1) x (2h+1) casas:
+# as células ficam nas casas de coordenadas ímpares e as casas entre elas
+# são paredes ou passagens. Cada casa é um bit (1 = parede), então um
+# labirinto de 15 x 15 células cabe em 121 bytes; o campo de distâncias usa
+# 2 bytes por casa.
+
+from array import array
+import urandom
+
+INFINITO = 0xFFFF  # Distância das paredes e de casas inalcançáveis
+
+# Vizinhos de uma casa: (dx, dy)
+DIRECOES = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+class Labirinto:
+    def __init__(self, largura_celulas, altura_celulas):
+        """Gera um labirinto perfeito (um único caminho entre duas células quaisquer)"""
+        self.celulas_x = largura_celulas
+        self.celulas_y = altura_celulas
+        self.largura = 2 * largura_celulas + 1
+        self.altura = 2 * altura_celulas + 1
+        self.bits = bytearray(b'\xff' * ((self.largura * self.altura + 7) // 8))
+        self._gerar()
+
+        # Saída no canto inferior direito; o início é a casa mais distante dela
+        self.saida_x = self.largura - 2
+        self.saida_y = self.altura - 2
+        self.distancias = self._distancias(self.saida_x, self.saida_y)
+        self.inicio_x, self.inicio_y = self._mais_distante()
+
+    # === GRADE DE BITS ===
+    def parede(self, x, y):
+        """True se a casa (x, y) é parede (fora da grade também conta como parede)"""
+        if 0 <= x < self.largura and 0 <= y < self.altura:
+            i = y * self.largura + x
+            return (self.bits[i >> 3] >> (i & 7)) & 1
+        return 1
+
+    def _abrir(self, x, y):
+        i = y * self.largura + x
+        self.bits[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+
+    # === GERAÇÃO ===
+    def _gerar(self):
+        """
+        Backtracker recursivo com pilha explícita (sem recursão, que estoura a
+        pilha do MicroPython em labirintos grandes). Uma célula ainda fechada
+        é uma célula não visitada, então a própria grade marca as visitas.
+        """
+        w = self.celulas_x
+        vizinhos = [0, 0, 0, 0]
+        inicial = urandom.randint(0, w * self.celulas_y - 1)
+        self._abrir(2 * (inicial % w) + 1, 2 * (inicial // w) + 1)
+        pilha = [inicial]
+        while pilha:
+            celula = pilha[-1]
+            cx = 2 * (celula % w) + 1
+            cy = 2 * (celula // w) + 1
+            n = 0
+            for d in range(4):
+                dx, dy = DIRECOES[d]
+                nx = cx + 2 * dx
+                ny = cy + 2 * dy
+                if 0 < nx < self.largura and 0 < ny < self.altura and self.parede(nx, ny):
+                    vizinhos[n] = d
+                    n += 1
+            if not n:
+                pilha.pop()
+                continue
+            dx, dy = DIRECOES[vizinhos[urandom.randint(0, n - 1)]]
+            self._abrir(cx + dx, cy + dy)          # Derruba a parede entre as células
+            self._abrir(cx + 2 * dx, cy + 2 * dy)  # Entra na célula vizinha
+            pilha.append(((cy + 2 * dy) // 2) * w + (cx + 2 * dx) // 2)
+
+    # === CAMPO DE DISTÂNCIAS ===
+    def _distancias(self, origem_x, origem_y):
+        """Busca em largura a partir da origem: passos até ela para cada casa"""
+        largura = self.largura
+        total = largura * self.altura
+        distancias = array('H', b'\xff\xff' * total)
+        fila = array('H', bytes(2 * total))  # Cada casa entra na fila no máximo uma vez
+        origem = origem_y * largura + origem_x
+        distancias[origem] = 0
+        fila[0] = origem
+        inicio, fim = 0, 1
+        while inicio < fim:
+            casa = fila[inicio]
+            inicio += 1
+            x = casa % largura
+            y = casa // largura
+            proxima = distancias[casa] + 1
+            for dx, dy in DIRECOES:
+                if not self.parede(x + dx, y + dy):
+                    vizinha = casa + dy * largura + dx
+                    if distancias[vizinha] == INFINITO:
+                        distancias[vizinha] = proxima
+                        fila[fim] = vizinha
+                        fim += 1
+        return distancias
+
+    def _mais_distante(self):
+        """Casa aberta mais distante da saída"""
+        maior = -1
+        casa = 0
+        for i, d in enumerate(self.distancias):
+            if d != INFINITO and d > maior:
+                maior = d
+                casa = i
+        return casa % self.largura, casa // self.largura
+
+    def distancia(self, x, y):
+        """Passos da casa (x, y) até a saída (INFINITO em paredes)"""
+        if 0 <= x < self.largura and 0 <= y < self.altura:
+            return self.distancias[y * self.largura + x]
+        return INFINITO
+
+    def dica(self, x, y):
+        """Direção (dx, dy) do próximo passo do caminho mais curto até a saída, ou None"""
+        atual = self.distancia(x, y)
+        for dx, dy in DIRECOES:
+            if self.distancia(x + dx, y + dy) < atual:
+                return dx, dy
+        return None
+
+    # === JANELA DE VISUALIZAÇÃO ===
+    def janela(self, x, y, tamanho=5):
+        """
+        Canto superior esquerdo da janela tamanho x tamanho centrada em (x, y),
+        sem passar das bordas do labirinto
+        """
+        ox = min(max(x - tamanho // 2, 0), max(self.largura - tamanho, 0))
+        oy = min(max(y - tamanho // 2, 0), max(self.altura - tamanho, 0))
+        return ox, oy
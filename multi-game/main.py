@@ -1,39 +1,29 @@
 # main.py
 # Arquivo principal do jogo BitdogLab
 
-from components.display import Display
-from components.matriz_led import MatrizLED
-from components.buzzer import Buzzer
+from components.hardware import contexto
 
 # Importa o gerenciador de etapas
 from stages.stage_manager import StageManager
 
-# Importa as etapas do jogo
-from stages.reaction_game import ReactionGame
-from stages.memory_game import MemoryGame
-from stages.rhythm_game import RhythmGame
-from stages.tilt_game import TiltGame         # Jogo de inclinação
-from stages.maze_game import MazeGame         # Jogo de labirinto
-from stages.balance_game import BalanceGame   # Jogo de equilíbrio
-from stages.gyro_game import GyroGame
-from stages.sensor_test import SensorTest     # Utilitário de teste do sensor
+# As etapas são registradas pelo caminho "modulo.Classe" e só são importadas
+# quando escolhidas no menu (ver StageManager.adicionar_etapa)
 
 def reset_hardware():
     """Reseta todos os componentes de hardware para seu estado inicial"""
     try:
-        # Inicializa componentes apenas para resetá-los
-        display = Display()
-        matriz = MatrizLED()
-        buzzer = Buzzer()
+        # Os componentes são criados no contexto compartilhado, e o
+        # StageManager reaproveita essas mesmas instâncias
+        hw = contexto()
         
         # Limpa display
-        display.limpar()
+        hw.display.limpar()
         
         # Apaga todos os LEDs
-        matriz.apagar()
+        hw.matriz.apagar()
         
         # Garante que o buzzer esteja desligado
-        buzzer.buzzer.duty_u16(0)
+        hw.buzzer.silenciar()
         
         print("Hardware resetado com sucesso")
     except Exception as e:
@@ -50,15 +40,16 @@ def main():
     manager = StageManager()
     
     # Adiciona as etapas disponíveis
-    # Formato: manager.adicionar_etapa(ClasseDoJogo, "Nome do Jogo")
-    manager.adicionar_etapa(ReactionGame, "Reacao")
-    manager.adicionar_etapa(MemoryGame, "Memoria")
-    # manager.adicionar_etapa(RhythmGame, "Jogo de Ritmo")
-    manager.adicionar_etapa(TiltGame, "Inclinacao")
-    # manager.adicionar_etapa(MazeGame, "Jogo de Labirinto")
-    manager.adicionar_etapa(GyroGame, "Giroscopio")
-    # manager.adicionar_etapa(BalanceGame, "Jogo de Equilibrio")
-    # manager.adicionar_etapa(SensorTest, "Teste do Sensor")
+    # Formato: manager.adicionar_etapa("modulo.ClasseDoJogo", "Nome do Jogo")
+    manager.adicionar_etapa("stages.reaction_game.ReactionGame", "Reacao")
+    manager.adicionar_etapa("stages.memory_game.MemoryGame", "Memoria")
+    # manager.adicionar_etapa("stages.rhythm_game.RhythmGame", "Jogo de Ritmo")
+    manager.adicionar_etapa("stages.tilt_game.TiltGame", "Inclinacao")
+    # manager.adicionar_etapa("stages.maze_game.MazeGame", "Jogo de Labirinto")
+    manager.adicionar_etapa("stages.gyro_game.GyroGame", "Giroscopio")
+    manager.adicionar_etapa("stages.snake_game.SnakeGame", "Cobrinha")
+    # manager.adicionar_etapa("stages.balance_game.BalanceGame", "Jogo de Equilibrio")
+    # manager.adicionar_etapa("stages.sensor_test.SensorTest", "Teste do Sensor")
 
     
     # IMPORTANTE: Para adicionar ou remover etapas, basta adicionar ou 
@@ -0,0 +1,144 @@
+# memoria.py
+# Telemetria do heap: memória livre/alocada, pausas do coletor e fragmentação
+#
+# As coletas são feitas em pontos seguros (entrada e saída das etapas, menu),
+# medindo a pausa com ticks_us, para que o coletor não precise disparar no
+# meio de um jogo. Durante a partida, uma tarefa apenas amostra o heap; as
+# etapas bloqueantes, em que a tarefa não roda, chamam amostrar() nos seus laços.
+#
+# Fora do MicroPython (gc sem mem_free/mem_alloc) só as pausas são medidas.
+
+import gc
+from utime import ticks_us, ticks_diff
+import uasyncio as asyncio
+
+DISPONIVEL = hasattr(gc, 'mem_free')
+
+# Telemetria com uma etapa em andamento (ver amostrar())
+_ativa = None
+
+def livre():
+    return gc.mem_free() if DISPONIVEL else 0
+
+def alocado():
+    return gc.mem_alloc() if DISPONIVEL else 0
+
+def amostrar():
+    """
+    Amostra o heap da etapa em andamento, se houver telemetria ativa
+    Para etapas bloqueantes (sem Stage), que não deixam a tarefa de
+    amostragem rodar: chamada em pontos espaçados dos seus laços, já que
+    mem_alloc() percorre a tabela de alocação do heap
+    """
+    if _ativa is not None:
+        _ativa.amostrar()
+
+def maior_bloco(granularidade=256):
+    """
+    Maior bloco contíguo alocável (bytes), por busca binária de alocações
+    Caro: só deve ser chamado em pontos seguros, logo após uma coleta
+    """
+    if not DISPONIVEL:
+        return 0
+    baixo, alto = 0, gc.mem_free()
+    while alto - baixo > granularidade:
+        meio = (baixo + alto) // 2
+        try:
+            bloco = bytearray(meio)
+            bloco = None
+            baixo = meio
+        except MemoryError:
+            alto = meio
+    gc.collect()
+    return baixo
+
+class RegistroMemoria:
+    """Uso de memória de uma etapa, do início ao fim da partida"""
+    def __init__(self, nome, orcamento=None):
+        self.nome = nome
+        self.orcamento = orcamento    # Bytes que a etapa pode usar (None = sem limite)
+        self.base = 0                 # Alocado após a coleta de entrada
+        self.livre_entrada = 0
+        self.pico = 0                 # Maior mem_alloc() visto durante a etapa
+        self.retido = 0               # Alocado a mais após a coleta de saída
+        self.fragmentacao = 0         # % do heap livre fora do maior bloco (saída)
+        self.amostras = 0
+
+    def usado(self):
+        """Pico de memória usado pela etapa acima da base (bytes)"""
+        return self.pico - self.base
+
+    def excedeu(self):
+        return self.orcamento is not None and DISPONIVEL and self.usado() > self.orcamento
+
+class TelemetriaMemoria:
+    def __init__(self):
+        self.coletas = 0
+        self.pausa_total_us = 0
+        self.pausa_max_us = 0
+        self.ultima_pausa_us = 0
+        self.registro = None  # Etapa em andamento
+
+    def coletar(self):
+        """Coleta explícita (ponto seguro); retorna a pausa em microssegundos"""
+        inicio = ticks_us()
+        gc.collect()
+        pausa = ticks_diff(ticks_us(), inicio)
+        self.coletas += 1
+        self.pausa_total_us += pausa
+        if pausa > self.pausa_max_us:
+            self.pausa_max_us = pausa
+        self.ultima_pausa_us = pausa
+        return pausa
+
+    def amostrar(self):
+        """Registra o heap alocado agora no pico da etapa em andamento (sem coletar)"""
+        registro = self.registro
+        if registro is not None:
+            atual = alocado()
+            if atual > registro.pico:
+                registro.pico = atual
+            registro.amostras += 1
+
+    async def tarefa_amostragem(self, periodo_ms):
+        """Amostra o heap periodicamente durante a partida"""
+        while True:
+            self.amostrar()
+            await asyncio.sleep_ms(periodo_ms)
+
+    def iniciar_etapa(self, nome, orcamento=None):
+        """Coleta e marca a base de memória antes de a etapa ser criada"""
+        global _ativa
+        self.coletar()
+        registro = RegistroMemoria(nome, orcamento)
+        registro.base = registro.pico = alocado()
+        registro.livre_entrada = livre()
+        self.registro = registro
+        _ativa = self
+        return registro
+
+    def encerrar_etapa(self, fragmentacao=True):
+        """Amostra o pico final, coleta e calcula memória retida e fragmentação"""
+        global _ativa
+        registro = self.registro
+        if registro is None:
+            return None
+        self.amostrar()
+        self.coletar()
+        registro.retido = alocado() - registro.base
+        if fragmentacao and DISPONIVEL:
+            heap_livre = livre()
+            if heap_livre:
+                registro.fragmentacao = 100 - 100 * maior_bloco() // heap_livre
+        self.registro = None
+        if _ativa is self:
+            _ativa = None
+        return registro
+
+    def relatorio(self, registro):
+        """Linha de resumo de uma etapa para o console"""
+        texto = f"Memoria {registro.nome}: "
+        if DISPONIVEL:
+            texto += (f"livre {registro.livre_entrada} B, pico +{registro.usado()} B, "
+                      f"retido {registro.retido} B, frag {registro.fragmentacao}%, ")
+        return texto + f"GC {self.ultima_pausa_us} us (max {self.pausa_max_us} us, {self.coletas} coletas)"
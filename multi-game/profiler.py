@@ -0,0 +1,207 @@
+# profiler.py
+# Medição de tempo por seção (ticks_us) com histogramas pré-alocados
+#
+# Uso:
+#     perfil = Profiler()
+#     with perfil.secao("sensor"):
+#         mpu.ler_raw()
+#     perfil.instrumentar(matriz.np, "write", "neopixel")  # mede cada chamada
+#     perfil.imprimir()
+#
+# Desligado (PERFIL_NULO), secao() devolve sempre o mesmo objeto vazio e nada é
+# instrumentado: o custo é só o de uma chamada de método.
+
+from array import array
+from utime import ticks_us, ticks_diff
+
+# Histograma logarítmico: valores < 8 us têm balde próprio; acima disso, 8
+# baldes por oitava (erro relativo < 12.5%). 160 baldes cobrem até ~4 s.
+SUBDIVISOES = 8
+NUM_BALDES = 160
+
+def balde(us):
+    """Índice do balde do histograma para uma duração em microssegundos"""
+    if us < SUBDIVISOES:
+        return us if us > 0 else 0
+    oitava = 0
+    while us >= 2 * SUBDIVISOES:
+        us >>= 1
+        oitava += 1
+    indice = SUBDIVISOES * (oitava + 1) + us - SUBDIVISOES
+    return indice if indice < NUM_BALDES else NUM_BALDES - 1
+
+def limite_superior(indice):
+    """Maior duração (us) que cai no balde indice"""
+    if indice < SUBDIVISOES:
+        return indice
+    oitava = indice // SUBDIVISOES - 1
+    return ((indice % SUBDIVISOES + SUBDIVISOES + 1) << oitava) - 1
+
+class Secao:
+    """Estatísticas de uma seção: n, mínimo, soma, máximo e histograma"""
+    def __init__(self, nome):
+        self.nome = nome
+        self.histograma = array('L', [0] * NUM_BALDES)
+        self.zerar()
+
+    def zerar(self):
+        """Descarta as medições (sem realocar o histograma)"""
+        for i in range(NUM_BALDES):
+            self.histograma[i] = 0
+        self.n = 0
+        self.soma = 0
+        self.minimo = 0
+        self.maximo = 0
+        self.inicio = 0
+
+    def registrar(self, us):
+        """Registra uma duração em microssegundos"""
+        if self.n == 0 or us < self.minimo:
+            self.minimo = us
+        if us > self.maximo:
+            self.maximo = us
+        self.n += 1
+        self.soma += us
+        self.histograma[balde(us)] += 1
+
+    def __enter__(self):
+        self.inicio = ticks_us()
+        return self
+
+    def __exit__(self, *excecao):
+        self.registrar(ticks_diff(ticks_us(), self.inicio))
+        return False
+
+    def media(self):
+        return self.soma // self.n if self.n else 0
+
+    def percentil(self, p):
+        """Percentil p (0-100) estimado pelo histograma (limite superior do balde)"""
+        if not self.n:
+            return 0
+        alvo = (self.n * p + 99) // 100
+        acumulado = 0
+        for i in range(NUM_BALDES):
+            acumulado += self.histograma[i]
+            if acumulado >= alvo:
+                return min(limite_superior(i), self.maximo)
+        return self.maximo
+
+def _envolver(secao, funcao):
+    """Cria uma função que mede cada chamada de funcao na seção"""
+    def medida(*args, **kwargs):
+        inicio = ticks_us()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            secao.registrar(ticks_diff(ticks_us(), inicio))
+    return medida
+
+class Profiler:
+    def __init__(self):
+        self.secoes = {}
+        self.instrumentados = []  # (objeto, nome do método) para desfazer
+
+    def secao(self, nome):
+        """Seção com este nome (criada na primeira vez); use com 'with'"""
+        secao = self.secoes.get(nome)
+        if secao is None:
+            secao = self.secoes[nome] = Secao(nome)
+        return secao
+
+    def medir(self, nome):
+        """Decorador: mede cada chamada da função na seção nome"""
+        def decorador(funcao):
+            return _envolver(self.secao(nome), funcao)
+        return decorador
+
+    def instrumentar(self, objeto, metodo, nome=None):
+        """
+        Substitui objeto.metodo (só nesta instância) por uma versão medida
+        Retorna False se o objeto não aceita atributos (ex.: classes nativas)
+        """
+        if objeto is None or not hasattr(objeto, metodo):
+            return False
+        medida = _envolver(self.secao(nome or metodo), getattr(objeto, metodo))
+        try:
+            setattr(objeto, metodo, medida)
+        except (AttributeError, TypeError):
+            return False
+        self.instrumentados.append((objeto, metodo))
+        return True
+
+    def desinstrumentar(self):
+        """Restaura os métodos originais de todas as instâncias instrumentadas"""
+        for objeto, metodo in self.instrumentados:
+            try:
+                delattr(objeto, metodo)
+            except AttributeError:
+                pass
+        self.instrumentados = []
+
+    def zerar(self):
+        for secao in self.secoes.values():
+            secao.zerar()
+
+    def relatorio(self, titulo="Perfil"):
+        """Linhas do relatório: n, mínimo, média, p95 e máximo (us) por seção"""
+        linhas = [f"=== {titulo} ===",
+                  "{:<10}{:>7}{:>8}{:>8}{:>8}{:>8}".format("secao", "n", "min", "media", "p95", "max")]
+        for nome in sorted(self.secoes):
+            s = self.secoes[nome]
+            if s.n:
+                linhas.append("{:<10}{:>7}{:>8}{:>8}{:>8}{:>8}".format(
+                    nome[:10], s.n, s.minimo, s.media(), s.percentil(95), s.maximo))
+        return linhas
+
+    def imprimir(self, titulo="Perfil"):
+        """Envia o relatório pela serial (console)"""
+        for linha in self.relatorio(titulo):
+            print(linha)
+
+    def salvar(self, caminho, titulo="Perfil"):
+        """Grava o relatório em um arquivo de texto"""
+        with open(caminho, 'w') as arquivo:
+            for linha in self.relatorio(titulo):
+                arquivo.write(linha + "\n")
+
+class _SecaoNula:
+    """Seção que não mede nada (profiler desligado)"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        return False
+
+class _ProfilerNulo:
+    """Mesma interface do Profiler, sem custo: nada é medido nem instrumentado"""
+    _SECAO = _SecaoNula()
+
+    def secao(self, nome):
+        return self._SECAO
+
+    def medir(self, nome):
+        def decorador(funcao):
+            return funcao
+        return decorador
+
+    def instrumentar(self, objeto, metodo, nome=None):
+        return False
+
+    def desinstrumentar(self):
+        pass
+
+    def zerar(self):
+        pass
+
+    def relatorio(self, titulo="Perfil"):
+        return []
+
+    def imprimir(self, titulo="Perfil"):
+        pass
+
+    def salvar(self, caminho, titulo="Perfil"):
+        pass
+
+# Profiler padrão das etapas quando o perfil está desligado
+PERFIL_NULO = _ProfilerNulo()
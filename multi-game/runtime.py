@@ -0,0 +1,45 @@
+# runtime.py
+# Runtime assíncrono (uasyncio): executa corrotinas com as tarefas de fundo
+# de entrada (botões) e de som (buzzer) rodando em paralelo
+
+import uasyncio as asyncio
+
+# Intervalo de leitura dos botões pela tarefa de entrada
+PERIODO_ENTRADA_MS = 10
+
+async def tarefa_entrada(botoes, periodo_ms=PERIODO_ENTRADA_MS):
+    """Lê os botões periodicamente, guardando as pressões até serem consumidas"""
+    while True:
+        botoes.atualizar()
+        await asyncio.sleep_ms(periodo_ms)
+
+async def com_tarefas_de_fundo(corrotina, buzzer, botoes):
+    """
+    Aguarda a corrotina com as tarefas de entrada e de som ativas
+    Enquanto a tarefa de som roda, buzzer.tocar_som() apenas enfileira o som
+    """
+    tarefas = [
+        asyncio.create_task(tarefa_entrada(botoes)),
+        asyncio.create_task(buzzer.tarefa_som())
+    ]
+    # Deixa as tarefas de fundo começarem antes da corrotina principal
+    await asyncio.sleep_ms(0)
+    try:
+        return await corrotina
+    finally:
+        for tarefa in tarefas:
+            tarefa.cancel()
+        buzzer.silenciar()
+
+def executar(corrotina, buzzer=None, botoes=None):
+    """
+    Executa uma corrotina até o fim a partir de código síncrono e retorna
+    seu resultado. Com buzzer e botões, roda com as tarefas de fundo.
+    """
+    if buzzer is not None and botoes is not None:
+        corrotina = com_tarefas_de_fundo(corrotina, buzzer, botoes)
+    try:
+        return asyncio.run(corrotina)
+    finally:
+        # Descarta tarefas pendentes para a próxima execução começar limpa
+        asyncio.new_event_loop()
@@ -2,45 +2,54 @@
 # Jogo de equilíbrio: mantenha o dispositivo estável para acumular pontos
 
 import config
-from utime import sleep, ticks_ms, ticks_diff
+from utime import ticks_ms
+import uasyncio as asyncio
 import urandom
-from utils import contagem_regressiva
-from machine import I2C, Pin, SoftI2C
-import math
+from utils import contagem_regressiva_async, isqrt
+from stages.base import Stage
+from components.mpu6050 import g_para_contagens, CONTAGENS_POR_G, AX, AY, AZ
 
-class BalanceGame:
-    def __init__(self, display, matriz, buzzer, botoes):
+# O desvio é calculado em contagens >> 2 (resolução de 0.24 mg): assim a soma
+# dos três quadrados cabe em um small int do MicroPython mesmo com ±2 g por eixo
+DESLOCAMENTO = 2
+
+# Limiares de desvio para cada nível (menor desvio = nível mais alto), em g:
+# 0.5, 0.3, 0.2, 0.1 e 0.05. Guardados ao quadrado, na mesma escala do desvio,
+# para comparar sem raiz nem ponto flutuante.
+LIMIARES_NIVEL_2 = [(g_para_contagens(l) >> DESLOCAMENTO) ** 2 for l in (0.5, 0.3, 0.2, 0.1, 0.05)]
+LIMIAR_ALERTA_2 = (g_para_contagens(0.5) >> DESLOCAMENTO) ** 2
+
+class BalanceGame(Stage):
+    # Equilíbrio e matriz a cada 200ms, display a cada 500ms
+    PERIODO_LOGICA_MS = 200
+    PERIODO_MATRIZ_MS = 200
+    PERIODO_HUD_MS = 500
+    
+    # Heap que a partida pode usar (ver Stage.ORCAMENTO_MEMORIA)
+    ORCAMENTO_MEMORIA = 8 * 1024
+    
+    def __init__(self, display, matriz, buzzer, botoes, hw=None):
         """Inicializa o jogo de equilíbrio"""
-        self.display = display
-        self.matriz = matriz
-        self.buzzer = buzzer
-        self.botoes = botoes
-        self.pontuacao = 0
+        super().__init__(display, matriz, buzzer, botoes, hw)
         self.tempo_total = 30  # segundos de jogo
-        self.nivel_atual = 1   # Nível atual (1 a 5)
-        self.nivel_mais_alto = 1  # Nível mais alto atingido durante o jogo
         
         # Configuração do MPU-6050
-        try:
-            # Tenta inicializar o I2C em hardware
-            self.i2c = I2C(0, scl=Pin(1), sda=Pin(0), freq=400000)
-            print("I2C inicializado com ID 0")
-        except Exception as e:
-            print(f"Erro ao inicializar I2C: {e}")
-            # Fallback para SoftI2C
-            self.i2c = SoftI2C(scl=Pin(1), sda=Pin(0), freq=100000)
-            print("Usando SoftI2C")
+        self.mpu = self.hw.mpu
+        self.sensor_presente = self.hw.sensor_presente
         
-        self.mpu_addr = 0x68  # Endereço padrão do MPU-6050
+        self.reset()
+    
+    def reset(self):
+        """Estado de início de partida"""
+        self.pontuacao = 0
+        self.nivel_atual = 1   # Nível atual (1 a 5)
+        self.nivel_mais_alto = 1  # Nível mais alto atingido durante o jogo
         
-        # Verifica se o sensor está presente
-        self.sensor_presente = self.mpu_addr in self.i2c.scan()
-        if self.sensor_presente:
-            # Inicializa o sensor
-            self.i2c.writeto_mem(self.mpu_addr, 0x6B, b'\x00')  # Acorda o MPU-6050
-            sleep(0.1)
+        # Última leitura do sensor e desvio atual (ao quadrado)
+        self.raw = None
+        self.desvio_2 = 0
     
-    def iniciar(self):
+    async def iniciar_async(self):
         """Inicia o jogo de equilíbrio"""
         # Verifica se o sensor está disponível
         if not self.sensor_presente:
@@ -50,7 +59,7 @@ class BalanceGame:
                 "nao encontrado!",
                 "Verifique conexao"
             ])
-            sleep(3)
+            await asyncio.sleep_ms(3000)
             return None
         
         # Mensagem inicial no display
@@ -62,21 +71,16 @@ class BalanceGame:
         ])
         
         # Aguarda qualquer botão ser pressionado para iniciar
-        self.botoes.aguardar_qualquer_botao()
+        await self.botoes.aguardar_qualquer_botao_async()
         
         # Contador regressivo
-        contagem_regressiva(self.display, self.buzzer)
+        await contagem_regressiva_async(self.display, self.buzzer)
         
         # Reinicia pontuação e níveis
         self.pontuacao = 0
         self.nivel_atual = 1
         self.nivel_mais_alto = 1
         
-        # Tempo inicial
-        tempo_inicio = ticks_ms()
-        ultimo_movimento = ticks_ms()
-        ultima_atualizacao_display = ticks_ms()
-        
         # Calibração inicial
         self.display.mostrar_mensagem([
             "Calibrando...",
@@ -85,21 +89,22 @@ class BalanceGame:
             "de jogo..."
         ])
         
-        # Lê algumas amostras para calibração
+        # Lê algumas amostras para calibração (contagens brutas)
         amostras = 10
         soma_x, soma_y, soma_z = 0, 0, 0
         for _ in range(amostras):
-            dados = self._ler_mpu6050()
-            if dados:
-                soma_x += dados['accel']['x']
-                soma_y += dados['accel']['y']
-                soma_z += dados['accel']['z']
-            sleep(0.1)
+            raw = self.mpu.ler_raw()
+            if raw:
+                soma_x += raw[AX]
+                soma_y += raw[AY]
+                soma_z += raw[AZ]
+            await asyncio.sleep_ms(100)
         
         # Calcula as médias como valores de referência
-        self.ref_x = soma_x / amostras
-        self.ref_y = soma_y / amostras
-        self.ref_z = soma_z / amostras
+        self.ref_x = soma_x // amostras
+        self.ref_y = soma_y // amostras
+        self.ref_z = soma_z // amostras
+        self.desvio_2 = 0
         
         self.display.mostrar_mensagem([
             "Calibrado!",
@@ -107,49 +112,10 @@ class BalanceGame:
             "posicao para",
             "ganhar pontos!"
         ])
-        sleep(1)
+        await asyncio.sleep_ms(1000)
         
-        # Laço principal do jogo
-        while True:
-            tempo_atual = ticks_ms()
-            tempo_passado = ticks_diff(tempo_atual, tempo_inicio) / 1000  # em segundos
-            
-            # Verifica se o tempo acabou
-            if tempo_passado >= self.tempo_total:
-                break
-            
-            # Atualiza o display a cada 500ms
-            if ticks_diff(tempo_atual, ultima_atualizacao_display) > 500:
-                self.display.mostrar_mensagem([
-                    f"Nivel: {self.nivel_atual}",
-                    f"Tempo: {int(self.tempo_total - tempo_passado)}s",
-                    f"Pontuacao: {self.pontuacao}",
-                    "Mantenha estavel!"
-                ])
-                ultima_atualizacao_display = tempo_atual
-            
-            # Verifica o equilíbrio e atualiza a pontuação a cada 200ms
-            if ticks_diff(tempo_atual, ultimo_movimento) > 200:
-                # Lê os dados do acelerômetro
-                dados = self._ler_mpu6050()
-                if dados:
-                    # Calcula o desvio em relação à referência
-                    desvio = self._calcular_desvio(
-                        dados['accel']['x'], 
-                        dados['accel']['y'], 
-                        dados['accel']['z']
-                    )
-                    
-                    # Atualiza o nível e a pontuação
-                    self._atualizar_nivel_e_pontuacao(desvio)
-                    
-                    # Atualiza a matriz de LEDs
-                    self._atualizar_matriz(desvio)
-                
-                ultimo_movimento = tempo_atual
-            
-            # Pausa para economizar CPU
-            sleep(0.01)
+        # Laço principal do jogo (passo fixo, ver stages/base.py)
+        await self.executar_laco_async(self.tempo_total * 1000)
         
         # Fim do jogo
         self.buzzer.tocar_fim_jogo()
@@ -162,64 +128,52 @@ class BalanceGame:
         ])
         
         # Aguarda botão para continuar
-        self.botoes.aguardar_qualquer_botao()
+        await self.botoes.aguardar_qualquer_botao_async()
         
         return self.pontuacao
     
-    def _ler_mpu6050(self):
-        """Lê os dados do acelerômetro e giroscópio do MPU-6050"""
-        try:
-            # Lê os dados do acelerômetro (registros 0x3B-0x40)
-            data = self.i2c.readfrom_mem(self.mpu_addr, 0x3B, 6)
-            
-            # Converte os dados (cada valor é de 16 bits, em complemento de 2)
-            accel_x = (data[0] << 8) | data[1]
-            accel_y = (data[2] << 8) | data[3]
-            accel_z = (data[4] << 8) | data[5]
-            
-            # Converte para valor com sinal
-            if accel_x > 32767:
-                accel_x -= 65536
-            if accel_y > 32767:
-                accel_y -= 65536
-            if accel_z > 32767:
-                accel_z -= 65536
-            
-            # Converte para unidades g (±2g)
-            accel_x_g = accel_x / 16384.0
-            accel_y_g = accel_y / 16384.0
-            accel_z_g = accel_z / 16384.0
-            
-            return {
-                'accel': {
-                    'x': accel_x_g,
-                    'y': accel_y_g,
-                    'z': accel_z_g
-                }
-            }
-        except Exception as e:
-            print(f"Erro ao ler MPU-6050: {e}")
-            return None
+    def ler_sensor(self):
+        """Lê os dados do acelerômetro (contagens brutas)"""
+        self.raw = self.mpu.ler_raw()
+    
+    def update(self, dt):
+        """Calcula o desvio em relação à referência e atualiza nível e pontuação"""
+        if self.raw:
+            self.desvio_2 = self._calcular_desvio(self.raw[AX], self.raw[AY], self.raw[AZ])
+            self._atualizar_nivel_e_pontuacao(self.desvio_2)
+    
+    def render(self):
+        """Atualiza a matriz de LEDs"""
+        self._atualizar_matriz(self.desvio_2)
+    
+    def render_hud(self):
+        """Atualiza o display com nível, tempo, pontuação e desvio"""
+        # Raiz inteira só aqui, para exibir o desvio em mg
+        desvio_mg = (isqrt(self.desvio_2) << DESLOCAMENTO) * 1000 // CONTAGENS_POR_G
+        self.display.mostrar_mensagem([
+            f"Nivel: {self.nivel_atual}",
+            f"Tempo: {self.tempo_total - self.tempo_ms // 1000}s",
+            f"Pontuacao: {self.pontuacao}",
+            f"Desvio: {desvio_mg} mg",
+            "Mantenha estavel!"
+        ])
     
     def _calcular_desvio(self, x, y, z):
-        """Calcula o desvio em relação à posição de referência"""
-        # Distância euclidiana em relação à referência
-        dx = x - self.ref_x
-        dy = y - self.ref_y
-        dz = z - self.ref_z
-        
-        # Retorna a magnitude do desvio
-        return math.sqrt(dx*dx + dy*dy + dz*dz)
+        """
+        Calcula o desvio em relação à posição de referência
+        Retorna o quadrado da distância euclidiana, em (contagens >> DESLOCAMENTO)²
+        """
+        dx = (x - self.ref_x) >> DESLOCAMENTO
+        dy = (y - self.ref_y) >> DESLOCAMENTO
+        dz = (z - self.ref_z) >> DESLOCAMENTO
+        return dx*dx + dy*dy + dz*dz
     
-    def _atualizar_nivel_e_pontuacao(self, desvio):
-        """Atualiza o nível atual e a pontuação com base no desvio"""
-        # Limiares para cada nível (menor desvio = nível mais alto)
-        limiar_nivel = [0.5, 0.3, 0.2, 0.1, 0.05]
-        
+    def _atualizar_nivel_e_pontuacao(self, desvio_2):
+        """Atualiza o nível atual e a pontuação com base no desvio ao quadrado"""
         # Determina o novo nível com base no desvio
         novo_nivel = 1
-        for i, limiar in enumerate(limiar_nivel):
-            if desvio < limiar:
+        for i, limiar_2 in enumerate(LIMIARES_NIVEL_2):
+            if desvio_2 < limiar_2:
                 novo_nivel = 5 - i
                 break
         
@@ -240,7 +194,7 @@ class BalanceGame:
         # Adiciona pontos com base no nível atual
         self.pontuacao += self.nivel_atual
     
-    def _atualizar_matriz(self, desvio):
+    def _atualizar_matriz(self, desvio_2):
         """Atualiza a visualização na matriz de LEDs com base no nível atual"""
         self.matriz.apagar()
         
@@ -292,6 +246,6 @@ class BalanceGame:
                     self.matriz.acender_led_cor(x, y, cor_atual)
                     
         # Indica o desvio com um LED piscante se estiver fora do limiar
-        if desvio > 0.5:  # Desvio grande
+        if desvio_2 > LIMIAR_ALERTA_2:  # Desvio grande (> 0.5 g)
             if (ticks_ms() // 100) % 2 == 0:  # Pisca rápido
                 self.matriz.acender_led_cor(2, 2, config.COR_VERMELHO)
\ No newline at end of file
@@ -0,0 +1,193 @@
+# stages/base.py
+# Classe base das etapas: laço de passo fixo com taxas separadas para sensor,
+# lógica, matriz de LEDs e display (HUD), cada um em sua tarefa do uasyncio
+
+from utime import ticks_ms, ticks_add, ticks_diff
+import uasyncio as asyncio
+from runtime import executar
+from components.hardware import contexto
+
+# Tarefas do escalonador
+SENSOR, LOGICA, MATRIZ, HUD = range(4)
+NOMES_TAREFAS = ("sensor", "logica", "matriz", "hud")
+
+class Stage:
+    # Períodos de cada tarefa em ms (0 = desligada). Com PERIODO_SENSOR_MS = 0
+    # o sensor é lido logo antes de cada passo de lógica.
+    PERIODO_SENSOR_MS = 0
+    PERIODO_LOGICA_MS = 200
+    PERIODO_MATRIZ_MS = 200
+    PERIODO_HUD_MS = 500
+
+    # Máximo de passos de lógica seguidos para recuperar um atraso; além disso
+    # o tempo perdido é descartado e contado como overrun
+    MAX_PASSOS_ATRASO = 4
+
+    # Memória (bytes) que a etapa pode usar acima do heap na entrada, incluindo
+    # a própria construção; o StageManager avisa quando ela é ultrapassada
+    ORCAMENTO_MEMORIA = None
+
+    def __init__(self, display, matriz, buzzer, botoes, hw=None):
+        """
+        Inicializa os componentes e o estado do escalonador
+        hw: contexto de hardware de onde vêm os demais periféricos (sensor,
+            joystick); por padrão, o contexto compartilhado do programa
+        """
+        self.display = display
+        self.matriz = matriz
+        self.buzzer = buzzer
+        self.botoes = botoes
+        self.hw = hw if hw is not None else contexto()
+
+        self.rodando = False
+        self.tempo_ms = 0  # Tempo de jogo: soma dos dt dos passos de lógica
+        self.overruns = [0, 0, 0, 0]   # Por tarefa (SENSOR, LOGICA, MATRIZ, HUD)
+        self.atraso_max_ms = 0         # Maior atraso observado no início de uma tarefa
+        self.animacoes = 0             # Animações em andamento (render() fica pausado)
+
+    # === GANCHOS (sobrescritos pelas etapas) ===
+    async def iniciar_async(self):
+        """Corrotina principal da etapa; retorna a pontuação ou None"""
+        return None
+
+    def ler_sensor(self):
+        """Lê o sensor; o resultado fica guardado para o próximo update()"""
+        pass
+
+    def update(self, dt):
+        """Avança a lógica do jogo em dt milissegundos (sempre PERIODO_LOGICA_MS)"""
+        pass
+
+    def render(self):
+        """Desenha o estado atual na matriz de LEDs"""
+        pass
+
+    def render_hud(self):
+        """Atualiza as informações no display OLED"""
+        pass
+
+    def reset(self):
+        """Volta ao estado de início de partida sem recriar o hardware (reuso da instância)"""
+        pass
+
+    # === CONTROLE ===
+    def iniciar(self):
+        """Executa a etapa de forma bloqueante (com as tarefas de entrada e som)"""
+        return executar(self.iniciar_async(), self.buzzer, self.botoes)
+
+    def parar(self):
+        """Encerra o laço ao fim do passo atual"""
+        self.rodando = False
+
+    def animar(self, corrotina):
+        """
+        Roda uma animação da matriz (ex.: matriz.piscar_led_async) em paralelo
+        ao jogo; enquanto ela dura, render() não redesenha a matriz
+        """
+        async def _animar():
+            self.animacoes += 1
+            try:
+                await corrotina
+            finally:
+                self.animacoes -= 1
+        asyncio.create_task(_animar())
+
+    # === ESCALONADOR ===
+    def executar_laco(self, duracao_ms=None):
+        """Versão bloqueante de executar_laco_async()"""
+        return executar(self.executar_laco_async(duracao_ms), self.buzzer, self.botoes)
+
+    async def executar_laco_async(self, duracao_ms=None):
+        """
+        Executa o laço de passo fixo até parar() ou até o tempo de jogo atingir
+        duracao_ms. A lógica recupera atrasos (até MAX_PASSOS_ATRASO passos);
+        sensor, matriz e HUD rodam em tarefas próprias e apenas pulam os
+        quadros perdidos.
+        Retorna True se terminou pelo tempo, False se parar() foi chamado.
+        """
+        self.tempo_ms = 0
+        self.overruns = [0, 0, 0, 0]
+        self.atraso_max_ms = 0
+        self.rodando = True
+        self.botoes.limpar_eventos()
+
+        tarefas = []
+        for tarefa, periodo, funcao in ((SENSOR, self.PERIODO_SENSOR_MS, self.ler_sensor),
+                                        (MATRIZ, self.PERIODO_MATRIZ_MS, self._render_matriz),
+                                        (HUD, self.PERIODO_HUD_MS, self.render_hud)):
+            if periodo:
+                tarefas.append(asyncio.create_task(self._periodica(tarefa, periodo, funcao)))
+
+        periodo = self.PERIODO_LOGICA_MS
+        proximo = ticks_ms()
+        try:
+            while self.rodando:
+                agora = ticks_ms()
+                atraso = ticks_diff(agora, proximo)
+                if atraso < 0:
+                    await asyncio.sleep_ms(-atraso)
+                    continue
+                self._registrar_atraso(atraso)
+
+                # Passos de tamanho fixo até alcançar o relógio
+                passos = 0
+                while ticks_diff(agora, proximo) >= 0 and passos < self.MAX_PASSOS_ATRASO:
+                    self._passo(periodo)
+                    proximo = ticks_add(proximo, periodo)
+                    passos += 1
+                    if not self.rodando or (duracao_ms is not None and self.tempo_ms >= duracao_ms):
+                        break
+                if duracao_ms is not None and self.tempo_ms >= duracao_ms:
+                    break
+                if ticks_diff(agora, proximo) >= 0 and self.rodando:
+                    self.overruns[LOGICA] += 1
+                    proximo = ticks_add(agora, periodo)
+
+                # Cede a vez às outras tarefas mesmo sem folga até o próximo passo
+                await asyncio.sleep_ms(0)
+        finally:
+            terminou_pelo_tempo = self.rodando
+            self.rodando = False
+            for tarefa in tarefas:
+                tarefa.cancel()
+            self._relatar_overruns()
+        return terminou_pelo_tempo
+
+    def _passo(self, dt):
+        """Um passo de lógica (com a leitura do sensor, se ela não tem tarefa própria)"""
+        if not self.PERIODO_SENSOR_MS:
+            self.ler_sensor()
+        self.update(dt)
+        self.tempo_ms += dt
+
+    async def _periodica(self, tarefa, periodo, funcao):
+        """Chama funcao a cada periodo ms, pulando (e contando) quadros perdidos"""
+        proximo = ticks_ms()
+        while self.rodando:
+            agora = ticks_ms()
+            atraso = ticks_diff(agora, proximo)
+            if atraso < 0:
+                await asyncio.sleep_ms(-atraso)
+                continue
+            self._registrar_atraso(atraso)
+            funcao()
+            proximo = ticks_add(proximo, periodo)
+            if atraso >= periodo:
+                # Um ou mais quadros perdidos: realinha sem acumular
+                self.overruns[tarefa] += 1
+                proximo = ticks_add(agora, periodo)
+
+    def _render_matriz(self):
+        """Redesenha a matriz, exceto durante uma animação"""
+        if not self.animacoes:
+            self.render()
+
+    def _registrar_atraso(self, atraso):
+        if atraso > self.atraso_max_ms:
+            self.atraso_max_ms = atraso
+
+    def _relatar_overruns(self):
+        """Imprime os overruns da partida no console, se houver"""
+        if any(self.overruns):
+            resumo = ", ".join(f"{NOMES_TAREFAS[i]}={n}" for i, n in enumerate(self.overruns) if n)
+            print(f"{type(self).__name__}: overruns {resumo} (atraso max {self.atraso_max_ms} ms)")
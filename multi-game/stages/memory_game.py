@@ -4,17 +4,19 @@
 import config
 from utime import sleep, ticks_ms, ticks_diff
 import urandom
+import memoria
 from utils import contagem_regressiva
 
 class MemoryGame:
+    # Heap que a partida pode usar (ver Stage.ORCAMENTO_MEMORIA)
+    ORCAMENTO_MEMORIA = 6 * 1024
+    
     def __init__(self, display, matriz, buzzer, botoes):
         """Inicializa o jogo de memória"""
         self.display = display
         self.matriz = matriz
         self.buzzer = buzzer
         self.botoes = botoes
-        self.sequencia = []          # Sequência de cores a ser memorizada
-        self.nivel = 1               # Nível atual (tamanho da sequência)
         self.max_nivel = 10          # Nível máximo
         self.posicoes_botoes = {     # Mapeamento de posições/cores para botões
             1: {"pos": (1, 1), "cor": config.COR_VERDE},    # Botão A: Verde
@@ -26,6 +28,13 @@ class MemoryGame:
             config.COR_VERDE: "C4",
             config.COR_VERMELHO: "G4"
         }
+        
+        self.reset()
+    
+    def reset(self):
+        """Estado de início de partida"""
+        self.sequencia = []          # Sequência de cores a ser memorizada
+        self.nivel = 1               # Nível atual (tamanho da sequência)
     
     def iniciar(self):
         """Inicia o jogo de memória"""
@@ -62,6 +71,7 @@ class MemoryGame:
             
             # Mostra a sequência
             self._mostrar_sequencia()
+            memoria.amostrar()
             
             # Aguarda a resposta do jogador
             self.display.mostrar_mensagem([
@@ -168,6 +178,7 @@ class MemoryGame:
             self.buzzer.tocar_nota(nota, 200)
             sleep(0.1)
             self.matriz.apagar_led(pos[0], pos[1])
+            memoria.amostrar()
             
             # Verifica se o botão pressionado é o correto
             if botao_pressionado != botao_correto:
@@ -1,19 +1,35 @@
 # stages/reaction_game.py
 # Jogo de reação: pressione o botão quando ver o LED verde
+#
+# Os tempos são medidos em microssegundos: o estímulo é marcado logo após os
+# LEDs travarem a cor (MatrizLED.acender_estimulo) e a pressão pela borda do
+# botão, capturada por interrupção (CapturaBorda). Pressões durante a espera
+# com a matriz apagada, ou rápidas demais para serem reação ao LED, são
+# queimadas de largada: a rodada recomeça e a pontuação é penalizada.
 
 import config
-from utime import sleep, ticks_ms, ticks_diff
+from utime import sleep, ticks_us, ticks_diff
 import urandom
-from utils import contagem_regressiva
+import memoria
+from utils import contagem_regressiva, EstatisticasStream, CapturaBorda
+
+# Reação mais rápida que isso é antecipação, não resposta ao LED (us)
+REACAO_MINIMA_US = 100000
+# Penalidade na pontuação (ms) por queimada de largada
+PENALIDADE_QUEIMADA_MS = 100
 
 class ReactionGame:
+    # Heap que a partida pode usar (ver Stage.ORCAMENTO_MEMORIA)
+    ORCAMENTO_MEMORIA = 6 * 1024
+    # A pontuação é o melhor tempo de reação (ms): no placar, menor é melhor
+    PONTUACAO_MENOR_MELHOR = True
+    
     def __init__(self, display, matriz, buzzer, botoes):
         """Inicializa o jogo de reação"""
         self.display = display
         self.matriz = matriz
         self.buzzer = buzzer
         self.botoes = botoes
-        self.resultados = []  # Lista para armazenar os tempos de reação
         self.rodadas = 3      # Número de rodadas
         
         # Cores disponíveis para o jogo
@@ -23,6 +39,19 @@ class ReactionGame:
             config.COR_VERMELHO, # Vermelho - distrator
             config.COR_BRANCO    # Branco - distrator
         ]
+        
+        # Estatísticas dos tempos de reação em us (memória constante, sem guardar as amostras)
+        self.resultados = EstatisticasStream(0, config.LED_MAX_TIME * 1000, top_k=10)
+        
+        # Borda do botão A marcada por interrupção
+        self.captura = CapturaBorda(self.botoes.button_a)
+        
+        self.reset()
+    
+    def reset(self):
+        """Estado de início de partida"""
+        self.resultados.zerar()
+        self.queimadas = 0  # Queimadas de largada na partida
     
     def iniciar(self):
         """Inicia o jogo de reação"""
@@ -42,52 +71,65 @@ class ReactionGame:
         contagem_regressiva(self.display, self.buzzer)
         
         self.buzzer.tocar_start()
-        self.resultados = []  # Limpa resultados anteriores
+        self.reset()  # Limpa resultados anteriores
         
         # Laço principal: rodadas de teste de reação
-        for i in range(self.rodadas):
-            self.display.mostrar_mensagem([
-                f"Rodada {i+1}/{self.rodadas}",
-                "Aguarde..."
-            ])
-            
-            # Executa uma rodada
-            if not self._executar_rodada():
-                # Se retornou False, houve game over
-                return None
+        self.captura.ativar()
+        try:
+            for i in range(self.rodadas):
+                self.display.mostrar_mensagem([
+                    f"Rodada {i+1}/{self.rodadas}",
+                    "Aguarde..."
+                ])
+                
+                # Executa uma rodada
+                if not self._executar_rodada():
+                    # Se retornou False, houve game over
+                    return None
+        finally:
+            self.captura.desativar()
         
         # Toca melodia de fim de jogo se concluiu todas as rodadas
-        if len(self.resultados) > 0:
+        if self.resultados.n > 0:
             self.buzzer.tocar_fim_jogo()
             
             # Exibe os tempos no OLED
-            self.display.exibir_tempos(self.resultados)
+            self.display.exibir_tempos(self.resultados.ranking(), ordenado=True, em_us=True)
             
             # Calcular estatísticas
-            tempo_medio = sum(self.resultados) / len(self.resultados)
-            melhor_tempo = min(self.resultados)
+            tempo_medio = self.resultados.media
+            melhor_tempo = self.resultados.melhor()
+            mediana = self.resultados.mediana()
+            p90 = self.resultados.percentil(90)
+            desvio = self.resultados.desvio()
             
             # Rolar para baixo e mostrar estatísticas adicionais
             sleep(3)  # Tempo para visualizar o ranking
             self.display.mostrar_mensagem([
-                "Estatisticas:",
-                f"Media: {tempo_medio/1000:.3f}s",
-                f"Melhor: {melhor_tempo/1000:.3f}s",
-                "Botao B para continuar"
+                "Estatisticas (ms):",
+                f"Media: {tempo_medio/1000:.1f}",
+                f"Mediana: {mediana/1000:.1f}",
+                f"P90: {p90/1000:.1f}",
+                f"Melhor: {melhor_tempo/1000:.1f}",
+                f"Queimadas: {self.queimadas}"
             ])
             
             # Também exibe os resultados no terminal (útil para debug)
-            print("Tempos de reação (em milissegundos):")
-            for i, tempo in enumerate(self.resultados, 1):
-                print(f"Tentativa {i}: {tempo} ms")
-            print(f"Tempo médio: {tempo_medio:.2f} ms")
-            print(f"Melhor tempo: {melhor_tempo:.2f} ms")
+            print("Melhores tempos de reação (em milissegundos):")
+            for i, tempo in enumerate(self.resultados.ranking(), 1):
+                print(f"{i}. {tempo/1000:.3f} ms")
+            print(f"Tentativas: {self.resultados.n}, queimadas: {self.queimadas}")
+            print(f"Tempo médio: {tempo_medio/1000:.3f} ms (desvio {desvio/1000:.3f} ms)")
+            print(f"Mediana: {mediana/1000:.1f} ms, p90: {p90/1000:.1f} ms")
+            print(f"Melhor tempo: {melhor_tempo/1000:.3f} ms")
+            memoria.amostrar()
             
             # Aguarda o botão B ser pressionado para continuar
             self.botoes.aguardar_botao_b()
             
-            # O score para este jogo é o tempo médio (quanto menor, melhor)
-            return melhor_tempo
+            # O score para este jogo é o melhor tempo em ms (quanto menor,
+            # melhor), acrescido da penalidade pelas queimadas
+            return (melhor_tempo + 500) // 1000 + self.queimadas * PENALIDADE_QUEIMADA_MS
         else:
             # Se não tiver resultados, mostra mensagem
             self.display.mostrar_mensagem([
@@ -97,20 +139,61 @@ class ReactionGame:
             sleep(2)
             return None
     
+    def _aguardar(self, espera_us):
+        """
+        Espera com a matriz apagada, vigiando o botão
+        Retorna False se houve pressão antes da hora (queimada de largada)
+        """
+        inicio = ticks_us()
+        while ticks_diff(ticks_us(), inicio) < espera_us:
+            if self.captura.pressao() is not None:
+                return False
+        return True
+    
+    def _queimada(self):
+        """Registra e sinaliza uma queimada de largada"""
+        self.queimadas += 1
+        self.matriz.apagar()
+        self.buzzer.tocar_som(220, 300)
+        self.display.mostrar_mensagem([
+            "Queimou a largada!",
+            f"+{PENALIDADE_QUEIMADA_MS} ms de penalidade",
+            "Espere o LED verde"
+        ])
+        sleep(1.5)
+        self.captura.limpar()
+    
     def _executar_rodada(self):
         """
-        Executa uma rodada do jogo de reação
+        Executa uma rodada do jogo de reação (recomeça após uma queimada de largada)
         Retorna True se a rodada foi concluída com sucesso, False se houve game over
         """
+        while True:
+            resultado = self._tentar_rodada()
+            if resultado is not None:
+                return resultado
+            self._queimada()
+    
+    def _tentar_rodada(self):
+        """
+        Mostra os distratores e a luz verde
+        Retorna True/False como _executar_rodada, ou None em uma queimada de largada
+        """
         # Número de distratores (de 1 a 3 luzes antes da verde)
         num_distratores = urandom.randint(1, 3)
         
+        # Tempo máximo que a luz ficará acesa (em microssegundos)
+        tempo_maximo = config.LED_MAX_TIME * 1000
+        
         # Loop para mostrar os distratores e a cor alvo (verde)
         for j in range(num_distratores + 1):
             self.matriz.apagar()  # Garante que os LEDs estejam apagados antes de iniciar
+            self.captura.limpar()
+            memoria.amostrar()  # Fora da medição: o laço de espera não é interrompido
             
-            espera = urandom.uniform(0.8, 2.0)  # Tempo de espera aleatório entre as luzes
-            sleep(espera)  # Aguarda o tempo gerado
+            # Tempo de espera aleatório entre as luzes, vigiando o botão
+            if not self._aguardar(urandom.randint(800000, 2000000)):
+                return None
             
             # Gera posição aleatória para o LED
             x, y = self.matriz.posicao_aleatoria()
@@ -122,35 +205,33 @@ class ReactionGame:
                 # Seleciona uma cor distratora aleatória (não verde)
                 cor_atual = self.cores[urandom.randint(1, 3)]
             
-            # Acende o LED na posição aleatória com a cor selecionada
-            self.matriz.acender_led_cor(x, y, cor_atual)
-            
-            t_inicio = ticks_ms()  # Marca o tempo atual
-            
-            # Verifica se o botão é pressionado enquanto a luz está acesa
-            botao_pressionado = False
-            t_reacao = 0
+            # Acende o LED; o tempo conta a partir de quando a cor aparece
+            t_estimulo = self.matriz.acender_estimulo(x, y, cor_atual)
             
-            # Tempo máximo que a luz ficará acesa (1 segundo)
-            tempo_maximo = config.LED_MAX_TIME  # em milissegundos
-            
-            while ticks_diff(ticks_ms(), t_inicio) < tempo_maximo:
-                if self.botoes.esta_pressionado_a():  # Botão pressionado
-                    botao_pressionado = True
-                    t_atual = ticks_ms()
-                    t_reacao = ticks_diff(t_atual, t_inicio)
+            # Aguarda a pressão enquanto a luz está acesa (mais a janela de
+            # confirmação, para uma pressão no último instante)
+            t_pressao = None
+            limite = tempo_maximo + self.captura.confirmacao_us
+            while ticks_diff(ticks_us(), t_estimulo) < limite:
+                t_pressao = self.captura.pressao()
+                if t_pressao is not None:
                     break
             
-            # Verifica se o botão foi pressionado e se a cor era verde
-            if botao_pressionado:
+            t_reacao = ticks_diff(t_pressao, t_estimulo) if t_pressao is not None else None
+            if t_reacao is not None and t_reacao < REACAO_MINIMA_US:
+                # Pressionou antes de a luz aparecer, ou rápido demais para ter visto
+                return None
+            
+            # Verifica se o botão foi pressionado a tempo e se a cor era verde
+            if t_reacao is not None and t_reacao <= tempo_maximo:
                 if cor_atual == self.cores[0]:  # Verde
                     # Acertou! Era verde e clicou
                     self.buzzer.bipe_reacao()
-                    self.resultados.append(t_reacao)
+                    self.resultados.adicionar(t_reacao)
                     
                     # Exibe o resultado da rodada
                     self.display.mostrar_mensagem([
-                        f"Tempo: {t_reacao/1000:.3f}s",
+                        f"Tempo: {t_reacao/1000:.1f} ms",
                         "Muito bem!"
                     ])
                     
@@ -181,4 +262,4 @@ class ReactionGame:
             
             self.matriz.apagar()  # Apaga o LED após o período de exibição
         
-        return True  # Se chegou até aqui, a rodada foi concluída com sucesso
\ No newline at end of file
+        return True  # Se chegou até aqui, a rodada foi concluída com sucesso
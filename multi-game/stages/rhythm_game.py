@@ -1,36 +1,95 @@
 # stages/rhythm_game.py
 # Jogo de ritmo: pressione os botões no tempo certo
+#
+# As notas vêm de uma partitura (components/partitura.py) e cada uma tem um
+# instante-alvo absoluto em ticks_us, calculado a partir do início da música;
+# o laço só compara o relógio com esses prazos, então atrasos de um quadro
+# (escrita na matriz, OLED) não se acumulam, e dorme até o mais próximo deles. Várias notas podem estar caindo
+# ao mesmo tempo nas duas faixas. As pressões são marcadas por interrupção
+# (CapturaBorda) e julgadas pelo erro em milissegundos em relação ao alvo.
 
 import config
-from utime import sleep, ticks_ms, ticks_diff
-import urandom
-from utils import contagem_regressiva
+import memoria
+from utime import sleep, sleep_us, ticks_us, ticks_add, ticks_diff
+from utils import contagem_regressiva, CapturaBorda
+from components import partitura
+
+# Tempo que uma nota leva do topo da matriz até a zona de batida (us)
+QUEDA_US = 1000000
+# Intervalo entre quadros da matriz e entre atualizações do OLED (us)
+QUADRO_US = 20000
+HUD_US = 250000
+# Notas caindo ao mesmo tempo, no máximo
+MAX_NOTAS = 16
+
+# Janelas de julgamento: (erro máximo em ms, resultado, pontos)
+JANELAS = (
+    (40, "PERFEITO", 10),
+    (80, "BOM", 5),
+    (130, "OK", 2),
+)
+JANELA_MAX_US = JANELAS[-1][0] * 1000
 
 class RhythmGame:
+    # Heap que a partida pode usar (ver Stage.ORCAMENTO_MEMORIA)
+    ORCAMENTO_MEMORIA = 8 * 1024
+
     def __init__(self, display, matriz, buzzer, botoes):
         """Inicializa o jogo de ritmo"""
         self.display = display
         self.matriz = matriz
         self.buzzer = buzzer
         self.botoes = botoes
-        self.pontuacao = 0
-        self.total_notas = 20  # Total de notas em uma música
-        
+
         # Definição de faixas (tracks) para as notas caírem
         self.tracks = [
             {"x": 1, "botao": 1, "cor": config.COR_VERDE},    # Faixa esquerda (Botão A)
             {"x": 3, "botao": 2, "cor": config.COR_VERMELHO}  # Faixa direita (Botão B)
         ]
-        
+
         # Mapeamento de faixa para nota musical
         self.track_notas = {
             0: "C4",  # Faixa esquerda
             1: "G4"   # Faixa direita
         }
-        
+
         # Zona de batida (hit zone) - altura onde a nota deve ser pressionada
         self.hit_zone_y = 0
-    
+
+        # Pressões de cada faixa, marcadas por interrupção
+        self.capturas = (CapturaBorda(self.botoes.button_a), CapturaBorda(self.botoes.button_b))
+
+        # Notas em voo, em vagas fixas: instante-alvo (ticks_us), faixa e duração (us)
+        self.alvos = [0] * MAX_NOTAS
+        self.faixas = [0] * MAX_NOTAS
+        self.duracoes = [0] * MAX_NOTAS
+        self.ativas = bytearray(MAX_NOTAS)
+
+        self.partitura = None  # Carregada na primeira partida
+
+        self.reset()
+
+    def reset(self):
+        """Estado de início de partida"""
+        self.pontuacao = 0
+        self.contagem = [0] * (len(JANELAS) + 2)  # Por resultado, mais FALTA e ERRADO
+        self.erro_total_ms = 0                    # Soma dos erros das notas acertadas
+        self.mensagem = ""                        # Último resultado, para o HUD
+        for i in range(MAX_NOTAS):
+            self.ativas[i] = 0
+        self.som_ate = None  # Instante em que o som da nota acertada termina
+
+    def _carregar_partitura(self):
+        """Partitura de config.RITMO_PARTITURA, ou uma aleatória se não houver arquivo"""
+        if self.partitura is None:
+            try:
+                self.partitura = partitura.carregar(config.RITMO_PARTITURA)
+            except (OSError, ValueError) as e:
+                print(f"Partitura {config.RITMO_PARTITURA} indisponivel ({e}); usando aleatoria")
+                self.partitura = partitura.aleatoria()
+        self.partitura.reiniciar()
+        return self.partitura
+
     def iniciar(self):
         """Inicia o jogo de ritmo"""
         # Mensagem inicial no display
@@ -41,176 +100,216 @@ class RhythmGame:
             "a linha inferior",
             "Pressione para iniciar"
         ])
-        
+
         # Aguarda qualquer botão ser pressionado para iniciar
         self.botoes.aguardar_qualquer_botao()
-        
+
         # Contador regressivo
         contagem_regressiva(self.display, self.buzzer)
-        
+
         # Reinicia pontuação
-        self.pontuacao = 0
-        
+        self.reset()
+        musica = self._carregar_partitura()
+
         # Mostra a interface do jogo
         self._mostrar_interface()
-        
-        # Gera sequência de notas (0 = esquerda/A, 1 = direita/B)
-        notas = []
-        for _ in range(self.total_notas):
-            track = urandom.randint(0, 1)
-            notas.append(track)
-        
-        # Tempo entre notas (em segundos)
-        tempo_entre_notas = 1.5
-        
-        # Executa a música (as notas)
-        nota_atual = 0
-        while nota_atual < len(notas):
-            # Pega a próxima nota
-            track = notas[nota_atual]
-            
-            # Exibe informações no display
-            self.display.mostrar_mensagem([
-                "Jogo de Ritmo",
-                f"Pontuacao: {self.pontuacao}",
-                f"Nota: {nota_atual+1}/{len(notas)}"
-            ])
-            
-            # Animação da nota caindo
-            resultado = self._animar_nota_caindo(track, tempo_entre_notas)
-            
-            # Atualiza pontuação com base no resultado
-            if resultado == "perfeito":
-                self.pontuacao += 10
-            elif resultado == "bom":
-                self.pontuacao += 5
-            elif resultado == "ok":
-                self.pontuacao += 2
-            # Sem pontos para "errado"
-            
-            # Avança para a próxima nota
-            nota_atual += 1
-        
+
+        for captura in self.capturas:
+            captura.ativar()
+        try:
+            self._tocar(musica)
+        finally:
+            for captura in self.capturas:
+                captura.desativar()
+            self.buzzer.silenciar()
+            self.matriz.apagar()
+
         # Fim do jogo
+        acertos = sum(self.contagem[:len(JANELAS)])
+        print("Resultado do ritmo:")
+        for i, (_, nome, _) in enumerate(JANELAS):
+            print(f"  {nome}: {self.contagem[i]}")
+        print(f"  FALTA: {self.contagem[-2]}, ERRADO: {self.contagem[-1]}")
+        if acertos:
+            print(f"  Erro medio: {self.erro_total_ms // acertos} ms")
+
         self.buzzer.tocar_fim_jogo()
         self.display.mostrar_mensagem([
             "Ritmo Completo!",
             f"Pontuacao: {self.pontuacao}",
-            f"Max Possivel: {self.total_notas * 10}",
+            f"Max Possivel: {musica.notas * JANELAS[0][2]}",
+            f"Acertos: {acertos}/{musica.notas}",
             "Pressione para continuar"
         ])
-        
+
         # Aguarda botão para continuar
         self.botoes.aguardar_qualquer_botao()
-        
+
         return self.pontuacao
-    
+
     def _mostrar_interface(self):
         """Mostra a interface básica do jogo de ritmo"""
         # Limpa tudo
         self.matriz.apagar()
-        
+
         # Mostra as duas faixas
         for track in self.tracks:
             # Acende LED na hit zone para indicar onde pressionar
             self.matriz.acender_led_cor(track["x"], self.hit_zone_y, track["cor"])
             sleep(0.2)
-        
+
         # Apaga os LEDs da hit zone após mostrar
         for track in self.tracks:
             self.matriz.apagar_led(track["x"], self.hit_zone_y)
-    
-    def _animar_nota_caindo(self, track_idx, tempo_total):
+
+    # === ESCALONADOR ===
+    def _tocar(self, musica):
+        """
+        Toca a música até a última nota ser julgada
+        Tudo é guiado por prazos absolutos: a música começa em 'inicio'
+        (uma queda depois de agora, para a primeira nota cair do topo)
+        """
+        agora = ticks_us()
+        inicio = ticks_add(agora, QUEDA_US)
+        proxima = musica.proxima()
+        proximo_quadro = agora
+        proximo_hud = agora
+        self.mensagem = ""
+        hud = None
+        # A pressão só chega depois da confirmação da captura: a nota espera
+        # esse tempo além da última janela, ou uma pressão no fim dela seria
+        # contada como FALTA e depois como ERRADO
+        expiracao = JANELA_MAX_US + max(self.capturas[0].confirmacao_us, self.capturas[1].confirmacao_us)
+
+        while proxima is not None or any(self.ativas):
+            agora = ticks_us()
+
+            # Notas cuja queda já começou entram em vagas livres
+            while proxima is not None and ticks_diff(agora, ticks_add(inicio, proxima[0] - QUEDA_US)) >= 0:
+                self._agendar(ticks_add(inicio, proxima[0]), proxima[1], proxima[2])
+                proxima = musica.proxima()
+
+            # Pressões de cada faixa (instante da borda, não do laço)
+            for faixa in range(2):
+                t = self.capturas[faixa].pressao()
+                if t is not None:
+                    self._julgar(faixa, t)
+
+            # Notas que passaram da última janela (e da confirmação) sem pressão
+            for i in range(MAX_NOTAS):
+                if self.ativas[i] and ticks_diff(agora, self.alvos[i]) > expiracao:
+                    self.ativas[i] = 0
+                    self._resultado(len(JANELAS), self.faixas[i])
+
+            if self.som_ate is not None and ticks_diff(agora, self.som_ate) >= 0:
+                self.buzzer.silenciar()
+                self.som_ate = None
+
+            # Quadro da matriz no seu prazo; quadros atrasados são pulados
+            if ticks_diff(agora, proximo_quadro) >= 0:
+                self._desenhar(agora)
+                proximo_quadro = ticks_add(proximo_quadro, QUADRO_US)
+                if ticks_diff(agora, proximo_quadro) >= 0:
+                    proximo_quadro = ticks_add(agora, QUADRO_US)
+
+            # O OLED é lento: só é redesenhado quando algo mudou
+            if ticks_diff(agora, proximo_hud) >= 0:
+                estado = (self.pontuacao, self.mensagem, musica.bpm)
+                if estado != hud:
+                    hud = estado
+                    self.display.mostrar_mensagem([
+                        "Jogo de Ritmo",
+                        f"Pontuacao: {self.pontuacao}",
+                        f"BPM: {musica.bpm}",
+                        self.mensagem
+                    ])
+                    memoria.amostrar()
+                proximo_hud = ticks_add(agora, HUD_US)
+
+            # Dorme até o prazo mais próximo em vez de girar no relógio; as
+            # pressões têm o instante marcado pela interrupção, então são
+            # julgadas com o mesmo erro ao acordar
+            prazo = self._proximo_prazo(proximo_quadro, proximo_hud, proxima, inicio, expiracao)
+            espera = ticks_diff(prazo, ticks_us())
+            if espera > 0:
+                sleep_us(espera)
+
+    def _proximo_prazo(self, prazo, proximo_hud, proxima, inicio, expiracao):
         """
-        Anima uma nota caindo na faixa especificada
-        track_idx: índice da faixa (0 ou 1)
-        tempo_total: tempo total da animação
-        Retorna: resultado da batida ("perfeito", "bom", "ok", "errado")
+        O primeiro instante em que o laço tem algo a fazer: quadro, OLED, início
+        da queda da próxima nota, fim da janela de uma nota em voo ou fim do som
         """
-        track = self.tracks[track_idx]
-        x = track["x"]
-        botao = track["botao"]
-        cor = track["cor"]
-        
-        # Níveis de altura para a animação (de cima para baixo)
-        alturas = [4, 3, 2, 1, 0]  # 0 é a linha inferior (hit zone)
-        
-        # Tempo por frame da animação
-        tempo_por_frame = tempo_total / len(alturas)
-        
-        # Inicializa variáveis para acompanhar o timing
-        acertou = False
-        timing_error = 0
-        botao_pressionado = None
-        
-        # Para cada nível de altura
-        for i, y in enumerate(alturas):
-            # Mostra a nota na posição atual
-            self.matriz.acender_led_cor(x, y, cor)
-            
-            # Toca som se for a primeira vez que a nota aparece
-            if i == 0:
-                nota = self.track_notas[track_idx]
-                self.buzzer.tocar_nota(nota, 100)
-            
-            # Tempo de início deste frame
-            t_inicio = ticks_ms()
-            
-            # Tempo limite para este frame
-            tempo_limite = tempo_por_frame * 1000  # em ms
-            
-            # Verifica se o botão é pressionado durante este frame
-            while ticks_diff(ticks_ms(), t_inicio) < tempo_limite:
-                # Verifica botão A
-                if self.botoes.esta_pressionado_a() and not acertou:
-                    botao_pressionado = 1
-                    timing_error = abs(y - self.hit_zone_y)  # Distância da hit zone
-                    acertou = True
-                    break
-                
-                # Verifica botão B
-                if self.botoes.esta_pressionado_b() and not acertou:
-                    botao_pressionado = 2
-                    timing_error = abs(y - self.hit_zone_y)  # Distância da hit zone
-                    acertou = True
-                    break
-            
-            # Apaga o LED da posição atual
-            self.matriz.apagar_led(x, y)
-            
-            # Se acertou neste frame, interrompe a animação
-            if acertou:
+        if ticks_diff(proximo_hud, prazo) < 0:
+            prazo = proximo_hud
+        if proxima is not None:
+            queda = ticks_add(inicio, proxima[0] - QUEDA_US)
+            if ticks_diff(queda, prazo) < 0:
+                prazo = queda
+        for i in range(MAX_NOTAS):
+            if self.ativas[i]:
+                expira = ticks_add(self.alvos[i], expiracao + 1)
+                if ticks_diff(expira, prazo) < 0:
+                    prazo = expira
+        if self.som_ate is not None and ticks_diff(self.som_ate, prazo) < 0:
+            prazo = self.som_ate
+        return prazo
+
+    def _agendar(self, alvo, faixa, duracao_us):
+        """Coloca uma nota em uma vaga livre (sem vaga, a nota é perdida)"""
+        for i in range(MAX_NOTAS):
+            if not self.ativas[i]:
+                self.alvos[i] = alvo
+                self.faixas[i] = faixa
+                self.duracoes[i] = duracao_us
+                self.ativas[i] = 1
+                return
+        print("RhythmGame: notas demais em voo")
+
+    def _julgar(self, faixa, t):
+        """Julga uma pressão na faixa pela nota mais próxima do instante t"""
+        melhor = None
+        melhor_erro = JANELA_MAX_US + 1
+        for i in range(MAX_NOTAS):
+            if self.ativas[i] and self.faixas[i] == faixa:
+                erro = abs(ticks_diff(t, self.alvos[i]))
+                if erro < melhor_erro:
+                    melhor, melhor_erro = i, erro
+        if melhor is None:
+            # Pressão sem nota por perto (ou no botão da outra faixa)
+            self._resultado(len(JANELAS) + 1, faixa)
+            return
+        self.ativas[melhor] = 0
+        erro_ms = melhor_erro // 1000
+        for resultado, (limite_ms, _, _) in enumerate(JANELAS):
+            if erro_ms <= limite_ms:
                 break
-        
-        # Avalia o resultado
-        resultado = "errado"
-        
-        if acertou:
-            # Verifica se pressionou o botão correto
-            if botao_pressionado == botao:
-                # Avalia o timing
-                if timing_error == 0:
-                    resultado = "perfeito"
-                    self.display.texto("PERFEITO!", 30, 30)
-                    self.buzzer.tocar_nota(self.track_notas[track_idx], 150)
-                elif timing_error == 1:
-                    resultado = "bom"
-                    self.display.texto("BOM!", 45, 30)
-                    self.buzzer.tocar_nota(self.track_notas[track_idx], 100)
-                else:
-                    resultado = "ok"
-                    self.display.texto("OK", 55, 30)
-                    self.buzzer.tocar_nota(self.track_notas[track_idx], 80)
-            else:
-                # Botão errado
-                self.display.texto("ERRADO!", 35, 30)
-                self.buzzer.tocar_som(200, 200)  # Som de erro
+        self.erro_total_ms += erro_ms
+        self._resultado(resultado, faixa, self.duracoes[melhor])
+
+    def _resultado(self, resultado, faixa, duracao_us=0):
+        """Pontua e dá o retorno (som e mensagem) de um resultado"""
+        self.contagem[resultado] += 1
+        if resultado < len(JANELAS):
+            _, nome, pontos = JANELAS[resultado]
+            self.pontuacao += pontos
+            self.mensagem = f"{nome}!"
+            self.buzzer.ligar(config.NOTAS[self.track_notas[faixa]])
+            self.som_ate = ticks_add(ticks_us(), max(duracao_us, 50000))
         else:
-            # Não pressionou nenhum botão
-            self.display.texto("FALTA!", 40, 30)
-            self.buzzer.tocar_som(200, 200)  # Som de erro
-        
-        # Exibe o resultado brevemente
-        sleep(0.3)
-        
-        return resultado
\ No newline at end of file
+            self.mensagem = "FALTA!" if resultado == len(JANELAS) else "ERRADO!"
+            self.buzzer.ligar(200)  # Som de erro
+            self.som_ate = ticks_add(ticks_us(), 100000)
+
+    def _desenhar(self, agora):
+        """Desenha as notas em voo na altura correspondente ao tempo até o alvo"""
+        matriz = self.matriz
+        matriz.limpar_buffer()
+        for i in range(MAX_NOTAS):
+            if self.ativas[i]:
+                falta = ticks_diff(self.alvos[i], agora)
+                # Altura proporcional ao tempo restante (4 = topo, 0 = zona de batida)
+                y = (falta * 4 + QUEDA_US // 2) // QUEDA_US
+                y = 0 if y < 0 else 4 if y > 4 else y
+                track = self.tracks[self.faixas[i]]
+                matriz.definir_led(track["x"], y, track["cor"])
+        matriz.mostrar()
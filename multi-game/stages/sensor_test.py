@@ -2,12 +2,17 @@
 # Utilitário para testar e calibrar o sensor MPU-6050
 
 import config
+import memoria
 from utime import sleep, ticks_ms, ticks_diff
-from machine import I2C, Pin, SoftI2C
+from components.hardware import contexto
+from components.mpu6050 import g_para_contagens, AX, AY, TEMP
 import math
 
 class SensorTest:
-    def __init__(self, display, matriz, buzzer, botoes):
+    # Heap que a partida pode usar (ver Stage.ORCAMENTO_MEMORIA)
+    ORCAMENTO_MEMORIA = 16 * 1024
+    
+    def __init__(self, display, matriz, buzzer, botoes, hw=None):
         """Inicializa o teste de sensor"""
         self.display = display
         self.matriz = matriz
@@ -15,24 +20,13 @@ class SensorTest:
         self.botoes = botoes
         
         # Configuração do MPU-6050
-        try:
-            # Tenta inicializar o I2C em hardware
-            self.i2c = I2C(0, scl=Pin(1), sda=Pin(0), freq=400000)
-            print("I2C inicializado com ID 0")
-        except Exception as e:
-            print(f"Erro ao inicializar I2C: {e}")
-            # Fallback para SoftI2C
-            self.i2c = SoftI2C(scl=Pin(1), sda=Pin(0), freq=100000)
-            print("Usando SoftI2C")
-        
-        self.mpu_addr = 0x68  # Endereço padrão do MPU-6050
-        
-        # Verifica se o sensor está presente
-        self.sensor_presente = self.mpu_addr in self.i2c.scan()
-        if self.sensor_presente:
-            # Inicializa o sensor
-            self.i2c.writeto_mem(self.mpu_addr, 0x6B, b'\x00')  # Acorda o MPU-6050
-            sleep(0.1)
+        hw = hw if hw is not None else contexto()
+        self.mpu = hw.mpu
+        self.sensor_presente = hw.sensor_presente
+    
+    def reset(self):
+        """Sem estado de partida: a instância pode ser reutilizada como está"""
+        pass
     
     def iniciar(self):
         """Inicia o utilitário de teste de sensor"""
@@ -51,6 +45,7 @@ class SensorTest:
         opcoes = [
             "Visualizacao ao vivo",
             "Calibracao",
+            "Calibracao termica",
             "Teste na matriz LED",
             "Voltar"
         ]
@@ -63,7 +58,9 @@ class SensorTest:
                 self._visualizacao_ao_vivo()
             elif selecao == 1:  # Calibração
                 self._calibracao()
-            elif selecao == 2:  # Teste na matriz LED
+            elif selecao == 2:  # Calibração térmica do giroscópio
+                self._calibracao_termica()
+            elif selecao == 3:  # Teste na matriz LED
                 self._teste_matriz()
             else:  # Voltar
                 break
@@ -75,63 +72,6 @@ class SensorTest:
         from utils import navegar_menu
         return navegar_menu(self.display, self.botoes, titulo, opcoes)
     
-    def _ler_mpu6050(self):
-        """Lê os dados do acelerômetro e giroscópio do MPU-6050"""
-        try:
-            # Lê os dados do acelerômetro e giroscópio (registros 0x3B-0x48)
-            data = self.i2c.readfrom_mem(self.mpu_addr, 0x3B, 14)
-            
-            # Converte os dados (cada valor é de 16 bits, em complemento de 2)
-            accel_x = (data[0] << 8) | data[1]
-            accel_y = (data[2] << 8) | data[3]
-            accel_z = (data[4] << 8) | data[5]
-            
-            # Pula a temperatura (bytes 6 e 7)
-            
-            gyro_x = (data[8] << 8) | data[9]
-            gyro_y = (data[10] << 8) | data[11]
-            gyro_z = (data[12] << 8) | data[13]
-            
-            # Converte para valor com sinal
-            if accel_x > 32767:
-                accel_x -= 65536
-            if accel_y > 32767:
-                accel_y -= 65536
-            if accel_z > 32767:
-                accel_z -= 65536
-            
-            if gyro_x > 32767:
-                gyro_x -= 65536
-            if gyro_y > 32767:
-                gyro_y -= 65536
-            if gyro_z > 32767:
-                gyro_z -= 65536
-            
-            # Converte para unidades g (±2g) e graus/s (±250°/s)
-            accel_x_g = accel_x / 16384.0
-            accel_y_g = accel_y / 16384.0
-            accel_z_g = accel_z / 16384.0
-            
-            gyro_x_deg = gyro_x / 131.0
-            gyro_y_deg = gyro_y / 131.0
-            gyro_z_deg = gyro_z / 131.0
-            
-            return {
-                'accel': {
-                    'x': accel_x_g,
-                    'y': accel_y_g,
-                    'z': accel_z_g
-                },
-                'gyro': {
-                    'x': gyro_x_deg,
-                    'y': gyro_y_deg,
-                    'z': gyro_z_deg
-                }
-            }
-        except Exception as e:
-            print(f"Erro ao ler MPU-6050: {e}")
-            return None
-    
     def _visualizacao_ao_vivo(self):
         """Mostra os valores do sensor em tempo real"""
         self.display.mostrar_mensagem([
@@ -147,7 +87,7 @@ class SensorTest:
                 break
             
             # Lê os dados do sensor
-            dados = self._ler_mpu6050()
+            dados = self.mpu.ler()
             if dados:
                 # Exibe os valores no display
                 self.display.limpar()
@@ -157,6 +97,7 @@ class SensorTest:
                 self.display.texto(f"Z:{dados['accel']['z']:.2f}", 0, 30, False)
                 self.display.texto("Bot. B: Sair", 0, 50, True)
             
+            memoria.amostrar()
             sleep(0.2)
     
     def _calibracao(self):
@@ -189,7 +130,7 @@ class SensorTest:
                 "Nao mova o dispositivo!"
             ])
             
-            dados = self._ler_mpu6050()
+            dados = self.mpu.ler()
             if dados:
                 soma_accel_x += dados['accel']['x']
                 soma_accel_y += dados['accel']['y']
@@ -198,6 +139,7 @@ class SensorTest:
                 soma_gyro_y += dados['gyro']['y']
                 soma_gyro_z += dados['gyro']['z']
             
+            memoria.amostrar()
             sleep(0.1)
         
         # Calcula as médias
@@ -226,6 +168,83 @@ class SensorTest:
         ])
         self.botoes.aguardar_qualquer_botao()
     
+    def _calibracao_termica(self):
+        """
+        Ajusta o bias do giroscópio em função da temperatura e salva o modelo
+        O dispositivo deve ficar parado enquanto aquece (por exemplo, logo após
+        ligar): quanto maior a variação de temperatura, melhor a inclinação
+        """
+        from components.bias_termico import AjusteBiasTermico, CONTAGENS_POR_C, Q
+        
+        self.display.mostrar_mensagem([
+            "Calibracao termica",
+            "Deixe parado",
+            "enquanto aquece",
+            "A: iniciar  B: parar"
+        ])
+        self.botoes.aguardar_botao_a()
+        
+        # O ajuste é feito sobre as leituras sem compensação
+        compensacao = self.mpu.compensacao
+        self.mpu.compensacao = None
+        ajuste = AjusteBiasTermico()
+        duracao_ms = config.BIAS_TERMICO_DURACAO_S * 1000
+        inicio = ticks_ms()
+        ultima_tela = inicio - 1000
+        
+        try:
+            while ticks_diff(ticks_ms(), inicio) < duracao_ms:
+                # Botão B encerra a coleta antes do tempo
+                if self.botoes.esta_pressionado_b():
+                    break
+                
+                raw = self.mpu.ler_raw()
+                if raw:
+                    ajuste.adicionar(raw)
+                
+                # Atualiza o progresso uma vez por segundo
+                agora = ticks_ms()
+                if raw and ticks_diff(agora, ultima_tela) >= 1000:
+                    self.display.mostrar_mensagem([
+                        "Calibrando...",
+                        f"Temp: {raw[TEMP] / 340 + 36.53:.1f} C",
+                        f"Variacao: {ajuste.faixa_c():.1f} C",
+                        f"Tempo: {ticks_diff(agora, inicio) // 1000} s",
+                        "B: encerrar"
+                    ])
+                    ultima_tela = agora
+                    memoria.amostrar()
+                
+                sleep(0.05)
+        finally:
+            self.mpu.compensacao = compensacao
+        
+        modelo = ajuste.ajustar()
+        if modelo is None or ajuste.n < 20:
+            self.display.mostrar_mensagem([
+                "Calibracao termica",
+                "Amostras",
+                "insuficientes"
+            ])
+            sleep(2)
+            return
+        
+        modelo.salvar(config.BIAS_TERMICO_ARQUIVO)
+        self.mpu.compensacao = modelo
+        
+        # Inclinação de cada eixo em °/s por °C
+        def dps_por_c(k):
+            return k * CONTAGENS_POR_C / (1 << Q) / 131
+        
+        self.display.mostrar_mensagem([
+            f"Variacao: {ajuste.faixa_c():.1f} C",
+            f"X:{dps_por_c(modelo.kx):.3f} dps/C",
+            f"Y:{dps_por_c(modelo.ky):.3f} dps/C",
+            f"Z:{dps_por_c(modelo.kz):.3f} dps/C",
+            "Pressione para continuar"
+        ])
+        self.botoes.aguardar_qualquer_botao()
+    
     def _teste_matriz(self):
         """Testa a visualização da inclinação na matriz de LEDs"""
         self.display.mostrar_mensagem([
@@ -249,28 +268,28 @@ class SensorTest:
             
             # Atualiza a posição a cada 200ms
             if ticks_diff(tempo_atual, ultima_atualizacao) > 200:
-                # Lê os dados do sensor
-                dados = self._ler_mpu6050()
-                if dados:
+                # Lê os dados do sensor (contagens brutas)
+                raw = self.mpu.ler_raw()
+                if raw:
                     # Calcula a nova posição com base na inclinação
                     novo_x = x
                     novo_y = y
                     
-                    # Ajusta a sensibilidade
-                    sensibilidade = 0.3
+                    # Ajusta a sensibilidade (0.3 g em contagens)
+                    sensibilidade = g_para_contagens(0.3)
                     
                     # Atualiza X (accel_y move no eixo X da matriz)
-                    if dados['accel']['y'] > sensibilidade:
+                    if raw[AY] > sensibilidade:
                         novo_x = max(0, x - 1)  # Move para a esquerda
-                    elif dados['accel']['y'] < -sensibilidade:
+                    elif raw[AY] < -sensibilidade:
                         novo_x = min(4, x + 1)  # Move para a direita
                     
                     # CORREÇÃO: Inverte a direção do eixo Y
                     # Antes: inclinação para frente (accel_x positivo) movia para baixo
                     # Agora: inclinação para frente (accel_x positivo) move para cima
-                    if dados['accel']['x'] > sensibilidade:
+                    if raw[AX] > sensibilidade:
                         novo_y = max(0, y - 1)  # Move para cima (quando inclina para frente)
-                    elif dados['accel']['x'] < -sensibilidade:
+                    elif raw[AX] < -sensibilidade:
                         novo_y = min(4, y + 1)  # Move para baixo (quando inclina para trás)
                     
                     # Atualiza a posição se mudou
@@ -283,6 +302,7 @@ class SensorTest:
                     self.matriz.acender_led_cor(x, y, config.COR_AZUL)
                 
                 ultima_atualizacao = tempo_atual
+                memoria.amostrar()
             
             sleep(0.01)
         
@@ -0,0 +1,184 @@
+# stages/snake_game.py
+# Jogo da cobrinha: guie a cobra com o joystick e coma sem bater
+#
+# A lógica roda a cada 20 ms lendo o joystick; a cobra anda a cada
+# 'intervalo' ms, que diminui com a pontuação. As viradas lidas entre dois
+# passos ficam em uma fila curta, então uma virada dupla rápida (ex.: cima e
+# logo esquerda) não se perde quando as duas acontecem antes do passo.
+
+import config
+import uasyncio as asyncio
+from utils import contagem_regressiva_async
+from stages.base import Stage
+from cobra import Cobra, DIREITA, ESQUERDA, CIMA, BAIXO, BATEU, COMEU, VENCEU
+
+# Direções do joystick (Joystick.ler_direcao) na cobra
+DIRECOES = {'dir': DIREITA, 'esq': ESQUERDA, 'cima': CIMA, 'baixo': BAIXO}
+
+# Intervalo entre passos da cobra (ms): começa em INICIAL e cai POR_PONTO a
+# cada comida, até MINIMO
+INTERVALO_INICIAL_MS = 400
+INTERVALO_MINIMO_MS = 120
+INTERVALO_POR_PONTO_MS = 20
+
+# Viradas guardadas entre dois passos
+FILA_VIRADAS = 2
+
+class SnakeGame(Stage):
+    # Joystick e lógica a cada 20ms, matriz a cada 40ms, display a cada 500ms
+    PERIODO_LOGICA_MS = 20
+    PERIODO_MATRIZ_MS = 40
+    PERIODO_HUD_MS = 500
+
+    # Heap que a partida pode usar (ver Stage.ORCAMENTO_MEMORIA)
+    ORCAMENTO_MEMORIA = 6 * 1024
+
+    def __init__(self, display, matriz, buzzer, botoes, hw=None):
+        """Inicializa o jogo da cobrinha"""
+        super().__init__(display, matriz, buzzer, botoes, hw)
+
+        # Joystick do contexto compartilhado (None se não puder ser inicializado)
+        self.joystick = self.hw.joystick
+
+        # Tabuleiro (pode ser maior que a matriz: ela mostra uma janela 5x5)
+        self.cobra = Cobra(config.COBRA_LARGURA, config.COBRA_ALTURA)
+
+        # Fila de viradas: buffer circular de FILA_VIRADAS direções
+        self.viradas = bytearray(FILA_VIRADAS)
+
+        self.reset()
+
+    def reset(self):
+        """Estado de início de partida"""
+        self.cobra.reiniciar()
+        self.pontuacao = 0
+        self.intervalo = INTERVALO_INICIAL_MS
+        self.acumulado = 0       # ms desde o último passo da cobra
+        self.resultado = None    # BATEU, VENCEU ou None (saiu com o botão B)
+        self.direcao_lida = None # Última direção lida do joystick
+        self.inicio_fila = 0
+        self.tamanho_fila = 0
+
+    async def iniciar_async(self):
+        """Inicia o jogo da cobrinha"""
+        # Verifica se o joystick está disponível
+        if self.joystick is None:
+            self.display.mostrar_mensagem([
+                "Erro!",
+                "Joystick",
+                "nao encontrado!"
+            ])
+            await asyncio.sleep_ms(3000)
+            return None
+
+        # Mensagem inicial no display
+        self.display.mostrar_mensagem([
+            "Jogo da Cobrinha",
+            "Use o joystick",
+            "Coma o vermelho",
+            "Bot. B para sair",
+            "Pressione para",
+            "iniciar"
+        ])
+
+        # Aguarda qualquer botão ser pressionado para iniciar
+        await self.botoes.aguardar_qualquer_botao_async()
+
+        # Contador regressivo
+        await contagem_regressiva_async(self.display, self.buzzer)
+
+        # Reinicia a partida
+        self.reset()
+
+        # Laço principal do jogo (passo fixo, ver stages/base.py), até bater
+        await self.executar_laco_async()
+
+        # Fim do jogo
+        if self.resultado == VENCEU:
+            self.buzzer.tocar_fim_jogo()
+            titulo = "Voce venceu!"
+        else:
+            self.buzzer.tocar_game_over()
+            titulo = "Game Over!"
+        self.display.mostrar_mensagem([
+            titulo,
+            f"Tamanho: {self.cobra.tamanho}",
+            f"Pontuacao: {self.pontuacao}",
+            "Pressione para continuar"
+        ])
+        self.matriz.apagar()
+
+        # Aguarda botão para continuar
+        await self.botoes.aguardar_qualquer_botao_async()
+
+        return self.pontuacao
+
+    def ler_sensor(self):
+        """Lê o joystick e enfileira cada nova direção"""
+        direcao = self.joystick.ler_direcao()
+        if direcao != self.direcao_lida:
+            self.direcao_lida = direcao
+            if direcao is not None:
+                self._enfileirar(DIRECOES[direcao])
+
+    def _enfileirar(self, direcao):
+        """Guarda uma virada para os próximos passos (descarta repetidas e reversões)"""
+        if self.tamanho_fila:
+            ultima = self.viradas[(self.inicio_fila + self.tamanho_fila - 1) % FILA_VIRADAS]
+        else:
+            ultima = self.cobra.direcao
+        if direcao == ultima or direcao == ultima ^ 1 or self.tamanho_fila == FILA_VIRADAS:
+            return
+        self.viradas[(self.inicio_fila + self.tamanho_fila) % FILA_VIRADAS] = direcao
+        self.tamanho_fila += 1
+
+    def update(self, dt):
+        """Anda a cobra quando o intervalo se completa, aplicando uma virada da fila"""
+        # Verifica se o botão B foi pressionado (sair)
+        if self.botoes.foi_pressionado_b():
+            self.parar()
+            return
+
+        self.acumulado += dt
+        if self.acumulado < self.intervalo:
+            return
+        self.acumulado -= self.intervalo
+
+        if self.tamanho_fila:
+            self.cobra.virar(self.viradas[self.inicio_fila])
+            self.inicio_fila = (self.inicio_fila + 1) % FILA_VIRADAS
+            self.tamanho_fila -= 1
+
+        resultado = self.cobra.passo()
+        if resultado == COMEU or resultado == VENCEU:
+            self.pontuacao += 1
+            self.buzzer.tocar_som(880, 80)
+            self.intervalo = max(INTERVALO_MINIMO_MS,
+                                 INTERVALO_INICIAL_MS - self.pontuacao * INTERVALO_POR_PONTO_MS)
+        if resultado == BATEU or resultado == VENCEU:
+            self.resultado = resultado
+            self.parar()
+
+    def render(self):
+        """Desenha a janela 5x5 do tabuleiro em volta da cabeça"""
+        cobra = self.cobra
+        matriz = self.matriz
+        matriz.limpar_buffer()
+        ox, oy = cobra.janela()
+        for y in range(min(5, cobra.altura)):
+            celula = (oy + y) * cobra.largura + ox
+            for x in range(min(5, cobra.largura)):
+                if cobra.ocupada(celula + x):
+                    matriz.definir_led(x, y, config.COR_AZUL)
+                elif celula + x == cobra.comida:
+                    matriz.definir_led(x, y, config.COR_VERMELHO)
+        matriz.mostrar()
+
+    def render_hud(self):
+        """Atualiza o display com pontuação e tamanho"""
+        self.display.mostrar_mensagem([
+            "Jogo da Cobrinha",
+            f"Pontuacao: {self.pontuacao}",
+            f"Tamanho: {self.cobra.tamanho}",
+            "Bot. B para sair"
+        ])
@@ -1,70 +1,316 @@
 # stages/stage_manager.py
 # Gerenciador de etapas do jogo
 
-from components.display import Display
-from components.matriz_led import MatrizLED
-from components.buzzer import Buzzer
-from utime import sleep
-from utils import Botoes, Joystick, navegar_menu
+from components.hardware import contexto
+from components.energia import GerenciadorEnergia
+from components.placar import Placar
+from utime import ticks_ms, ticks_diff
+import uasyncio as asyncio
+import sys
+import gc
+from utils import navegar_menu_async
+from runtime import executar
+from profiler import Profiler, PERFIL_NULO
+from memoria import TelemetriaMemoria
+from stages.base import Stage
+import config
 
 class StageManager:
-    def __init__(self):
-        """Inicializa o gerenciador de etapas com os componentes básicos"""
-        # Inicializa componentes de hardware
-        self.display = Display()
-        self.matriz = MatrizLED()
-        self.buzzer = Buzzer()
-        self.botoes = Botoes()
-        
-        # Inicializa o joystick
-        try:
-            self.joystick = Joystick()
+    def __init__(self, hw=None):
+        """
+        Inicializa o gerenciador de etapas com os componentes básicos
+        hw: contexto de hardware (por padrão, o compartilhado do programa);
+            os periféricos já criados, como no reset do main.py, são reaproveitados
+        """
+        self.hw = hw if hw is not None else contexto()
+        self.display = self.hw.display
+        self.matriz = self.hw.matriz
+        self.buzzer = self.hw.buzzer
+        self.botoes = self.hw.botoes
+        
+        # Joystick (None se não puder ser inicializado)
+        self.joystick = self.hw.joystick
+        if self.joystick:
             print("Joystick inicializado com sucesso")
-        except Exception as e:
-            print(f"Erro ao inicializar joystick: {e}")
-            self.joystick = None
+        
+        # Sensor usado para acordar a placa do modo de economia de energia
+        self.mpu = self.hw.mpu
+        self.energia = GerenciadorEnergia(self.display, self.matriz, self.buzzer,
+                                          self.botoes, self.mpu)
         
         # Lista de etapas disponíveis
         self.stages = []
         self.stage_names = []
         
-        # Pontuação do jogador em cada etapa
+        # Instâncias de etapas já criadas (índice -> etapa) e ordem de uso,
+        # da menos para a mais recente (ver config.CACHE_ETAPAS)
+        self.instancias = {}
+        self.ordem_uso = []
+        
+        # Coletas em pontos seguros e uso de memória por etapa
+        self.memoria = TelemetriaMemoria()
+        
+        # Pontuação do jogador em cada etapa (sessão atual)
         self.scores = {}
+        
+        # Placar persistente e, por etapa, se pontuação menor é melhor
+        self.placar = None
+        if config.PLACAR_ARQUIVO:
+            try:
+                self.placar = Placar(config.PLACAR_ARQUIVO, config.PLACAR_MAX_REGISTROS,
+                                     config.PLACAR_TOP_N)
+            except OSError as e:
+                print(f"Erro ao abrir o placar: {e}")
+        self.menor_melhor = {}
     
     def adicionar_etapa(self, stage_class, stage_name):
         """
         Adiciona uma etapa ao jogo
-        stage_class: Classe da etapa
+        stage_class: Classe da etapa, ou o caminho "modulo.Classe" (ex.:
+                     "stages.tilt_game.TiltGame") para importar o módulo só
+                     quando a etapa for escolhida e descarregá-lo quando ela
+                     deixar de ser usada
         stage_name: Nome para exibição
         """
         self.stages.append(stage_class)
         self.stage_names.append(stage_name)
     
+    def _carregar_etapa(self, indice):
+        """Retorna a classe da etapa, importando o módulo se ela foi registrada por caminho"""
+        etapa = self.stages[indice]
+        if not isinstance(etapa, str):
+            return etapa
+        modulo, classe = etapa.rsplit(".", 1)
+        __import__(modulo)
+        return getattr(sys.modules[modulo], classe)
+    
+    def _descarregar_etapa(self, indice):
+        """Remove da memória o módulo de uma etapa registrada por caminho"""
+        etapa = self.stages[indice]
+        if isinstance(etapa, str):
+            modulo = etapa.rsplit(".", 1)[0]
+            sys.modules.pop(modulo, None)
+            # O pacote também guarda uma referência ao submódulo
+            if "." in modulo:
+                pacote, nome = modulo.rsplit(".", 1)
+                try:
+                    delattr(sys.modules[pacote], nome)
+                except (KeyError, AttributeError):
+                    pass
+        gc.collect()
+    
+    def _criar_etapa(self, indice):
+        """Constrói uma nova instância da etapa de índice dado"""
+        classe = self._carregar_etapa(indice)
+        if issubclass(classe, Stage):
+            return classe(self.display, self.matriz, self.buzzer, self.botoes, self.hw)
+        return classe(self.display, self.matriz, self.buzzer, self.botoes)
+    
+    def _obter_etapa(self, indice):
+        """
+        Retorna a etapa pronta para uma nova partida: a instância guardada,
+        reiniciada com reset(), ou uma nova (guardada se tiver reset())
+        """
+        stage = self.instancias.get(indice)
+        if stage is not None:
+            self.ordem_uso.remove(indice)
+            self.ordem_uso.append(indice)
+            stage.reset()
+            return stage
+        
+        # Abre espaço na cache (CACHE_ETAPAS = 0: cache desligada, nada a descartar)
+        while self.ordem_uso and len(self.instancias) >= config.CACHE_ETAPAS:
+            self._descartar_etapa()
+        try:
+            stage = self._criar_etapa(indice)
+        except MemoryError:
+            # Sem memória: libera todas as etapas guardadas e tenta de novo
+            while self.instancias:
+                self._descartar_etapa()
+            stage = self._criar_etapa(indice)
+        
+        if config.CACHE_ETAPAS > 0 and hasattr(stage, 'reset'):
+            self.instancias[indice] = stage
+            self.ordem_uso.append(indice)
+        return stage
+    
+    def _descartar_etapa(self):
+        """Remove da cache a etapa usada há mais tempo e descarrega seu módulo"""
+        indice = self.ordem_uso.pop(0)
+        del self.instancias[indice]
+        self._descarregar_etapa(indice)
+    
+    def _aliviar_memoria(self):
+        """
+        Descarta etapas da cache (menos recentes primeiro) se o heap estiver
+        baixo; chamado logo após uma coleta
+        """
+        if not hasattr(gc, 'mem_free'):
+            return
+        while self.ordem_uso and gc.mem_free() < config.CACHE_HEAP_MINIMO:
+            self._descartar_etapa()
+    
+    async def _jogar_etapa(self, indice):
+        """Obtém e executa a etapa de índice dado; retorna a pontuação"""
+        nome = self.stage_names[indice]
+        amostragem = None
+        if config.MEMORIA_TELEMETRIA:
+            # A base é medida antes de criar a etapa: a construção conta no orçamento
+            registro = self.memoria.iniciar_etapa(nome)
+            amostragem = asyncio.create_task(self.memoria.tarefa_amostragem(config.MEMORIA_PERIODO_MS))
+        
+        # A construção fica dentro do try: se falhar (ex.: MemoryError), a
+        # amostragem ainda é cancelada e a etapa encerrada
+        try:
+            stage = self._obter_etapa(indice)
+            self.menor_melhor[nome] = getattr(stage, 'PONTUACAO_MENOR_MELHOR', False)
+            if amostragem:
+                registro.orcamento = getattr(stage, 'ORCAMENTO_MEMORIA', None)
+            return await self._executar_etapa(stage, nome)
+        finally:
+            stage = None
+            # Etapas fora da cache não são mais usadas: o módulo sai da memória
+            if indice not in self.instancias:
+                self._descarregar_etapa(indice)
+            
+            # Coleta no ponto seguro de saída (com o relatório, se ativo)
+            if amostragem:
+                amostragem.cancel()
+                self.memoria.encerrar_etapa()
+                print(self.memoria.relatorio(registro))
+                if registro.excedeu():
+                    print(f"AVISO: {nome} usou {registro.usado()} B, "
+                          f"acima do orcamento de {registro.orcamento} B")
+            else:
+                self.memoria.coletar()
+            self._aliviar_memoria()
+    
+    def _registrar_pontuacao(self, stage_name, score):
+        """
+        Guarda a pontuação na sessão e no placar persistente
+        Retorna (posição no ranking, 0 = recorde, ou None; recorde atual)
+        """
+        self.scores[stage_name] = score
+        if self.placar is None:
+            return None, None
+        menor_melhor = self.menor_melhor.get(stage_name, False)
+        try:
+            posicao = self.placar.registrar(stage_name, score, menor_melhor)
+            return posicao, self.placar.recorde(stage_name, menor_melhor)
+        except OSError as e:
+            print(f"Erro ao gravar o placar: {e}")
+            return None, None
+    
     def limpar_hardware(self):
         """
         Limpa todos os componentes de hardware para estado neutro
         Chamado entre jogos para garantir que não há resíduos visuais/sonoros
         """
         try:
-            # Limpa display
-            self.display.limpar()
-            
-            # Apaga todos os LEDs
-            self.matriz.apagar()
-            
-            # Garante que o buzzer esteja silencioso
-            self.buzzer.buzzer.duty_u16(0)
-            
+            # Limpa display, apaga os LEDs e silencia o buzzer (e a fila de sons)
+            self.hw.reset()
             print("Hardware limpo entre jogos")
         except Exception as e:
             print(f"Erro ao limpar hardware: {e}")
     
+    def _entrada_pressionada(self):
+        """Verifica se algum botão (A, B ou centro do joystick) está pressionado"""
+        return ((self.joystick and self.joystick.botao_central_pressionado()) or
+                self.botoes.esta_pressionado_a() or
+                self.botoes.esta_pressionado_b())
+    
+    async def _aguardar_entrada_async(self, inatividade_ms=None):
+        """
+        Aguarda qualquer botão (A, B ou centro do joystick)
+        Retorna True quando houve entrada ou False se inatividade_ms se esgotou
+        """
+        inicio = ticks_ms()
+        while True:
+            if self._entrada_pressionada():
+                await asyncio.sleep_ms(200)
+                return True
+            if inatividade_ms and ticks_diff(ticks_ms(), inicio) > inatividade_ms:
+                return False
+            await asyncio.sleep_ms(50)
+    
+    def _perfil_ativo(self, stage_name):
+        """Verifica se a etapa deve ser medida pelo profiler (config.PERFIL_ETAPAS)"""
+        return config.PERFIL_ETAPAS is True or stage_name in config.PERFIL_ETAPAS
+    
+    def _instrumentar(self, perfil, stage):
+        """Mede os ganchos da etapa e os acessos ao hardware (I2C, NeoPixel, OLED, buzzer)"""
+        # Ganchos do laço de passo fixo (etapas derivadas de Stage)
+        if isinstance(stage, Stage):
+            perfil.instrumentar(stage, "_passo", "quadro")
+            perfil.instrumentar(stage, "ler_sensor", "sensor")
+            perfil.instrumentar(stage, "update", "logica")
+            perfil.instrumentar(stage, "render", "matriz")
+            perfil.instrumentar(stage, "render_hud", "hud")
+        # Subsistemas
+        perfil.instrumentar(getattr(stage, 'mpu', None), "ler_raw", "i2c")
+        perfil.instrumentar(self.matriz.np, "write", "neopixel")
+        perfil.instrumentar(self.display.oled, "show", "oled")
+        perfil.instrumentar(self.buzzer, "tocar_som", "buzzer")
+    
+    async def _executar_etapa(self, stage, stage_name):
+        """
+        Executa uma etapa já construída e retorna sua pontuação
+        Aplica a gravação/reprodução de trace do sensor conforme config.py
+        Etapas derivadas de Stage rodam como corrotinas; as demais são
+        bloqueantes e tocam o som diretamente, sem a tarefa de som
+        """
+        mpu = getattr(stage, 'mpu', None)
+        if mpu is not None:
+            if config.REPRODUZIR_TRACE_SENSOR:
+                from components.sensor_trace import ReprodutorTrace
+                stage.mpu = ReprodutorTrace(config.REPRODUZIR_TRACE_SENSOR, tempo_real=True, repetir=True)
+                stage.sensor_presente = True
+                print(f"Reproduzindo trace {config.REPRODUZIR_TRACE_SENSOR}")
+            elif config.GRAVAR_TRACE_SENSOR and mpu.presente:
+                mpu.gravar("trace_" + stage_name.lower().replace(" ", "_") + ".bin")
+        
+        # Sem perfil para a etapa, PERFIL_NULO não instrumenta nem relata nada
+        perfil = Profiler() if self._perfil_ativo(stage_name) else PERFIL_NULO
+        self._instrumentar(perfil, stage)
+        
+        fila = self.buzzer.fila
+        try:
+            if isinstance(stage, Stage):
+                return await stage.iniciar_async()
+            self.buzzer.fila = None
+            return stage.iniciar()
+        finally:
+            self.buzzer.fila = fila
+            # Relatório pela serial e, opcionalmente, em arquivo (PERFIL_NULO ignora)
+            perfil.desinstrumentar()
+            titulo = f"Perfil: {stage_name}"
+            perfil.imprimir(titulo)
+            if config.PERFIL_SALVAR:
+                perfil.salvar("perfil_" + stage_name.lower().replace(" ", "_") + ".txt", titulo)
+            if mpu is not None:
+                stage.mpu.parar_gravacao()
+                if stage.mpu is not mpu:
+                    # A instância pode ser reutilizada: volta ao sensor real
+                    stage.mpu.fechar()
+                    stage.mpu = mpu
+                    stage.sensor_presente = mpu.presente
+    
     def iniciar_menu(self):
-        """Exibe o menu principal do jogo"""
+        """Exibe o menu principal do jogo (bloqueia até o jogador sair)"""
+        executar(self.iniciar_menu_async(), self.buzzer, self.botoes)
+    
+    async def iniciar_menu_async(self):
+        """Menu principal como corrotina, com as tarefas de entrada e som em paralelo"""
+        # Sem uso por este tempo, a placa dorme até ser movida
+        inatividade_ms = config.INATIVIDADE_MENU_S * 1000
+        
         while True:
             # Limpa hardware antes de mostrar o menu
             self.limpar_hardware()
             
+            # Ponto seguro: coleta agora para o GC não disparar durante um jogo
+            self.memoria.coletar()
+            
             # Opções do menu
             opcoes = self.stage_names + ["Sair"]
             
@@ -89,50 +335,45 @@ class StageManager:
             self.display.mostrar_mensagem(instrucoes)
             self.buzzer.tocar_start()
             
-            # Aguarda input para entrar no menu
-            if self.joystick:
-                while True:
-                    if (self.joystick.botao_central_pressionado() or 
-                        self.botoes.esta_pressionado_a() or 
-                        self.botoes.esta_pressionado_b()):
-                        sleep(0.2)
-                        break
-                    sleep(0.05)
-            else:
-                self.botoes.aguardar_qualquer_botao()
+            # Aguarda input para entrar no menu (ou dorme após inatividade)
+            if not await self._aguardar_entrada_async(inatividade_ms):
+                self.energia.dormir_ate_movimento()
+                continue
             
             # Navega no menu com joystick
-            selecao = navegar_menu(self.display, self.botoes, "Menu Principal", opcoes, self.joystick)
+            selecao = await navegar_menu_async(self.display, self.botoes, "Menu Principal", opcoes,
+                                         self.joystick, inatividade_ms)
+            if selecao is None:
+                self.energia.dormir_ate_movimento()
+                continue
             
             # Verifica a seleção
             if selecao < len(self.stages):
                 # Inicia a etapa selecionada
-                stage = self.stages[selecao](self.display, self.matriz, self.buzzer, self.botoes)
-                score = stage.iniciar()
+                score = await self._jogar_etapa(selecao)
                 
-                # Armazena pontuação
+                # Armazena pontuação (sessão e placar no flash)
+                posicao = recorde = None
                 if score is not None:
-                    self.scores[self.stage_names[selecao]] = score
+                    posicao, recorde = self._registrar_pontuacao(self.stage_names[selecao], score)
                 
                 # Mostra resultado
+                if posicao == 0:
+                    ranking = "NOVO RECORDE!"
+                elif posicao is not None:
+                    ranking = f"Ranking: {posicao + 1}o lugar"
+                else:
+                    ranking = f"Recorde: {recorde}" if recorde is not None else " "
                 self.display.mostrar_mensagem([
                     f"Etapa: {self.stage_names[selecao]}",
                     f"Pontuacao: {score}" if score is not None else "Sem pontuacao",
+                    ranking,
                     "Pressione qualquer", 
                     "botao para continuar"
                 ])
                 
                 # Aguarda input para continuar
-                if self.joystick:
-                    while True:
-                        if (self.joystick.botao_central_pressionado() or 
-                            self.botoes.esta_pressionado_a() or 
-                            self.botoes.esta_pressionado_b()):
-                            sleep(0.2)
-                            break
-                        sleep(0.05)
-                else:
-                    self.botoes.aguardar_qualquer_botao()
+                await self._aguardar_entrada_async()
                 
                 # LIMPEZA GLOBAL: Remove todos os resíduos visuais/sonoros
                 # antes de voltar ao menu principal
@@ -142,11 +383,12 @@ class StageManager:
                 # Sair
                 self.display.mostrar_mensagem(["Obrigado " ,"por jogar!"])
                 self.buzzer.tocar_fim_jogo()
+                await self.buzzer.aguardar_fila()
                 # Limpa hardware antes de sair
                 self.limpar_hardware()
                 break
     
-    def _iniciar_modo_desafio(self):
+    async def _iniciar_modo_desafio(self):
         """Inicia todas as etapas em sequência (modo desafio)"""
         total_score = 0
         
@@ -158,19 +400,10 @@ class StageManager:
         ])
         
         # Aguarda input para iniciar
-        if self.joystick:
-            while True:
-                if (self.joystick.botao_central_pressionado() or 
-                    self.botoes.esta_pressionado_a() or 
-                    self.botoes.esta_pressionado_b()):
-                    sleep(0.2)
-                    break
-                sleep(0.05)
-        else:
-            self.botoes.aguardar_qualquer_botao()
+        await self._aguardar_entrada_async()
         
         # Executa todas as etapas
-        for i, stage_class in enumerate(self.stages):
+        for i in range(len(self.stages)):
             self.display.mostrar_mensagem([
                 f"Etapa {i+1}/{len(self.stages)}:",
                 self.stage_names[i],
@@ -178,20 +411,10 @@ class StageManager:
             ])
             
             # Aguarda input para iniciar etapa
-            if self.joystick:
-                while True:
-                    if (self.joystick.botao_central_pressionado() or 
-                        self.botoes.esta_pressionado_a() or 
-                        self.botoes.esta_pressionado_b()):
-                        sleep(0.2)
-                        break
-                    sleep(0.05)
-            else:
-                self.botoes.aguardar_qualquer_botao()
+            await self._aguardar_entrada_async()
             
             # Inicia a etapa
-            stage = stage_class(self.display, self.matriz, self.buzzer, self.botoes)
-            score = stage.iniciar()
+            score = await self._jogar_etapa(i)
             
             if score is not None:
                 total_score += score
@@ -205,16 +428,7 @@ class StageManager:
             ])
             
             # Aguarda input para continuar
-            if self.joystick:
-                while True:
-                    if (self.joystick.botao_central_pressionado() or 
-                        self.botoes.esta_pressionado_a() or 
-                        self.botoes.esta_pressionado_b()):
-                        sleep(0.2)
-                        break
-                    sleep(0.05)
-            else:
-                self.botoes.aguardar_qualquer_botao()
+            await self._aguardar_entrada_async()
             
             # Limpa hardware entre etapas do modo desafio
             self.limpar_hardware()
@@ -226,18 +440,10 @@ class StageManager:
             "Pressione para voltar"
         ])
         self.buzzer.tocar_fim_jogo()
+        await self.buzzer.aguardar_fila()
         
         # Aguarda input para voltar
-        if self.joystick:
-            while True:
-                if (self.joystick.botao_central_pressionado() or 
-                    self.botoes.esta_pressionado_a() or 
-                    self.botoes.esta_pressionado_b()):
-                    sleep(0.2)
-                    break
-                sleep(0.05)
-        else:
-            self.botoes.aguardar_qualquer_botao()
+        await self._aguardar_entrada_async()
         
         # Limpa hardware ao final do modo desafio
         self.limpar_hardware()
\ No newline at end of file
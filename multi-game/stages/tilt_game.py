@@ -1,44 +1,47 @@
 # stages/tilt_game.py
 # Jogo de inclinação: controle um LED na matriz inclinando o dispositivo
+#
+# A bola é um corpo com física de ponto fixo (fisica.py), integrado a 100 Hz:
+# a inclinação acelera a bola, o atrito a freia e as bordas a fazem quicar.
 
 import config
-from utime import sleep, ticks_ms, ticks_diff
+import uasyncio as asyncio
 import urandom
-from utils import contagem_regressiva
-from machine import I2C, Pin, SoftI2C
+from utils import contagem_regressiva_async
+from stages.base import Stage
+from components.mpu6050 import AX, AY
+from fisica import Corpo, Caixa, desenhar_suave
 
-class TiltGame:
-    def __init__(self, display, matriz, buzzer, botoes):
+class TiltGame(Stage):
+    # Física a cada 10ms (100 Hz), matriz a cada 200ms, display a cada 500ms
+    PERIODO_LOGICA_MS = 10
+    PERIODO_MATRIZ_MS = 200
+    PERIODO_HUD_MS = 500
+    
+    # Heap que a partida pode usar (ver Stage.ORCAMENTO_MEMORIA)
+    ORCAMENTO_MEMORIA = 8 * 1024
+    
+    def __init__(self, display, matriz, buzzer, botoes, hw=None):
         """Inicializa o jogo de inclinação"""
-        self.display = display
-        self.matriz = matriz
-        self.buzzer = buzzer
-        self.botoes = botoes
-        self.pontuacao = 0
+        super().__init__(display, matriz, buzzer, botoes, hw)
         self.tempo_total = 30  # segundos de jogo
-        self.objetivos_coletados = 0
         
         # Configuração do MPU-6050
-        try:
-            # Tenta inicializar o I2C em hardware
-            self.i2c = I2C(0, scl=Pin(1), sda=Pin(0), freq=400000)
-            print("I2C inicializado com ID 0")
-        except Exception as e:
-            print(f"Erro ao inicializar I2C: {e}")
-            # Fallback para SoftI2C
-            self.i2c = SoftI2C(scl=Pin(1), sda=Pin(0), freq=100000)
-            print("Usando SoftI2C")
-        
-        self.mpu_addr = 0x68  # Endereço padrão do MPU-6050
-        
-        # Verifica se o sensor está presente
-        self.sensor_presente = self.mpu_addr in self.i2c.scan()
-        if self.sensor_presente:
-            # Inicializa o sensor
-            self.i2c.writeto_mem(self.mpu_addr, 0x6B, b'\x00')  # Acorda o MPU-6050
-            sleep(0.1)
-        
-        # Posição da "bola" (LED controlado)
+        self.mpu = self.hw.mpu
+        self.sensor_presente = self.hw.sensor_presente
+        
+        # A bola se move dentro da área da matriz
+        self.bola = Corpo(Caixa(5, 5))
+        
+        self.reset()
+    
+    def reset(self):
+        """Estado de início de partida"""
+        self.pontuacao = 0
+        self.objetivos_coletados = 0
+        
+        # Posição da "bola" (LED controlado): célula ocupada pelo corpo
+        self.bola.posicionar(2, 2)
         self.bola_x = 2
         self.bola_y = 2
         
@@ -46,7 +49,10 @@ class TiltGame:
         self.objetivo_x = 0
         self.objetivo_y = 0
         
-    def iniciar(self):
+        # Última leitura do sensor (contagens brutas)
+        self.raw = None
+        
+    async def iniciar_async(self):
         """Inicia o jogo de inclinação"""
         # Verifica se o sensor está disponível
         if not self.sensor_presente:
@@ -56,7 +62,7 @@ class TiltGame:
                 "nao encontrado!",
                 "Verifique conexao"
             ])
-            sleep(3)
+            await asyncio.sleep_ms(3000)
             return None
         
         # Mensagem inicial no display
@@ -70,58 +76,21 @@ class TiltGame:
         ])
         
         # Aguarda qualquer botão ser pressionado para iniciar
-        self.botoes.aguardar_qualquer_botao()
+        await self.botoes.aguardar_qualquer_botao_async()
         
         # Contador regressivo
-        contagem_regressiva(self.display, self.buzzer)
+        await contagem_regressiva_async(self.display, self.buzzer)
         
         # Reinicia pontuação e posições
         self.pontuacao = 0
         self.objetivos_coletados = 0
+        self.bola.posicionar(2, 2)
         self.bola_x = 2
         self.bola_y = 2
         self._gerar_novo_objetivo()
         
-        # Tempo inicial
-        tempo_inicio = ticks_ms()
-        ultimo_movimento = ticks_ms()
-        ultima_atualizacao_display = ticks_ms()
-        
-        # Laço principal do jogo
-        while True:
-            tempo_atual = ticks_ms()
-            tempo_passado = ticks_diff(tempo_atual, tempo_inicio) / 1000  # em segundos
-            
-            # Verifica se o tempo acabou
-            if tempo_passado >= self.tempo_total:
-                break
-            
-            # Atualiza o display a cada 500ms
-            if ticks_diff(tempo_atual, ultima_atualizacao_display) > 500:
-                self.display.mostrar_mensagem([
-                    "Jogo de Inclinacao",
-                    f"Tempo: {int(self.tempo_total - tempo_passado)}s",
-                    f"Objetivos: {self.objetivos_coletados}",
-                    f"Pontuacao: {self.pontuacao}"
-                ])
-                ultima_atualizacao_display = tempo_atual
-            
-            # Atualiza a posição da bola a cada 200ms
-            if ticks_diff(tempo_atual, ultimo_movimento) > 200:
-                # Lê os dados do acelerômetro
-                dados = self._ler_mpu6050()
-                if dados:
-                    # Move a bola com base na inclinação
-                    self._mover_bola(dados['accel']['x'], dados['accel']['y'])
-                    # Verifica colisão com objetivo
-                    self._verificar_colisao()
-                
-                # Atualiza a matriz de LEDs
-                self._atualizar_matriz()
-                ultimo_movimento = tempo_atual
-            
-            # Pausa para economizar CPU
-            sleep(0.01)
+        # Laço principal do jogo (passo fixo, ver stages/base.py)
+        await self.executar_laco_async(self.tempo_total * 1000)
         
         # Fim do jogo
         self.buzzer.tocar_fim_jogo()
@@ -134,72 +103,45 @@ class TiltGame:
         ])
         
         # Aguarda botão para continuar
-        self.botoes.aguardar_qualquer_botao()
+        await self.botoes.aguardar_qualquer_botao_async()
         
         return self.pontuacao
     
-    def _ler_mpu6050(self):
-        """Lê os dados do acelerômetro e giroscópio do MPU-6050"""
-        try:
-            # Lê os dados do acelerômetro (registros 0x3B-0x40)
-            data = self.i2c.readfrom_mem(self.mpu_addr, 0x3B, 6)
-            
-            # Converte os dados (cada valor é de 16 bits, em complemento de 2)
-            accel_x = (data[0] << 8) | data[1]
-            accel_y = (data[2] << 8) | data[3]
-            accel_z = (data[4] << 8) | data[5]
-            
-            # Converte para valor com sinal
-            if accel_x > 32767:
-                accel_x -= 65536
-            if accel_y > 32767:
-                accel_y -= 65536
-            if accel_z > 32767:
-                accel_z -= 65536
-            
-            # Converte para unidades g (±2g)
-            accel_x_g = accel_x / 16384.0
-            accel_y_g = accel_y / 16384.0
-            accel_z_g = accel_z / 16384.0
-            
-            return {
-                'accel': {
-                    'x': accel_x_g,
-                    'y': accel_y_g,
-                    'z': accel_z_g
-                }
-            }
-        except Exception as e:
-            print(f"Erro ao ler MPU-6050: {e}")
-            return None
+    def ler_sensor(self):
+        """Lê os dados do acelerômetro (contagens brutas)"""
+        self.raw = self.mpu.ler_raw()
+    
+    def update(self, dt):
+        """Move a bola com base na inclinação e verifica colisão com objetivo"""
+        if self.raw:
+            self._mover_bola(self.raw[AX], self.raw[AY], dt)
+            self._verificar_colisao()
     
-    def _mover_bola(self, accel_x, accel_y):
-        """Move a bola com base nos dados do acelerômetro"""
-        # Calcula a nova posição com base na inclinação
-        novo_x = self.bola_x
-        novo_y = self.bola_y
-        
-        # Ajusta a sensibilidade
-        sensibilidade = 0.3
-        
-        # Atualiza X (accel_y move no eixo X da matriz)
-        if accel_y > sensibilidade:
-            novo_x = max(0, self.bola_x - 1)  # Move para a esquerda
-        elif accel_y < -sensibilidade:
-            novo_x = min(4, self.bola_x + 1)  # Move para a direita
-        
-        # CORREÇÃO: Inverte a direção do eixo Y
-        # Inclinação para frente (accel_x positivo) move para cima
-        # Inclinação para trás (accel_x negativo) move para baixo
-        if accel_x > sensibilidade:
-            novo_y = max(0, self.bola_y - 1)  # Move para cima (quando inclina para frente)
-        elif accel_x < -sensibilidade:
-            novo_y = min(4, self.bola_y + 1)  # Move para baixo (quando inclina para trás)
-        
-        # Atualiza a posição se mudou
-        if novo_x != self.bola_x or novo_y != self.bola_y:
-            self.bola_x = novo_x
-            self.bola_y = novo_y
+    def render(self):
+        """Atualiza a matriz de LEDs"""
+        self._atualizar_matriz()
+    
+    def render_hud(self):
+        """Atualiza o display com tempo, objetivos e pontuação"""
+        self.display.mostrar_mensagem([
+            "Jogo de Inclinacao",
+            f"Tempo: {self.tempo_total - self.tempo_ms // 1000}s",
+            f"Objetivos: {self.objetivos_coletados}",
+            f"Pontuacao: {self.pontuacao}"
+        ])
+    
+    def _mover_bola(self, accel_x, accel_y, dt):
+        """Integra a física da bola por dt ms com os dados do acelerômetro (em contagens brutas)"""
+        # accel_y positivo inclina para a esquerda; accel_x positivo (inclinação
+        # para frente) move para cima
+        if self.bola.passo(-accel_y, -accel_x, dt):
+            self.buzzer.tocar_som(300, 5)  # Batida na borda
+        
+        # Atualiza a célula ocupada se mudou
+        celula_x, celula_y = self.bola.celula()
+        if celula_x != self.bola_x or celula_y != self.bola_y:
+            self.bola_x = celula_x
+            self.bola_y = celula_y
             self.buzzer.tocar_som(800, 10)  # Som de movimento
     
     def _gerar_novo_objetivo(self):
@@ -227,11 +169,16 @@ class TiltGame:
     
     def _atualizar_matriz(self):
         """Atualiza a visualização na matriz de LEDs"""
-        self.matriz.apagar()
+        matriz = self.matriz
+        matriz.limpar_buffer()
         
         # Mostra o objetivo (piscando para destacar)
-        if (ticks_ms() // 200) % 2 == 0:  # Pisca a cada 200ms
-            self.matriz.acender_led_cor(self.objetivo_x, self.objetivo_y, config.COR_AMARELO)
-        
-        # Mostra a bola
-        self.matriz.acender_led_cor(self.bola_x, self.bola_y, config.COR_AZUL)
\ No newline at end of file
+        if (self.tempo_ms // 200) % 2 == 0:  # Pisca a cada 200ms
+            matriz.definir_led(self.objetivo_x, self.objetivo_y, config.COR_AMARELO)
+        
+        # Mostra a bola (entre dois LEDs quando está entre duas células)
+        if config.FISICA_SUAVIZAR:
+            desenhar_suave(matriz, self.bola.x, self.bola.y, config.COR_AZUL)
+        else:
+            matriz.definir_led(self.bola_x, self.bola_y, config.COR_AZUL)
+        matriz.mostrar()
\ No newline at end of file
@@ -0,0 +1,23 @@
+# conftest.py
+# Testes no host: os substitutos de host/ vêm antes do projeto no caminho de
+# importação, como no rodar_sensor.py e no simular.py
+#
+#   cd multi-game && python -m pytest tests
+
+import os
+import sys
+
+import pytest
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(_RAIZ, 'host'), _RAIZ]
+
+import utime
+
+@pytest.fixture
+def relogio_virtual():
+    """RelogioVirtual durante o teste (o relógio do utime é global)"""
+    relogio = utime.RelogioVirtual()
+    anterior = utime.usar_relogio(relogio)
+    yield relogio
+    utime.usar_relogio(anterior)
@@ -0,0 +1,71 @@
+# tests/test_bias_termico.py
+# Modelo térmico do bias do giroscópio: ajuste, compensação e arquivo
+
+import json
+from components.bias_termico import (AjusteBiasTermico, ModeloBiasTermico, carregar,
+                                     Q, LIMITE_DT)
+
+# Bias verdadeiro de cada eixo: offset em T_REF e inclinação por contagem de temperatura
+T_REF = -2000
+OFFSET = (120, -45, 8)
+INCLINACAO = (0.05, -0.02, 0.11)
+
+
+def _amostra(temp):
+    g = [round(o + k * (temp - T_REF)) for o, k in zip(OFFSET, INCLINACAO)]
+    return (0, 0, 16384, temp, g[0], g[1], g[2])
+
+
+def _ajuste(temperaturas):
+    ajuste = AjusteBiasTermico()
+    for temp in temperaturas:
+        ajuste.adicionar(_amostra(temp))
+    return ajuste
+
+
+def test_ajuste_recupera_a_reta_e_a_compensacao_zera_o_bias():
+    # Aquecimento de 10 °C
+    ajuste = _ajuste(range(-3700, -300, 17))
+    assert abs(ajuste.faixa_c() - 10) < 0.1
+    modelo = ajuste.ajustar()
+    for k, esperado in zip((modelo.kx, modelo.ky, modelo.kz), INCLINACAO):
+        assert abs(k / (1 << Q) - esperado) < 0.002
+    for temp in (-3700, -2000, -300):
+        _, _, _, _, gx, gy, gz = modelo.compensar(_amostra(temp))
+        assert max(abs(gx), abs(gy), abs(gz)) <= 2
+
+
+def test_sem_variacao_termica_so_o_offset_e_ajustado():
+    ajuste = _ajuste([T_REF + i % 50 for i in range(200)])
+    modelo = ajuste.ajustar()
+    assert (modelo.kx, modelo.ky, modelo.kz) == (0, 0, 0)
+    assert abs(modelo.ox - OFFSET[0]) <= 2
+
+
+def test_ajuste_sem_amostras():
+    assert AjusteBiasTermico().ajustar() is None
+
+
+def test_compensacao_satura_longe_da_referencia():
+    modelo = ModeloBiasTermico(0, (0, 0, 0), (1 << Q, 0, 0))
+    assert modelo.bias(LIMITE_DT * 3)[0] == LIMITE_DT
+    assert modelo.bias(-LIMITE_DT * 3)[0] == -LIMITE_DT
+    assert modelo.bias(100) == (100, 0, 0)
+
+
+def test_salvar_e_carregar(tmp_path):
+    caminho = str(tmp_path / "bias.json")
+    modelo = _ajuste(range(-3700, -300, 17)).ajustar()
+    modelo.salvar(caminho)
+    lido = carregar(caminho)
+    assert lido.t_ref == modelo.t_ref
+    assert lido.bias(-1000) == modelo.bias(-1000)
+
+
+def test_carregar_arquivo_ausente_ou_de_outra_versao(tmp_path):
+    assert carregar(str(tmp_path / "nada.json")) is None
+    caminho = tmp_path / "bias.json"
+    caminho.write_text(json.dumps({'versao': 99}))
+    assert carregar(str(caminho)) is None
+    caminho.write_text("{corrompido")
+    assert carregar(str(caminho)) is None
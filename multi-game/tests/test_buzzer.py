@@ -0,0 +1,48 @@
+# tests/test_buzzer.py
+# Fila da tarefa de som: cada item é tirado e ligado por Buzzer.despachar
+
+import uasyncio as asyncio
+from components.buzzer import Buzzer
+
+
+def test_despachar_tira_da_fila_e_liga():
+    buzzer = Buzzer()
+    assert buzzer.despachar() is None  # Sem tarefa de som
+    buzzer.fila = [(440, 30), (0, 10)]
+    assert buzzer.despachar() == 30
+    assert buzzer.buzzer.freq() == 440 and buzzer.buzzer.duty_u16() == 32768
+    assert buzzer.tocando
+    assert buzzer.despachar() == 10
+    assert buzzer.buzzer.duty_u16() == 0  # Pausa: silêncio
+    assert buzzer.despachar() is None
+
+
+def test_tarefa_de_som_toca_a_fila_em_ordem(relogio_virtual):
+    buzzer = Buzzer()
+    tocados = []
+    despachar = buzzer.despachar
+
+    def registrar():
+        duracao = despachar()
+        if duracao is not None:
+            tocados.append((buzzer.buzzer.freq(), duracao))
+        return duracao
+
+    buzzer.despachar = registrar
+
+    async def tocar():
+        tarefa = asyncio.create_task(buzzer.tarefa_som())
+        await asyncio.sleep_ms(0)
+        buzzer.tocar_som(440, 30)
+        buzzer.tocar_som(880, 20)
+        await buzzer.aguardar_fila()
+        tarefa.cancel()
+        try:
+            await tarefa
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(tocar())
+    assert tocados == [(440, 30), (880, 20)]
+    assert buzzer.fila is None and not buzzer.tocando
+    assert buzzer.buzzer.duty_u16() == 0
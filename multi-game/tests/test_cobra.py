@@ -0,0 +1,117 @@
+# tests/test_cobra.py
+# Motor da cobrinha: mapa de ocupação coerente com o corpo e comida uniforme
+
+import pytest
+import urandom
+import cobra as modulo
+from cobra import Cobra, ANDOU, COMEU, BATEU, VENCEU, DIREITA, ESQUERDA, CIMA, BAIXO
+
+
+def _corpo(c):
+    return [c.corpo[(c.cauda + i) % c.celulas] for i in range(c.tamanho)]
+
+
+def _verificar_invariantes(c):
+    corpo = _corpo(c)
+    assert len(set(corpo)) == len(corpo)
+    assert {i for i in range(c.celulas) if c.ocupada(i)} == set(corpo)
+    # Bits de preenchimento além da última célula contam como ocupados
+    assert all(c.ocupada(i) for i in range(c.celulas, len(c.ocupadas) * 8))
+    assert c.livres == c.celulas - c.tamanho
+    if c.livres:
+        assert 0 <= c.comida < c.celulas and not c.ocupada(c.comida)
+    else:
+        assert c.comida == -1
+
+
+@pytest.mark.parametrize("largura,altura", [(5, 5), (7, 3), (12, 12)])
+def test_ocupacao_acompanha_o_corpo_em_partidas_aleatorias(largura, altura):
+    urandom.seed(largura * altura)
+    c = Cobra(largura, altura)
+    for _ in range(30):
+        c.reiniciar()
+        _verificar_invariantes(c)
+        for _ in range(300):
+            # Vai na direção da comida quando pode, senão vira ao acaso
+            cx, cy = c.xy(c.cabeca())
+            fx, fy = c.xy(c.comida)
+            desejada = (DIREITA if fx > cx else ESQUERDA if fx < cx else
+                        CIMA if fy > cy else BAIXO)
+            c.virar(desejada if urandom.randint(0, 3) else urandom.randint(0, 3))
+            resultado = c.passo()
+            if resultado == BATEU:
+                break
+            _verificar_invariantes(c)
+            if resultado == VENCEU:
+                break
+
+
+def test_comida_e_a_k_esima_celula_livre(monkeypatch):
+    c = Cobra(5, 5)
+    c.reiniciar(x=1, y=2, tamanho=3)
+    livres = [i for i in range(c.celulas) if not c.ocupada(i)]
+    assert len(livres) == c.livres
+    sorteados = []
+    for k in range(c.livres):
+        monkeypatch.setattr(modulo.urandom, 'randint', lambda a, b, k=k: k)
+        sorteados.append(c.sortear_comida())
+    assert sorteados == livres
+
+
+def test_comida_uniforme_entre_as_celulas_livres():
+    urandom.seed(11)
+    c = Cobra(5, 5)
+    c.reiniciar(x=0, y=2, tamanho=5)  # Linha do meio inteira ocupada
+    contagem = {}
+    sorteios = 20000
+    for _ in range(sorteios):
+        celula = c.sortear_comida()
+        contagem[celula] = contagem.get(celula, 0) + 1
+    assert set(contagem) == {i for i in range(25) if not c.ocupada(i)}
+    esperado = sorteios / c.livres
+    assert all(abs(n - esperado) < 0.15 * esperado for n in contagem.values())
+
+
+def test_cabeca_entra_na_celula_que_a_cauda_deixa():
+    # Cobra de 3 células dando voltas em um tabuleiro 2 x 2
+    c = Cobra(2, 2)
+    c.reiniciar(x=0, y=1, tamanho=2)
+    c.comida = 1
+    c.virar(BAIXO)
+    assert c.passo() == COMEU and c.tamanho == 3
+    c.comida = -2  # Sem mais comida no caminho
+    for _ in range(3):
+        for direcao in (ESQUERDA, CIMA, DIREITA, BAIXO):
+            c.virar(direcao)
+            assert c.passo() == ANDOU
+            assert {i for i in range(c.celulas) if c.ocupada(i)} == set(_corpo(c))
+            assert c.livres == 1
+
+
+def test_bater_na_parede_e_no_corpo():
+    c = Cobra(5, 5)
+    c.reiniciar(x=3, y=4, tamanho=2)
+    assert c.passo() == BATEU  # Parede à direita
+    c.reiniciar(x=0, y=0, tamanho=5)
+    c.comida = -2
+    for direcao in (CIMA, ESQUERDA):
+        c.virar(direcao)
+        assert c.passo() == ANDOU
+    c.virar(BAIXO)
+    assert c.passo() == BATEU  # O próprio corpo
+
+
+def test_encher_o_tabuleiro_vence():
+    c = Cobra(3, 1)
+    c.reiniciar(x=0, y=0, tamanho=2)
+    assert c.comida == 2
+    assert c.passo() == VENCEU
+    assert c.livres == 0 and c.comida == -1
+
+
+def test_virar_para_tras_e_ignorado():
+    c = Cobra(5, 5)
+    c.virar(ESQUERDA)
+    assert c.direcao == DIREITA
+    c.virar(CIMA)
+    assert c.direcao == CIMA
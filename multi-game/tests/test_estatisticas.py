@@ -0,0 +1,68 @@
+# tests/test_estatisticas.py
+# EstatisticasStream contra as estatísticas calculadas com todas as amostras
+
+import statistics
+import urandom
+from utils import EstatisticasStream
+
+
+def _amostras(n=500):
+    urandom.seed(7)
+    return [urandom.randint(150, 600) for _ in range(n)]
+
+
+def test_media_e_desvio_iguais_aos_exatos():
+    valores = _amostras()
+    est = EstatisticasStream(0, 1000)
+    for v in valores:
+        est.adicionar(v)
+    assert est.n == len(valores)
+    assert abs(est.media - statistics.fmean(valores)) < 1e-9
+    assert abs(est.desvio() - statistics.stdev(valores)) < 1e-6
+    assert (est.minimo, est.maximo) == (min(valores), max(valores))
+
+
+def test_percentis_dentro_de_um_balde():
+    valores = _amostras()
+    est = EstatisticasStream(0, 1000, baldes=50)
+    for v in valores:
+        est.adicionar(v)
+    ordenados = sorted(valores)
+    for p in (10, 50, 90):
+        exato = ordenados[len(ordenados) * p // 100]
+        assert abs(est.percentil(p) - exato) <= est.largura
+    assert est.mediana() == est.percentil(50)
+    assert est.percentil(100) == max(valores)
+
+
+def test_valores_fora_da_faixa_nas_pontas():
+    est = EstatisticasStream(100, 200, baldes=10)
+    for v in (50, 150, 5000):
+        est.adicionar(v)
+    assert est.histograma[0] == 1 and est.histograma[-1] == 1
+    # A posição dentro do balde da ponta é desconhecida: fica entre a faixa e o extremo
+    assert 50 <= est.percentil(0) <= 100
+    assert 200 <= est.percentil(100) <= 5000
+
+
+def test_ranking_menor_e_maior_melhor():
+    valores = _amostras(100)
+    menor = EstatisticasStream(top_k=5)
+    maior = EstatisticasStream(top_k=5, menor_melhor=False)
+    for v in valores:
+        menor.adicionar(v)
+        maior.adicionar(v)
+    assert menor.ranking() == sorted(valores)[:5]
+    assert maior.ranking() == sorted(valores, reverse=True)[:5]
+    assert menor.melhor() == min(valores) and maior.melhor() == max(valores)
+
+
+def test_sem_medicoes_e_zerar():
+    est = EstatisticasStream()
+    assert est.percentil(50) is None and est.melhor() is None
+    assert est.variancia() == 0.0 and est.ranking() == []
+    est.adicionar(10)
+    assert est.variancia() == 0.0
+    est.zerar()
+    assert est.n == 0 and sum(est.histograma) == 0 and est.ranking() == []
+
@@ -0,0 +1,115 @@
+# tests/test_fisica.py
+# Física de ponto fixo: aceleração, atrito, colisões e desenho suave
+
+import pytest
+import urandom
+from components.mpu6050 import CONTAGENS_POR_G
+from fisica import (Caixa, Corpo, desenhar_suave, UNIDADE, METADE, ZONA_MORTA,
+                    VELOCIDADE_MAXIMA, QUIQUE, ACELERACAO_G, ATRITO)
+from labirinto import Labirinto
+
+G = CONTAGENS_POR_G
+
+
+class MatrizFalsa:
+    def __init__(self):
+        self.leds = {}
+
+    def definir_led(self, x, y, cor):
+        self.leds[(x, y)] = cor
+
+
+def test_parado_sem_inclinacao_ou_dentro_da_zona_morta():
+    corpo = Corpo(Caixa())
+    corpo.posicionar(2, 2)
+    for _ in range(200):
+        assert not corpo.passo(ZONA_MORTA - 1, -(ZONA_MORTA - 1), 10)
+    assert (corpo.x, corpo.y) == (2 * UNIDADE + METADE, 2 * UNIDADE + METADE)
+    assert (corpo.vx, corpo.vy) == (0, 0)
+
+
+def _acelerar(corpo, passos=300):
+    velocidades = []
+    for _ in range(passos):
+        corpo.passo(G, 0, 10)
+        velocidades.append(corpo.vx)
+    return velocidades
+
+
+def test_inclinacao_acelera_ate_a_velocidade_terminal_e_o_atrito_para():
+    corpo = Corpo(Caixa(1000, 1))
+    velocidades = _acelerar(corpo)
+    assert velocidades == sorted(velocidades)
+    # Aceleração e atrito se equilibram em ACELERACAO_G / ATRITO células/s,
+    # menos o atrito aplicado depois da aceleração em cada passo de 10 ms
+    terminal = ACELERACAO_G * UNIDADE * (1000 - 10 * ATRITO) // (1000 * ATRITO)
+    assert abs(velocidades[-1] - terminal) < terminal // 100
+    assert corpo.vy == 0 and corpo.celula()[1] == 0
+
+    for _ in range(500):
+        corpo.passo(0, 0, 10)
+    assert corpo.vx == 0
+
+
+def test_velocidade_limitada():
+    corpo = Corpo(Caixa(1000, 1), aceleracao_g=10 * ACELERACAO_G)
+    assert max(_acelerar(corpo)) == VELOCIDADE_MAXIMA * UNIDADE
+
+
+def test_colisao_encosta_quica_e_so_conta_com_velocidade():
+    corpo = Corpo(Caixa(5, 5))
+    corpo.posicionar(2, 2)
+    batidas = 0
+    for _ in range(100):
+        if corpo.passo(G, 0, 10):
+            batidas += 1
+            # Encostado na borda da última célula, voltando com parte da velocidade
+            assert corpo.x == 5 * UNIDADE - 1
+            assert -corpo.limite * QUIQUE // 100 <= corpo.vx < 0
+    assert batidas >= 1
+    # Encostado na parede e ainda inclinado: não conta como nova batida
+    for _ in range(200):
+        corpo.passo(G, 0, 10)
+    assert corpo.celula() == (4, 2)
+    assert not corpo.passo(G, 0, 10)
+
+
+def test_desliza_ao_longo_da_parede():
+    corpo = Corpo(Caixa(5, 5))
+    corpo.posicionar(4, 0)
+    for _ in range(100):
+        corpo.passo(G, G, 10)
+    assert corpo.celula() == (4, 4)
+
+
+@pytest.mark.parametrize("dt", [5, 20, 50])
+def test_nunca_atravessa_paredes_do_labirinto(dt):
+    urandom.seed(dt)
+    lab = Labirinto(6, 6)
+    corpo = Corpo(lab)
+    corpo.posicionar(lab.inicio_x, lab.inicio_y)
+    visitadas = set()
+    for i in range(3000):
+        if i % 40 == 0:
+            ax = urandom.randint(-G, G)
+            ay = urandom.randint(-G, G)
+        corpo.passo(ax, ay, dt)
+        assert not lab.parede(*corpo.celula())
+        visitadas.add(corpo.celula())
+    assert len(visitadas) > 1
+
+
+def test_desenho_suave_centralizado_e_entre_celulas():
+    matriz = MatrizFalsa()
+    desenhar_suave(matriz, 2 * UNIDADE + METADE, 1 * UNIDADE + METADE, (200, 100, 0))
+    assert matriz.leds == {(2, 1): (200, 100, 0)}
+
+    # No meio de quatro células, o brilho se reparte igualmente
+    matriz = MatrizFalsa()
+    desenhar_suave(matriz, 3 * UNIDADE, 3 * UNIDADE, (200, 100, 0))
+    assert matriz.leds == {(x, y): (50, 25, 0) for x in (2, 3) for y in (2, 3)}
+
+    # Células de parede não são pintadas; a janela desloca as coordenadas
+    matriz = MatrizFalsa()
+    desenhar_suave(matriz, 5 * UNIDADE, 5 * UNIDADE, (200, 0, 0), ox=2, oy=2, mundo=Caixa(5, 5))
+    assert matriz.leds == {(2, 2): (50, 0, 0)}
@@ -0,0 +1,84 @@
+# tests/test_labirinto.py
+# Labirintos gerados: perfeitos, com distâncias de BFS corretas até a saída
+
+from collections import deque
+import pytest
+import urandom
+from labirinto import Labirinto, INFINITO, DIRECOES
+
+TAMANHOS = [(1, 1), (2, 3), (7, 1), (15, 15), (30, 4)]
+
+
+def _labirinto(tamanho, semente):
+    urandom.seed(semente)
+    return Labirinto(*tamanho)
+
+
+def _abertas(lab):
+    return [(x, y) for y in range(lab.altura) for x in range(lab.largura) if not lab.parede(x, y)]
+
+
+@pytest.mark.parametrize("tamanho", TAMANHOS)
+@pytest.mark.parametrize("semente", [1, 2, 3])
+def test_labirinto_perfeito(tamanho, semente):
+    lab = _labirinto(tamanho, semente)
+    celulas = lab.celulas_x * lab.celulas_y
+    abertas = _abertas(lab)
+
+    # Todas as células abertas, cantos e borda fechados
+    for y in range(lab.altura):
+        for x in range(lab.largura):
+            if x % 2 and y % 2:
+                assert not lab.parede(x, y)
+            elif x % 2 == 0 and y % 2 == 0:
+                assert lab.parede(x, y)
+            if x in (0, lab.largura - 1) or y in (0, lab.altura - 1):
+                assert lab.parede(x, y)
+
+    # Conexo e com exatamente celulas - 1 passagens: uma árvore geradora,
+    # ou seja, um único caminho entre duas células quaisquer
+    assert len(abertas) == celulas + (celulas - 1)
+    assert all(lab.distancia(x, y) != INFINITO for x, y in abertas)
+
+
+@pytest.mark.parametrize("tamanho", TAMANHOS)
+def test_distancias_iguais_a_uma_bfs_independente(tamanho):
+    lab = _labirinto(tamanho, 5)
+    esperado = {(lab.saida_x, lab.saida_y): 0}
+    fila = deque(esperado)
+    while fila:
+        x, y = fila.popleft()
+        for dx, dy in DIRECOES:
+            vizinha = (x + dx, y + dy)
+            if not lab.parede(*vizinha) and vizinha not in esperado:
+                esperado[vizinha] = esperado[(x, y)] + 1
+                fila.append(vizinha)
+
+    for y in range(lab.altura):
+        for x in range(lab.largura):
+            assert lab.distancia(x, y) == esperado.get((x, y), INFINITO)
+    assert lab.distancia(-1, 0) == INFINITO
+    assert lab.distancia(lab.inicio_x, lab.inicio_y) == max(esperado.values())
+
+
+@pytest.mark.parametrize("tamanho", TAMANHOS)
+def test_dicas_levam_a_saida_pelo_caminho_mais_curto(tamanho):
+    lab = _labirinto(tamanho, 9)
+    x, y = lab.inicio_x, lab.inicio_y
+    passos = 0
+    while (x, y) != (lab.saida_x, lab.saida_y):
+        dx, dy = lab.dica(x, y)
+        x, y = x + dx, y + dy
+        assert not lab.parede(x, y)
+        passos += 1
+    assert passos == lab.distancia(lab.inicio_x, lab.inicio_y)
+    assert lab.dica(x, y) is None
+
+
+def test_janela_nao_passa_das_bordas():
+    lab = _labirinto((15, 15), 1)
+    assert lab.janela(0, 0) == (0, 0)
+    assert lab.janela(15, 15) == (13, 13)
+    assert lab.janela(lab.largura - 1, lab.altura - 1) == (lab.largura - 5, lab.altura - 5)
+    pequeno = _labirinto((1, 1), 1)
+    assert pequeno.janela(1, 1) == (0, 0)
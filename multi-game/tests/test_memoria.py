@@ -0,0 +1,37 @@
+# tests/test_memoria.py
+# Amostragem do heap pelas etapas bloqueantes (memoria.amostrar)
+
+import memoria
+from memoria import TelemetriaMemoria
+
+
+def test_amostrar_sem_etapa_nao_faz_nada():
+    memoria.amostrar()
+
+
+def test_amostrar_atualiza_o_pico_da_etapa_em_andamento(monkeypatch):
+    heap = [1000]
+    monkeypatch.setattr(memoria, 'alocado', lambda: heap[0])
+    telemetria = TelemetriaMemoria()
+    registro = telemetria.iniciar_etapa('Teste', orcamento=512)
+
+    heap[0] = 1800
+    memoria.amostrar()
+    heap[0] = 1200
+    memoria.amostrar()
+
+    assert registro.pico == 1800
+    assert registro.amostras == 2
+    assert registro.usado() == 800
+
+
+def test_encerrar_etapa_desliga_a_amostragem(monkeypatch):
+    heap = [1000]
+    monkeypatch.setattr(memoria, 'alocado', lambda: heap[0])
+    telemetria = TelemetriaMemoria()
+    registro = telemetria.iniciar_etapa('Teste')
+    telemetria.encerrar_etapa(fragmentacao=False)
+
+    heap[0] = 5000
+    memoria.amostrar()
+    assert registro.pico == 1000
@@ -0,0 +1,34 @@
+import utime
+import mpu6050_emulado as emulado
+
+def _ligar(sensor):
+    sensor.escrever(emulado.PWR_MGMT_1, b'\x00')
+
+def _accel_x(sensor):
+    dados = sensor.ler(emulado.ACCEL_XOUT_H, 2)
+    return int.from_bytes(dados, 'big')
+
+def test_amostras_seguem_o_perfil_depois_do_wrap_dos_ticks(relogio_virtual):
+    # ticks_us dá a volta em 2^30 us (~537 s): o sensor não pode congelar
+    sensor = emulado.MPU6050Emulado(emulado.perfil_inclinacao(periodo_s=7.0))
+    _ligar(sensor)
+    leituras = []
+    for _ in range(70):
+        utime.sleep(10)
+        leituras.append(_accel_x(sensor))
+    depois_do_wrap = leituras[54:]
+    assert len(set(depois_do_wrap)) > 5
+
+def test_tempo_do_emulador_acumula_alem_do_periodo_dos_ticks(relogio_virtual):
+    sensor = emulado.MPU6050Emulado()
+    for _ in range(3):
+        utime.sleep(400)
+        sensor._agora_us()  # Cada leitura do barramento consulta o relógio
+    assert sensor._agora_us() >= 1200 * 1000000
+
+def test_who_am_i_e_sleep_apos_reset():
+    sensor = emulado.MPU6050Emulado()
+    assert sensor.ler(emulado.WHO_AM_I, 1)[0] == 0x68
+    assert sensor.dormindo()
+    _ligar(sensor)
+    assert not sensor.dormindo()
@@ -0,0 +1,88 @@
+# tests/test_partitura.py
+# Formato .rtm: ida e volta, mudanças de andamento e arquivos inválidos
+
+import os
+import pytest
+import urandom
+from components import partitura
+from components.partitura import Partitura, TRILHA_ANDAMENTO
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _notas(musica):
+    notas = []
+    nota = musica.proxima()
+    while nota is not None:
+        notas.append(nota)
+        nota = musica.proxima()
+    return notas
+
+
+def test_gravar_e_carregar_devolvem_as_mesmas_notas(tmp_path):
+    caminho = str(tmp_path / "musica.rtm")
+    eventos = [(0, 0, 2), (4, 1, 2), (6, 0, 1)]
+    partitura.gravar(caminho, eventos, 120)
+    musica = partitura.carregar(caminho)
+    assert (musica.resolucao, musica.bpm_inicial, musica.notas) == (4, 120, 3)
+    # 120 BPM: 500 ms por batida, 4 ticks por batida
+    assert _notas(musica) == [(0, 0, 250000), (500000, 1, 250000), (750000, 0, 125000)]
+
+
+def test_compilar_ordena_os_eventos():
+    musica = Partitura(partitura.compilar([(4, 1, 2), (0, 0, 2)], 120))
+    assert [nota[0] for nota in _notas(musica)] == [0, 500000]
+
+
+def test_mudanca_de_andamento_conta_a_partir_do_ponto_de_mudanca():
+    R = 4
+    eventos = [(0, 0, R), (2 * R, TRILHA_ANDAMENTO, 60), (2 * R, 1, R), (3 * R, 0, R)]
+    musica = Partitura(partitura.compilar(eventos, 120, R))
+    assert musica.notas == 3
+    assert _notas(musica) == [(0, 0, 500000), (1000000, 1, 1000000), (2000000, 0, 1000000)]
+    assert musica.bpm == 60
+
+
+def test_sem_arredondamento_acumulado():
+    # 7 BPM não divide 60 s: cada batida arredonda, mas o instante da nota
+    # vem do ponto de mudança, não da soma das batidas anteriores
+    R = 3
+    musica = Partitura(partitura.compilar([(i, 0, 1) for i in range(3 * 100)], 7, R))
+    notas = _notas(musica)
+    assert notas[-1][0] == 99 * partitura.us_por_batida(7) + 2 * partitura.us_por_batida(7) // R
+
+
+def test_reiniciar_volta_ao_inicio():
+    musica = Partitura(partitura.compilar([(0, 0, 2), (4, 1, 2)], 120))
+    primeira = _notas(musica)
+    musica.reiniciar()
+    assert _notas(musica) == primeira
+
+
+def test_aleatoria_tem_as_notas_pedidas():
+    urandom.seed(1)
+    musica = partitura.aleatoria(notas=12)
+    assert musica.notas == 12 and len(_notas(musica)) == 12
+
+
+@pytest.mark.parametrize("dados", [
+    b'RITM',                                               # Cabeçalho truncado
+    bytes(partitura.compilar([(0, 0, 2)], 120))[:-1],      # Evento truncado
+    b'XXXX' + bytes(partitura.compilar([], 120))[4:],      # Mágico errado
+    bytes(partitura.compilar([], 0)),                      # BPM zero
+])
+def test_dados_invalidos_sao_recusados(dados):
+    with pytest.raises(ValueError):
+        Partitura(dados)
+
+
+def test_partitura_de_demonstracao_carrega():
+    musica = partitura.carregar(os.path.join(_RAIZ, "musicas", "demo.rtm"))
+    assert musica.notas == len(_notas(musica)) > 0
+
+
+def test_mudanca_de_andamento_vem_antes_da_nota_do_mesmo_tick():
+    dados = partitura.compilar([(4, 0, 4), (4, TRILHA_ANDAMENTO, 60)], 120)
+    musica = Partitura(dados)
+    assert musica._evento(0)[1] == TRILHA_ANDAMENTO
+    assert _notas(musica) == [(500000, 0, 1000000)]
@@ -0,0 +1,77 @@
+import os
+import pytest
+from components import placar as modulo
+from components.placar import Placar, ler_registros, TAMANHO_REGISTRO
+
+@pytest.fixture
+def caminho(tmp_path):
+    return str(tmp_path / "placar.bin")
+
+def test_registros_e_indice_sobrevivem_a_reabertura(caminho):
+    p = Placar(caminho, max_registros=8, top_n=3)
+    for pontuacao in (10, 30, 20, 5):
+        p.registrar("Reacao", pontuacao)
+    p.registrar("Memoria", 7)
+    reaberto = Placar(caminho, max_registros=8, top_n=3)
+    assert [e[0] for e in reaberto.melhores("Reacao")] == [30, 20, 10]
+    assert reaberto.recorde("Memoria") == 7
+    assert reaberto.seq == 5
+    assert [r[2] for r in ler_registros(caminho)] == [10, 30, 20, 5, 7]
+
+def test_menor_melhor_e_empate_favorece_o_mais_antigo(caminho):
+    p = Placar(caminho, top_n=3)
+    assert p.registrar("Tempo", 300, menor_melhor=True) == 0
+    assert p.registrar("Tempo", 200, menor_melhor=True) == 0
+    assert p.registrar("Tempo", 200, menor_melhor=True) == 1
+    assert [e[:2] for e in p.melhores("Tempo", menor_melhor=True)] == [(200, 1), (200, 2), (300, 0)]
+
+def test_rotacao_mantem_o_ranking(caminho):
+    p = Placar(caminho, max_registros=4, top_n=2)
+    for i in range(10):
+        p.registrar("Cobra", i)
+    assert os.path.exists(caminho[:-4] + ".1.bin")
+    os.remove(p._caminho_indice("Cobra"))
+    assert [e[0] for e in Placar(caminho, max_registros=4, top_n=2).melhores("Cobra")] == [9, 8]
+
+def test_escrita_interrompida_descarta_so_o_registro_incompleto(caminho):
+    p = Placar(caminho, max_registros=64)
+    for i in range(20):
+        p.registrar("Reacao", i)
+    with open(caminho, 'ab') as arquivo:
+        arquivo.write(b'\x15\x00\x00')  # Registro cortado pela queda de energia
+    reaberto = Placar(caminho, max_registros=64)
+    assert os.path.getsize(caminho) == 20 * TAMANHO_REGISTRO
+    assert not os.path.exists(caminho[:-4] + ".1.bin")
+    assert reaberto.seq == 20 and reaberto.registros == 20
+    reaberto.registrar("Reacao", 99)
+    assert [r[0] for r in ler_registros(caminho)] == list(range(21))
+
+def test_indice_atrasado_recebe_os_registros_novos(caminho, monkeypatch):
+    p = Placar(caminho, top_n=3)
+    for pontuacao in (10, 20, 30):
+        p.registrar("Reacao", pontuacao)
+    # Energia cai depois do histórico e antes do índice
+    monkeypatch.setattr(Placar, '_gravar_indice', lambda *args: None)
+    p.registrar("Reacao", 100)
+    monkeypatch.undo()
+    reaberto = Placar(caminho, top_n=3)
+    assert [e[0] for e in reaberto.melhores("Reacao")] == [100, 30, 20]
+    # O índice foi regravado: a próxima abertura não precisa do histórico
+    assert reaberto._ler_indice("Reacao")[2] == reaberto.seq
+
+def test_indice_atrasado_depois_da_rotacao(caminho, monkeypatch):
+    p = Placar(caminho, max_registros=4, top_n=2)
+    p.registrar("Reacao", 50)
+    monkeypatch.setattr(Placar, '_gravar_indice', lambda *args: None)
+    for pontuacao in (1, 2, 3, 60, 4, 5):
+        p.registrar("Reacao", pontuacao)
+    monkeypatch.undo()
+    assert [e[0] for e in Placar(caminho, max_registros=4, top_n=2).melhores("Reacao")] == [60, 50]
+
+def test_indice_de_versao_antiga_e_reconstruido(caminho):
+    p = Placar(caminho, top_n=3)
+    p.registrar("Reacao", 42)
+    with open(p._caminho_indice("Reacao"), 'wb') as arquivo:
+        arquivo.write(b'TOPN\x01\x00\x00\x00')  # Cabeçalho da versão 1, sem entradas
+    assert Placar(caminho, top_n=3).recorde("Reacao") == 42
+    assert modulo.VERSAO == 2
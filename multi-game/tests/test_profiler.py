@@ -0,0 +1,64 @@
+# tests/test_profiler.py
+# Histograma logarítmico do profiler e percentis por seção
+
+from profiler import balde, limite_superior, Profiler, Secao, NUM_BALDES, SUBDIVISOES
+
+
+def _duracoes():
+    yield from range(1 << 16)
+    us = 1 << 16
+    while us < 1 << 23:
+        yield from (us - 1, us, us + 1, us * 5 // 4)
+        us <<= 1
+
+
+def test_cada_duracao_cai_no_balde_que_a_contem():
+    for us in _duracoes():
+        i = balde(us)
+        if i == NUM_BALDES - 1:
+            assert us > limite_superior(i - 1)
+            continue
+        assert us <= limite_superior(i)
+        assert i == 0 or us > limite_superior(i - 1)
+
+
+def test_baldes_contiguos_e_erro_relativo_limitado():
+    for i in range(1, NUM_BALDES):
+        assert limite_superior(i) > limite_superior(i - 1)
+        assert balde(limite_superior(i - 1) + 1) == i
+        if i >= SUBDIVISOES:
+            largura = limite_superior(i) - limite_superior(i - 1)
+            assert largura * 8 <= limite_superior(i - 1) + 1
+
+
+def test_ultimo_balde_acumula_duracoes_longas():
+    assert 4000000 < limite_superior(NUM_BALDES - 1) < 4300000
+    assert balde(10 ** 9) == NUM_BALDES - 1
+
+
+def test_percentil_pelo_histograma():
+    secao = Secao("teste")
+    for us in range(1, 1001):
+        secao.registrar(us)
+    assert (secao.n, secao.minimo, secao.maximo, secao.media()) == (1000, 1, 1000, 500)
+    p50 = secao.percentil(50)
+    assert 500 <= p50 <= 500 * 9 // 8
+    assert secao.percentil(100) == 1000
+    secao.zerar()
+    assert secao.percentil(50) == 0 and sum(secao.histograma) == 0
+
+
+def test_instrumentar_e_desinstrumentar():
+    class Alvo:
+        def fazer(self, x):
+            return x * 2
+
+    alvo = Alvo()
+    perfil = Profiler()
+    assert perfil.instrumentar(alvo, "fazer", "alvo")
+    assert alvo.fazer(21) == 42
+    assert perfil.secoes["alvo"].n == 1
+    perfil.desinstrumentar()
+    alvo.fazer(1)
+    assert perfil.secoes["alvo"].n == 1
+    assert "fazer" not in vars(alvo)
@@ -0,0 +1,70 @@
+# tests/test_rhythm_game.py
+# Laço do jogo de ritmo: dorme entre os prazos e só expira a nota após a confirmação
+
+import stages.rhythm_game as rhythm_game
+from components import partitura
+from components.hardware import contexto
+from utime import ticks_us, ticks_add, ticks_diff
+from stages.rhythm_game import RhythmGame, QUADRO_US, QUEDA_US, JANELAS, JANELA_MAX_US
+
+
+def _jogo():
+    hw = contexto()
+    return RhythmGame(hw.display, hw.matriz, hw.buzzer, hw.botoes)
+
+
+def _musica(notas=6):
+    # Uma nota por batida a 120 BPM, alternando as faixas
+    return partitura.Partitura(partitura.compilar(
+        [(i * 4, i % 2, 2) for i in range(notas)], 120))
+
+
+def test_tocar_sem_pressoes_marca_todas_as_notas_como_falta(relogio_virtual):
+    jogo = _jogo()
+    jogo._tocar(_musica())
+    assert jogo.contagem[-2] == 6
+    assert jogo.pontuacao == 0
+
+
+def test_tocar_dorme_entre_os_prazos(relogio_virtual, monkeypatch):
+    leituras = [0]
+    ticks_us = rhythm_game.ticks_us
+
+    def contar():
+        leituras[0] += 1
+        return ticks_us()
+
+    monkeypatch.setattr(rhythm_game, 'ticks_us', contar)
+    inicio = relogio_virtual.agora_ns()
+    jogo = _jogo()
+    jogo._tocar(_musica())
+    duracao_us = (relogio_virtual.agora_ns() - inicio) // 1000
+
+    # Algumas leituras por quadro, não uma volta de laço a cada 10 us
+    quadros = duracao_us // QUADRO_US
+    assert quadros > 100
+    assert leituras[0] < 4 * quadros
+
+
+class CapturaFalsa:
+    """Pressão com a borda em t_borda, entregue só após a confirmação, como a CapturaBorda"""
+    def __init__(self, t_borda=None, confirmacao_us=5000):
+        self.t_borda = t_borda
+        self.confirmacao_us = confirmacao_us
+
+    def pressao(self):
+        if self.t_borda is None or ticks_diff(ticks_us(), self.t_borda) < self.confirmacao_us:
+            return None
+        t, self.t_borda = self.t_borda, None
+        return t
+
+
+def test_pressao_no_fim_da_janela_conta_mesmo_confirmada_depois(relogio_virtual):
+    jogo = _jogo()
+    # A nota de instante 0 tem o alvo uma queda depois do início do _tocar
+    alvo = ticks_add(ticks_us(), QUEDA_US)
+    borda = ticks_add(alvo, JANELA_MAX_US - 2000)
+    jogo.capturas = (CapturaFalsa(borda), CapturaFalsa())
+    jogo._tocar(partitura.Partitura(partitura.compilar([(0, 0, 2)], 120)))
+    assert jogo.contagem[len(JANELAS) - 1] == 1  # Última janela, sem FALTA nem ERRADO
+    assert jogo.contagem[-2] == 0 and jogo.contagem[-1] == 0
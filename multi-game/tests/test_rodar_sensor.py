@@ -0,0 +1,14 @@
+import pytest
+import rodar_sensor
+
+@pytest.mark.parametrize('opcao', [0, 1, 3])
+def test_sensor_test_termina_sem_placa(relogio_virtual, opcao, capsys):
+    # Os botões dublês escolhem a opção, saem dela e escolhem "Voltar"
+    assert rodar_sensor.main(['SensorTest', '--opcao', str(opcao), '--segundos', '2']) == 0
+    assert "Pontuacao: 0" in capsys.readouterr().out
+
+def test_roteiro_escolhe_a_opcao_e_volta():
+    roteiro = rodar_sensor.roteiro_sensor_test(3, 2)
+    assert roteiro[:4] == [('A', 0)] * 3 + [('B', 0)]
+    assert roteiro[4] == ('B', 2000)
+    assert roteiro[-1] == ('B', 0)
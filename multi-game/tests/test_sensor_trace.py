@@ -0,0 +1,122 @@
+# tests/test_sensor_trace.py
+# Traces binários do MPU-6050: ida e volta, buffer duplo e wrap do tempo
+
+import pytest
+from components import sensor_trace
+from components.sensor_trace import (GravadorTrace, ReprodutorTrace,
+                                     TAMANHO_CABECALHO, TAMANHO_REGISTRO)
+
+_TICKS_PERIODO = 1 << 30  # ticks_us do MicroPython dá a volta em 2^30
+
+
+class RelogioFalso:
+    """ticks_us/ticks_diff com volta, avançados só pelo teste"""
+    def __init__(self):
+        self.us = 0
+
+    def ticks_us(self):
+        return self.us % _TICKS_PERIODO
+
+    def ticks_diff(self, fim, inicio):
+        return (fim - inicio + _TICKS_PERIODO // 2) % _TICKS_PERIODO - _TICKS_PERIODO // 2
+
+    def sleep_ms(self, ms):
+        self.us += ms * 1000
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = RelogioFalso()
+    monkeypatch.setattr(sensor_trace, 'ticks_us', relogio.ticks_us)
+    monkeypatch.setattr(sensor_trace, 'ticks_diff', relogio.ticks_diff)
+    return relogio
+
+
+def _raw(i):
+    return (i, -i, 16384 - i, 1000 + i, 3 * i, -3 * i, i % 7 - 3)
+
+
+def _gravar(relogio, caminho, n, passo_ms=10, **opcoes):
+    gravador = GravadorTrace(caminho, **opcoes)
+    for i in range(n):
+        relogio.sleep_ms(passo_ms)
+        gravador.registrar(_raw(i))
+    gravador.fechar()
+    return gravador
+
+
+def test_ida_e_volta_com_buffer_duplo(tmp_path, relogio):
+    caminho = str(tmp_path / "trace.bin")
+    # Vários buffers cheios, com blocos menores que um buffer: a escrita do
+    # anterior termina ao longo das amostras seguintes
+    gravador = _gravar(relogio, caminho, 100, registros_por_buffer=8, bloco=32)
+    assert gravador.total == 100
+    assert gravador.bloqueios == 0
+    assert (tmp_path / "trace.bin").stat().st_size == TAMANHO_CABECALHO + 100 * TAMANHO_REGISTRO
+
+    reprodutor = ReprodutorTrace(caminho)
+    amostras = list(reprodutor.amostras())
+    reprodutor.fechar()
+    assert [raw for _, raw in amostras] == [_raw(i) for i in range(100)]
+    tempos = [t for t, _ in amostras]
+    assert all(9000 <= b - a <= 11000 for a, b in zip(tempos, tempos[1:]))
+
+
+def test_buffer_pendente_escrito_de_uma_vez_conta_bloqueio(tmp_path, relogio):
+    # Blocos pequenos demais para esvaziar um buffer antes de o outro encher
+    caminho = str(tmp_path / "trace.bin")
+    gravador = _gravar(relogio, caminho, 40, registros_por_buffer=4, bloco=4)
+    assert gravador.bloqueios > 0
+    reprodutor = ReprodutorTrace(caminho)
+    assert [raw for _, raw in reprodutor.amostras()] == [_raw(i) for i in range(40)]
+    reprodutor.fechar()
+
+
+def test_leitura_sequencial_e_repeticao(tmp_path, relogio):
+    caminho = str(tmp_path / "trace.bin")
+    _gravar(relogio, caminho, 3)
+    reprodutor = ReprodutorTrace(caminho, registros_por_leitura=2)
+    assert [reprodutor.ler_raw() for _ in range(4)] == [_raw(0), _raw(1), _raw(2), None]
+    reprodutor.fechar()
+
+    reprodutor = ReprodutorTrace(caminho, repetir=True)
+    assert [reprodutor.ler_raw() for _ in range(5)] == [_raw(0), _raw(1), _raw(2), _raw(0), _raw(1)]
+    reprodutor.fechar()
+
+
+def test_tempo_real_entrega_a_amostra_do_instante(tmp_path, relogio):
+    caminho = str(tmp_path / "trace.bin")
+    _gravar(relogio, caminho, 10, passo_ms=100)
+    reprodutor = ReprodutorTrace(caminho, tempo_real=True)
+    primeira = reprodutor.ler_raw()
+    relogio.sleep_ms(450)
+    # A amostra i foi gravada em (i + 1) * 100 ms
+    assert reprodutor.ler_raw() == _raw(3)
+    relogio.sleep_ms(5000)
+    # Depois do fim, a última amostra é mantida
+    assert reprodutor.ler_raw() == _raw(9)
+    assert primeira == _raw(0)
+    reprodutor.fechar()
+
+
+def test_tempo_passa_de_32_bits(tmp_path, relogio):
+    # O campo t_us dá a volta a cada ~71 min; o reprodutor corrige a volta
+    caminho = str(tmp_path / "trace.bin")
+    gravador = GravadorTrace(caminho)
+    for i in range(10):
+        relogio.sleep_ms(500000)  # Abaixo de meio período de ticks_us; acima de 2^32 us no total
+        gravador.registrar(_raw(i))
+    gravador.fechar()
+
+    reprodutor = ReprodutorTrace(caminho)
+    tempos = [t for t, _ in reprodutor.amostras()]
+    reprodutor.fechar()
+    assert tempos[-1] > 0xFFFFFFFF
+    assert all(abs(b - a - 500000000) < 1000 for a, b in zip(tempos, tempos[1:]))
+
+
+def test_cabecalho_invalido_e_recusado(tmp_path):
+    caminho = tmp_path / "trace.bin"
+    caminho.write_bytes(b'XXXX' + bytes(4))
+    with pytest.raises(ValueError):
+        ReprodutorTrace(str(caminho))
@@ -0,0 +1,93 @@
+import pytest
+import uasyncio as asyncio
+import config
+import memoria
+from components.hardware import contexto
+from stages.stage_manager import StageManager
+
+class EtapaFalsa:
+    """Etapa antiga (sem Stage) com reset(): conta construções e reinícios"""
+    criadas = 0
+
+    def __init__(self, display, matriz, buzzer, botoes):
+        EtapaFalsa.criadas += 1
+        self.reinicios = 0
+
+    def reset(self):
+        self.reinicios += 1
+
+    def iniciar(self):
+        return 7
+
+class EtapaSemMemoria:
+    """Etapa cujo construtor esgota o heap"""
+    def __init__(self, display, matriz, buzzer, botoes):
+        raise MemoryError
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(config, 'PLACAR_ARQUIVO', None)
+    EtapaFalsa.criadas = 0
+    manager = StageManager(contexto())
+    for nome in ("Um", "Dois", "Tres"):
+        manager.adicionar_etapa(EtapaFalsa, nome)
+    return manager
+
+def test_cache_desligada_cria_sempre_uma_instancia_nova(manager, monkeypatch):
+    monkeypatch.setattr(config, 'CACHE_ETAPAS', 0)
+    primeira = manager._obter_etapa(0)
+    segunda = manager._obter_etapa(0)
+    manager._obter_etapa(1)
+    assert primeira is not segunda
+    assert EtapaFalsa.criadas == 3
+    assert manager.instancias == {} and manager.ordem_uso == []
+
+def test_cache_de_uma_etapa_reaproveita_e_descarta(manager, monkeypatch):
+    monkeypatch.setattr(config, 'CACHE_ETAPAS', 1)
+    primeira = manager._obter_etapa(0)
+    assert manager._obter_etapa(0) is primeira
+    assert primeira.reinicios == 1
+    manager._obter_etapa(1)
+    assert list(manager.instancias) == [1]
+    assert manager._obter_etapa(0) is not primeira
+    assert EtapaFalsa.criadas == 3
+
+def test_cache_de_duas_descarta_a_usada_ha_mais_tempo(manager, monkeypatch):
+    monkeypatch.setattr(config, 'CACHE_ETAPAS', 2)
+    um = manager._obter_etapa(0)
+    manager._obter_etapa(1)
+    assert manager._obter_etapa(0) is um  # "Um" passa a ser a mais recente
+    manager._obter_etapa(2)
+    assert sorted(manager.instancias) == [0, 2]
+    assert manager.ordem_uso == [0, 2]
+    assert EtapaFalsa.criadas == 3
+
+@pytest.mark.parametrize("etapas, relatorio", [((), False), (("Um",), True)])
+def test_perfil_so_relata_as_etapas_escolhidas(manager, monkeypatch, capsys, etapas, relatorio):
+    monkeypatch.setattr(config, 'PERFIL_ETAPAS', etapas)
+    monkeypatch.setattr(config, 'PERFIL_SALVAR', False)
+    write = manager.matriz.np.write
+    pontos = asyncio.run(manager._executar_etapa(manager._obter_etapa(0), "Um"))
+    assert pontos == 7
+    assert ("Perfil: Um" in capsys.readouterr().out) == relatorio
+    assert manager.matriz.np.write == write  # instrumentação desfeita
+
+def test_falha_ao_criar_a_etapa_encerra_a_amostragem(manager, monkeypatch):
+    monkeypatch.setattr(config, 'MEMORIA_TELEMETRIA', True)
+    manager.adicionar_etapa(EtapaSemMemoria, "Sem memoria")
+    tarefas = []
+    criar_tarefa = asyncio.create_task
+
+    def registrar_tarefa(coro):
+        tarefas.append(criar_tarefa(coro))
+        return tarefas[-1]
+    monkeypatch.setattr(asyncio, 'create_task', registrar_tarefa)
+
+    async def jogar():
+        with pytest.raises(MemoryError):
+            await manager._jogar_etapa(3)
+        await asyncio.sleep_ms(0)  # deixa o cancelamento chegar à tarefa
+        return tarefas[0].cancelled()
+
+    assert asyncio.run(jogar())
+    assert memoria._ativa is None
@@ -0,0 +1,83 @@
+# tests/test_trilha.py
+# Trilhas de sessão: formato binário e reprodução determinística
+
+import os
+import pytest
+import trilha as modulo
+from trilha import Trilha, carregar, quantizar, desquantizar, reproduzir
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _trilha():
+    trilha = Trilha("main.py", 0xDEADBEEF, True)
+    trilha.duracao_us = 3 * 10 ** 9  # Varint de 5 bytes
+    trilha.entradas = [(1500000, 'A', True), (1620000, 'A', False),
+                       (1620000, 'dir', True), (2 ** 35, 'dir', False)]
+    # Fora de ordem e com uma amostra repetida, que salvar() descarta
+    trilha.amostras = [(20000, (1, 2, 8192, 2500, -3, 0, 64)),
+                       (0, (0, 0, 8192, 2500, 0, 0, 0)),
+                       (10000, (0, 0, 8192, 2500, 0, 0, 0))]
+    return trilha
+
+
+def test_ida_e_volta(tmp_path):
+    caminho = str(tmp_path / "sessao.bdt")
+    original = _trilha()
+    original.programa = "etapas/ação.py"
+    original.salvar(caminho)
+    lida = carregar(caminho)
+    assert (lida.programa, lida.semente, lida.sensor) == ("etapas/ação.py", 0xDEADBEEF, True)
+    assert lida.duracao_us == original.duracao_us
+    assert lida.entradas == original.entradas
+    assert lida.amostras == [(0, (0, 0, 8192, 2500, 0, 0, 0)), (20000, (1, 2, 8192, 2500, -3, 0, 64))]
+    assert lida.quadros is None
+
+    lida.quadros = [(0, 0), (16000, 0xFFFFFFFF), (2 ** 40, 12345)]
+    lida.salvar(caminho)
+    assert carregar(caminho).quadros == lida.quadros
+
+
+def test_cabecalho_invalido(tmp_path):
+    caminho = tmp_path / "sessao.bdt"
+    _trilha().salvar(str(caminho))
+    dados = bytearray(caminho.read_bytes())
+    caminho.write_bytes(b'XXXX' + dados[4:])
+    with pytest.raises(ValueError):
+        carregar(str(caminho))
+    dados[4] = modulo.VERSAO + 1
+    caminho.write_bytes(bytes(dados))
+    with pytest.raises(ValueError):
+        carregar(str(caminho))
+
+
+def test_quantizacao_satura_e_volta():
+    amostra = (0.5, -1.0, 1.0, 25.37, 10.0, -2.5, 1000.0)
+    raw = quantizar(amostra)
+    assert raw[-1] == 32767
+    volta = desquantizar(raw)
+    assert volta[:6] == pytest.approx(amostra[:6], abs=0.01)
+
+
+def test_reproducao_e_deterministica(tmp_path, relogio_virtual, capsys):
+    caminho = str(tmp_path / "sessao.bdt")
+    trilha = Trilha("main.py", 42, True)
+    trilha.duracao_us = 4000000
+    trilha.entradas = [(1500000, 'baixo', True), (1600000, 'baixo', False),
+                       (2500000, 'A', True), (2600000, 'A', False)]
+    trilha.salvar(caminho)
+
+    argv = [caminho, '--raiz', _RAIZ]
+    assert reproduzir(argv + ['--fixar']) == 0
+    referencia = carregar(caminho).quadros
+    assert referencia
+    assert reproduzir(argv) == 0
+    assert "quadros identicos" in capsys.readouterr().out
+
+    # Um quadro adulterado é apontado como divergência
+    adulterada = carregar(caminho)
+    t, crc = adulterada.quadros[-1]
+    adulterada.quadros[-1] = (t, crc ^ 1)
+    adulterada.salvar(caminho)
+    assert reproduzir(argv) == 1
+    assert "DIVERGENCIA" in capsys.readouterr().out
@@ -3,14 +3,31 @@
 
 from machine import Pin, ADC
 import config
-from utime import sleep, ticks_ms, ticks_diff
+from utime import sleep, ticks_ms, ticks_us, ticks_diff
+import uasyncio as asyncio
 import urandom
+from array import array
+import heapq
 
 class Botoes:
     """Classe para gerenciar os botões"""
     def __init__(self, pin_a=config.BUTTON_A_PIN, pin_b=config.BUTTON_B_PIN):
         self.button_a = Pin(pin_a, Pin.IN, Pin.PULL_UP)
         self.button_b = Pin(pin_b, Pin.IN, Pin.PULL_UP)
+        
+        # Pressões detectadas por atualizar() e ainda não consumidas
+        self.evento_a = False
+        self.evento_b = False
+        self.anterior_a = 1
+        self.anterior_b = 1
+    
+    def _botao_pressionado(self):
+        """Retorna qual botão está pressionado agora (A=1, B=2) ou 0"""
+        if self.button_a.value() == 0:
+            return 1
+        if self.button_b.value() == 0:
+            return 2
+        return 0
     
     def aguardar_botao_a(self, debounce=True):
         """Aguarda o botão A ser pressionado"""
@@ -19,6 +36,13 @@ class Botoes:
         if debounce:
             sleep(0.2)  # Debounce
     
+    async def aguardar_botao_a_async(self, debounce=True):
+        """Aguarda o botão A sem bloquear as outras tarefas"""
+        while self.button_a.value() == 1:
+            await asyncio.sleep_ms(10)
+        if debounce:
+            await asyncio.sleep_ms(200)  # Debounce
+    
     def aguardar_botao_b(self, debounce=True):
         """Aguarda o botão B ser pressionado"""
         while self.button_b.value() == 1:
@@ -26,17 +50,31 @@ class Botoes:
         if debounce:
             sleep(0.2)  # Debounce
     
+    async def aguardar_botao_b_async(self, debounce=True):
+        """Aguarda o botão B sem bloquear as outras tarefas"""
+        while self.button_b.value() == 1:
+            await asyncio.sleep_ms(10)
+        if debounce:
+            await asyncio.sleep_ms(200)  # Debounce
+    
     def aguardar_qualquer_botao(self, debounce=True):
         """Aguarda qualquer botão ser pressionado e retorna qual (A=1, B=2)"""
         while True:
-            if self.button_a.value() == 0:
+            botao = self._botao_pressionado()
+            if botao:
                 if debounce:
                     sleep(0.2)  # Debounce
-                return 1
-            if self.button_b.value() == 0:
+                return botao
+    
+    async def aguardar_qualquer_botao_async(self, debounce=True):
+        """Aguarda qualquer botão sem bloquear as outras tarefas e retorna qual (A=1, B=2)"""
+        while True:
+            botao = self._botao_pressionado()
+            if botao:
                 if debounce:
-                    sleep(0.2)  # Debounce
-                return 2
+                    await asyncio.sleep_ms(200)  # Debounce
+                return botao
+            await asyncio.sleep_ms(10)
     
     def esta_pressionado_a(self):
         """Verifica se o botão A está pressionado"""
@@ -45,6 +83,91 @@ class Botoes:
     def esta_pressionado_b(self):
         """Verifica se o botão B está pressionado"""
         return self.button_b.value() == 0
+    
+    def atualizar(self):
+        """
+        Lê os botões e guarda cada nova pressão (borda de descida) como evento
+        Chamado pela tarefa de entrada do runtime, para não perder toques curtos
+        """
+        a = self.button_a.value()
+        b = self.button_b.value()
+        if a == 0 and self.anterior_a == 1:
+            self.evento_a = True
+        if b == 0 and self.anterior_b == 1:
+            self.evento_b = True
+        self.anterior_a = a
+        self.anterior_b = b
+    
+    def limpar_eventos(self):
+        """Descarta as pressões ainda não consumidas"""
+        self.atualizar()
+        self.evento_a = False
+        self.evento_b = False
+    
+    def foi_pressionado_a(self):
+        """Retorna (e consome) uma pressão do botão A desde a última consulta"""
+        self.atualizar()
+        evento = self.evento_a
+        self.evento_a = False
+        return evento
+    
+    def foi_pressionado_b(self):
+        """Retorna (e consome) uma pressão do botão B desde a última consulta"""
+        self.atualizar()
+        evento = self.evento_b
+        self.evento_b = False
+        return evento
+
+class CapturaBorda:
+    """
+    Marca com ticks_us, por interrupção, o instante em que um botão é pressionado
+    O handler só guarda o tempo da borda de descida (sem alocar memória); a
+    pressão é confirmada depois, fora da interrupção, se o pino continuar em
+    nível baixo por confirmacao_us. Bordas de ruído ou do repique ao soltar
+    o botão são descartadas, mas o instante medido é sempre o da primeira borda.
+    """
+    def __init__(self, pino, confirmacao_us=5000):
+        self.pino = pino
+        self.confirmacao_us = confirmacao_us
+        self.t_us = 0          # Instante da borda pendente
+        self.pendente = False  # Há uma borda aguardando confirmação
+    
+    def _irq(self, pino):
+        if not self.pendente:
+            self.t_us = ticks_us()
+            self.pendente = True
+    
+    def ativar(self):
+        """Liga a interrupção (hard IRQ: o tempo não espera o laço principal)"""
+        self.pendente = False
+        try:
+            self.pino.irq(handler=self._irq, trigger=Pin.IRQ_FALLING, hard=True)
+        except TypeError:
+            # Portas sem suporte a hard IRQ
+            self.pino.irq(handler=self._irq, trigger=Pin.IRQ_FALLING)
+    
+    def desativar(self):
+        self.pino.irq(handler=None)
+        self.pendente = False
+    
+    def limpar(self):
+        """Descarta a borda pendente"""
+        self.pendente = False
+    
+    def pressao(self):
+        """
+        Retorna o instante (ticks_us) de uma pressão confirmada e a consome,
+        ou None se não houve pressão (ou se ainda não deu para confirmar)
+        """
+        if not self.pendente:
+            return None
+        t = self.t_us
+        if ticks_diff(ticks_us(), t) < self.confirmacao_us:
+            return None
+        self.pendente = False
+        if self.pino.value() == 0:
+            return t
+        return None  # O pino voltou ao nível alto: ruído ou repique ao soltar
 
 class Joystick:
     """Classe para gerenciar o joystick analógico"""
@@ -96,6 +219,13 @@ class Joystick:
             pass
         if debounce:
             sleep(0.2)
+    
+    async def aguardar_botao_central_async(self, debounce=True):
+        """Aguarda o botão central sem bloquear as outras tarefas"""
+        while self.sw.value() == 1:
+            await asyncio.sleep_ms(10)
+        if debounce:
+            await asyncio.sleep_ms(200)
 
 def contagem_regressiva(display, buzzer, segundos=3):
     """Exibe uma contagem regressiva no display"""
@@ -104,6 +234,13 @@ def contagem_regressiva(display, buzzer, segundos=3):
         buzzer.tocar_som(440+i*100, 200)  # Tom diferente para cada número
         sleep(1)
 
+async def contagem_regressiva_async(display, buzzer, segundos=3):
+    """Contagem regressiva sem bloquear as outras tarefas (o som vai para a fila)"""
+    for i in range(segundos, 0, -1):
+        display.exibir_numero_grande(i)
+        buzzer.tocar_som(440+i*100, 200)  # Tom diferente para cada número
+        await asyncio.sleep_ms(1000)
+
 def tempo_aleatorio(min_seg=0.8, max_seg=2.0):
     """Gera um tempo aleatório entre min_seg e max_seg em segundos"""
     return urandom.uniform(min_seg, max_seg)
@@ -116,90 +253,219 @@ def diferenca_tempo_ms(tempo_final, tempo_inicial):
     """Calcula a diferença entre dois tempos em milissegundos"""
     return ticks_diff(tempo_final, tempo_inicial)
 
-def navegar_menu(display, botoes, titulo, opcoes, joystick=None):
+def isqrt(n):
+    """Raiz quadrada inteira (arredondada para baixo) sem ponto flutuante"""
+    if n <= 0:
+        return 0
+    x = n
+    y = (x + 1) >> 1
+    while y < x:
+        x = y
+        y = (x + n // x) >> 1
+    return x
+
+class EstatisticasStream:
     """
-    Exibe um menu e permite navegação com os botões OU joystick
+    Estatísticas de uma série de medições (ex.: tempos de reação em ms) com
+    memória constante, sem guardar as amostras:
+    - média e variância pelo método de Welford
+    - mediana e percentis por histograma de baldes fixos entre minimo e maximo
+      (valores fora da faixa caem nos baldes das pontas)
+    - ranking das top_k melhores medições em um heap limitado
+    """
+    def __init__(self, minimo=0, maximo=1000, baldes=50, top_k=5, menor_melhor=True):
+        self.minimo_faixa = minimo
+        self.largura = max(1, (maximo - minimo + baldes - 1) // baldes)
+        self.histograma = array('L', [0] * baldes)
+        self.top_k = top_k
+        self.menor_melhor = menor_melhor
+        self.zerar()
+
+    def zerar(self):
+        """Descarta as medições (sem realocar o histograma)"""
+        for i in range(len(self.histograma)):
+            self.histograma[i] = 0
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0        # Soma dos quadrados dos desvios (Welford)
+        self.minimo = None
+        self.maximo = None
+        self.heap = []       # O pior do ranking fica no topo (heap[0])
+
+    def adicionar(self, valor):
+        """Registra uma medição em O(1) (O(log k) para o ranking)"""
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (valor - self.media)
+        if self.minimo is None or valor < self.minimo:
+            self.minimo = valor
+        if self.maximo is None or valor > self.maximo:
+            self.maximo = valor
+
+        i = (valor - self.minimo_faixa) // self.largura
+        i = 0 if i < 0 else min(int(i), len(self.histograma) - 1)
+        self.histograma[i] += 1
+
+        # Heap de mínimo sobre a "qualidade": o pior do ranking sai primeiro
+        chave = -valor if self.menor_melhor else valor
+        if len(self.heap) < self.top_k:
+            heapq.heappush(self.heap, chave)
+        elif chave > self.heap[0]:
+            heapq.heappop(self.heap)
+            heapq.heappush(self.heap, chave)
+
+    def variancia(self):
+        """Variância amostral (0 com menos de duas medições)"""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def desvio(self):
+        return self.variancia() ** 0.5
+
+    def percentil(self, p):
+        """Percentil p (0-100), interpolado dentro do balde; None sem medições"""
+        if not self.n:
+            return None
+        alvo = self.n * p / 100
+        acumulado = 0
+        for i, contagem in enumerate(self.histograma):
+            if contagem and acumulado + contagem >= alvo:
+                fracao = (alvo - acumulado) / contagem
+                valor = self.minimo_faixa + (i + fracao) * self.largura
+                # O histograma não sabe mais que os extremos observados
+                return min(max(valor, self.minimo), self.maximo)
+            acumulado += contagem
+        return self.maximo
+
+    def mediana(self):
+        return self.percentil(50)
+
+    def ranking(self):
+        """As top_k melhores medições, da melhor para a pior"""
+        melhores = sorted(self.heap, reverse=True)
+        return [-c for c in melhores] if self.menor_melhor else melhores
+
+    def melhor(self):
+        if not self.heap:
+            return None
+        return -max(self.heap) if self.menor_melhor else max(self.heap)
+
+# Resultado de MenuNavegacao.passo() enquanto nenhuma opção foi escolhida
+CONTINUA = -1
+
+class MenuNavegacao:
+    """
+    Estado de um menu com navegação pelos botões OU joystick
     Implementa scroll automático quando há muitas opções
     
     Controles:
     - Joystick: CIMA/BAIXO para navegar, CENTRO para selecionar
     - Botões: A para navegar, B para selecionar (fallback)
     
-    Retorna o índice da opção selecionada
+    Usado por navegar_menu() e navegar_menu_async(), que só diferem na espera
     """
-    selecao = 0
-    num_opcoes = len(opcoes)
-    
-    # Configurações de exibição
-    max_opcoes_visiveis = 3  # Máximo de opções mostradas por vez (reduzido de 4 para 3)
-    pagina_atual = 0
+    def __init__(self, display, botoes, titulo, opcoes, joystick=None, inatividade_ms=None):
+        self.display = display
+        self.botoes = botoes
+        self.titulo = titulo
+        self.opcoes = opcoes
+        self.joystick = joystick
+        self.inatividade_ms = inatividade_ms
+        self.selecao = 0
+        self.ultima_atividade = ticks_ms()
+        self.num_opcoes = len(opcoes)
+        
+        # Configurações de exibição
+        self.max_opcoes_visiveis = 3  # Máximo de opções mostradas por vez (reduzido de 4 para 3)
+        self.pagina_atual = 0
+        
+        # Exibe o menu inicial
+        self.atualizar_display()
     
-    def atualizar_display():
+    def atualizar_display(self):
         """Atualiza o display com as opções da página atual"""
         # Calcula as opções visíveis
-        inicio = pagina_atual * max_opcoes_visiveis
-        fim = min(inicio + max_opcoes_visiveis, num_opcoes)
-        opcoes_visiveis = opcoes[inicio:fim]
+        inicio = self.pagina_atual * self.max_opcoes_visiveis
+        fim = min(inicio + self.max_opcoes_visiveis, self.num_opcoes)
+        opcoes_visiveis = self.opcoes[inicio:fim]
         
         # Ajusta a seleção relativa à página
-        selecao_relativa = selecao - inicio
+        selecao_relativa = self.selecao - inicio
         
         # Monta as linhas do display
-        linhas = [titulo, "-" * len(titulo)]
+        linhas = [self.titulo, "-" * len(self.titulo)]
         
         for i, opcao in enumerate(opcoes_visiveis):
             marcador = ">" if i == selecao_relativa else " "
             linhas.append(f"{marcador} {opcao}")
         
-        # Adiciona indicadores de scroll se necessário
-        if num_opcoes > max_opcoes_visiveis:
-            info_pagina = f"[{selecao+1}/{num_opcoes}]"
-            if pagina_atual > 0:
-                info_pagina =  info_pagina
-            if fim < num_opcoes:
-                info_pagina = info_pagina 
-            linhas.append(info_pagina)
+        # Adiciona indicador de posição se necessário
+        if self.num_opcoes > self.max_opcoes_visiveis:
+            linhas.append(f"[{self.selecao+1}/{self.num_opcoes}]")
         
-        display.mostrar_mensagem(linhas)
-    
-    def calcular_pagina():
-        """Calcula qual página deve ser exibida baseada na seleção atual"""
-        return selecao // max_opcoes_visiveis
+        self.display.mostrar_mensagem(linhas)
     
-    # Exibe o menu inicial
-    atualizar_display()
+    def _mover(self, passo):
+        """Move a seleção, recalcula a página exibida e registra a atividade"""
+        self.selecao = (self.selecao + passo) % self.num_opcoes
+        self.pagina_atual = self.selecao // self.max_opcoes_visiveis
+        self.atualizar_display()
+        self.ultima_atividade = ticks_ms()
     
-    while True:
-        if joystick:
+    def passo(self):
+        """
+        Processa a entrada uma vez
+        Retorna (resultado, espera_ms): resultado é CONTINUA, o índice escolhido
+        ou None (inatividade); espera_ms é a pausa antes de seguir/retornar
+        """
+        if self.joystick:
             # Prioriza o joystick se estiver disponível
-            direcao = joystick.ler_direcao_debounce()
+            direcao = self.joystick.ler_direcao_debounce()
             
             if direcao == 'cima':
-                selecao = (selecao - 1) % num_opcoes
-                pagina_atual = calcular_pagina()
-                atualizar_display()
+                self._mover(-1)
             
             elif direcao == 'baixo':
-                selecao = (selecao + 1) % num_opcoes
-                pagina_atual = calcular_pagina()
-                atualizar_display()
+                self._mover(1)
             
-            elif joystick.botao_central_pressionado():
-                sleep(0.2)  # Debounce
-                return selecao
+            elif self.joystick.botao_central_pressionado():
+                return self.selecao, 200  # Debounce
         
         # Fallback para botões (funciona mesmo sem joystick)
-        if botoes.esta_pressionado_a():
-            selecao = (selecao + 1) % num_opcoes
-            pagina_atual = calcular_pagina()
-            atualizar_display()
-            sleep(0.3)  # Debounce para botões
+        if self.botoes.esta_pressionado_a():
+            self._mover(1)
+            return CONTINUA, 300  # Debounce para botões
         
-        elif botoes.esta_pressionado_b():
-            sleep(0.2)  # Debounce
-            return selecao
+        elif self.botoes.esta_pressionado_b():
+            return self.selecao, 200  # Debounce
         
-        sleep(0.05)  # Evita uso excessivo de CPU
+        # Nenhuma entrada por muito tempo: devolve o controle a quem chamou
+        if self.inatividade_ms and ticks_diff(ticks_ms(), self.ultima_atividade) > self.inatividade_ms:
+            return None, 0
+        
+        return CONTINUA, 50  # Evita uso excessivo de CPU
+
+def navegar_menu(display, botoes, titulo, opcoes, joystick=None, inatividade_ms=None):
+    """
+    Exibe um menu e permite navegação com os botões OU joystick
+    Retorna o índice da opção selecionada, ou None se nenhuma entrada
+    ocorrer durante inatividade_ms (quando informado)
+    """
+    menu = MenuNavegacao(display, botoes, titulo, opcoes, joystick, inatividade_ms)
+    while True:
+        resultado, espera_ms = menu.passo()
+        sleep(espera_ms / 1000)
+        if resultado != CONTINUA:
+            return resultado
+
+async def navegar_menu_async(display, botoes, titulo, opcoes, joystick=None, inatividade_ms=None):
+    """Versão de navegar_menu() que não bloqueia as outras tarefas"""
+    menu = MenuNavegacao(display, botoes, titulo, opcoes, joystick, inatividade_ms)
+    while True:
+        resultado, espera_ms = menu.passo()
+        await asyncio.sleep_ms(espera_ms)
+        if resultado != CONTINUA:
+            return resultado
 
 def navegar_menu_simples(display, botoes, titulo, opcoes):
     """